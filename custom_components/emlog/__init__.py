@@ -1,11 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import ConfigEntryNotReady
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
+from .accumulator import accumulator_store, async_stop_accumulator
+from .const import (
+    CONF_CONSUMPTION_SOURCE,
+    CONF_HOST,
+    CONF_METER_INDEX,
+    CONSUMPTION_SOURCE_NATIVE,
+    DATA_COORDINATORS,
+    DATA_UTILITY_METER_TASKS,
+    DOMAIN,
+    SIGNAL_ENTITIES_REGISTERED,
+)
+from .coordinator import snapshot_store
+from .timeseries import TIERS, EmlogTimeSeriesStore, async_close_timeseries_store
+from .traces import trace_path
 from .utility_meter import async_remove_utility_meters, async_setup_utility_meters
 
 _LOGGER = logging.getLogger(__name__)
@@ -15,24 +32,113 @@ PLATFORMS: list[str] = ["sensor"]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up emlog from a config entry."""
+    native_consumption = entry.options.get(CONF_CONSUMPTION_SOURCE) == CONSUMPTION_SOURCE_NATIVE
+
     try:
+        if native_consumption:
+            # Integrierter Akkumulator ersetzt die Utility Meter - vorher entfernen, damit die
+            # Verbrauchs-Sensoren deren Entity IDs übernehmen können
+            await async_remove_utility_meters(hass, entry)
+        else:
+            # Utility Meter anlegen, sobald die Zählerstands-Entity registriert ist (Signal aus sensor.py)
+            _async_listen_entities_registered(hass, entry)
+
         # Setup sensor platform
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-        # Setup utility meters after sensors are ready
-        # Warte bis die Sensor-Entities registriert sind
-        await hass.async_add_executor_job(lambda: None)  # Dummy wait to ensure sensors are registered
-        await async_setup_utility_meters(hass, entry)
-
     except ConfigEntryNotReady:
         raise
     return True
 
 
+@callback
+def _async_listen_entities_registered(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Starte das Utility-Meter-Setup einmalig auf das Signal "Entities registriert"."""
+
+    unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def _async_entities_registered() -> None:
+        nonlocal unsub
+        if unsub is None:
+            return
+        unsub()
+        unsub = None
+        task = entry.async_create_background_task(
+            hass, async_setup_utility_meters(hass, entry), f"emlog utility meter setup {entry.entry_id}"
+        )
+        # Handle behalten: async_unload_entry wartet das Anlegen ab, bevor es die Utility Meter entfernt
+        tasks: dict[str, asyncio.Task] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_UTILITY_METER_TASKS, {})
+        tasks[entry.entry_id] = task
+
+        @callback
+        def _async_setup_done(_task: asyncio.Task) -> None:
+            if tasks.get(entry.entry_id) is task:
+                del tasks[entry.entry_id]
+
+        task.add_done_callback(_async_setup_done)
+
+    @callback
+    def _async_stop_listening() -> None:
+        if unsub is not None:
+            unsub()
+
+    signal = SIGNAL_ENTITIES_REGISTERED.format(entry.entry_id)
+    unsub = async_dispatcher_connect(hass, signal, _async_entities_registered)
+    entry.async_on_unload(_async_stop_listening)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    # Ein noch laufendes Utility-Meter-Setup erst abschließen lassen: abgebrochene Flows hinterlassen
+    # Utility Meter ohne unique_id (SETUP_ERROR), die async_remove_utility_meters nicht mehr findet
+    tasks: dict[str, asyncio.Task] = hass.data.get(DOMAIN, {}).get(DATA_UTILITY_METER_TASKS, {})
+    if (task := tasks.pop(entry.entry_id, None)) is not None:
+        await asyncio.wait([task])
+
     # Remove utility meters first
     await async_remove_utility_meters(hass, entry)
 
+    # Akkumulator und Zeitreihen-Speicher abschließen, bevor ein Reload neu einrichtet - sonst öffnet
+    # der neue Entry veraltete bzw. noch beschriebene Dateien. Nicht erst nach dem Entladen der
+    # Plattform: dabei laufen schon die async_on_unload-Callbacks, die nur im Hintergrund schließen.
+    await async_stop_accumulator(hass, entry)
+    await async_close_timeseries_store(hass, entry)
+    host_coordinator = hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {}).get(entry.data[CONF_HOST])
+    if host_coordinator is not None and (meter := host_coordinator.get_meter(int(entry.data[CONF_METER_INDEX]))):
+        # Sonst schreibt der verzögerte Snapshot nach async_remove_entry die Datei erneut
+        await meter.async_flush_snapshot()
+
     # Then unload sensor platform
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Entferne die gespeicherten Daten eines gelöschten Entries unter .storage."""
+    await accumulator_store(hass, entry).async_remove()
+
+    # Snapshot, Zeitreihe und Mitschnitt hängen an Host und Index, nicht am Entry
+    host = entry.data[CONF_HOST]
+    meter_index = int(entry.data[CONF_METER_INDEX])
+    if any(
+        other.entry_id != entry.entry_id
+        and other.data.get(CONF_HOST) == host
+        and int(other.data.get(CONF_METER_INDEX, 0)) == meter_index
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        return
+
+    await snapshot_store(hass, host, meter_index).async_remove()
+    timeseries = EmlogTimeSeriesStore.for_meter(hass, host, meter_index)
+    paths = [timeseries.path(tier) for tier in TIERS] + [trace_path(hass, host, meter_index)]
+    await hass.async_add_executor_job(_remove_files, paths)
+
+
+def _remove_files(paths: list[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        except OSError as err:
+            _LOGGER.warning(f"{path} konnte nicht entfernt werden: {err}")
@@ -0,0 +1,244 @@
+"""Verbrauch pro Tag/Monat/Jahr direkt aus den Zählerstands-Deltas.
+
+Ersetzt auf Wunsch die drei extern angelegten utility_meter Config Entries
+pro Zähler: die Deltas von Stand180 werden im Coordinator-Listener auf die
+laufenden Zeiträume addiert und der Stand verzögert per Store gesichert.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_GAS_BRENNWERT,
+    CONF_GAS_BRENNWERT_HELPER,
+    CONF_GAS_ZUSTANDSZAHL,
+    CONF_GAS_ZUSTANDSZAHL_HELPER,
+    CONF_SETTLEMENT_MONTH,
+    DATA_ACCUMULATORS,
+    DEFAULT_GAS_BRENNWERT,
+    DEFAULT_GAS_ZUSTANDSZAHL,
+    DEFAULT_SETTLEMENT_MONTH,
+    DOMAIN,
+    METER_TYPE_GAS,
+)
+from .coordinator import EmlogCoordinator
+from .settings import EmlogEntrySettings
+
+_LOGGER = logging.getLogger(__name__)
+
+ACCUMULATOR_STORAGE_VERSION = 1
+ACCUMULATOR_SAVE_DELAY = 30  # Sekunden; mehrere Polls werden zu einem Schreibvorgang zusammengefasst
+
+# Zeitraum -> Anzeigename (gleiche Namen wie bei den Utility Metern)
+ACCUMULATOR_PERIODS = {
+    "tag": "Tag",
+    "monat": "Monat",
+    "jahr": "Jahr",
+}
+
+
+def period_start(period: str, day: date, settlement_month: int | None = None) -> date:
+    """Erster Tag des Zeitraums, in dem day liegt.
+
+    settlement_month: Abrechnungsmonat; ist er gesetzt, beginnt das Jahr am
+    Ersten des Folgemonats (z.B. 6 -> 1. Juli), sonst am 1. Januar.
+    """
+    if period == "tag":
+        return day
+    if period == "monat":
+        return day.replace(day=1)
+
+    start_month = settlement_month % 12 + 1 if settlement_month else 1
+    year = day.year if day.month >= start_month else day.year - 1
+    return date(year, start_month, 1)
+
+
+def accumulator_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict[str, Any]]:
+    """Store des Akkumulators eines Entries."""
+    return Store(hass, ACCUMULATOR_STORAGE_VERSION, f"{DOMAIN}.accumulator.{entry.entry_id}")
+
+
+class EmlogPeriodAccumulator:
+    """Summiert die Stand180-Deltas eines Zählers für Tag, Monat und Jahr (in kWh).
+
+    Gas-Zählerstände (m³) werden mit Brennwert × Zustandszahl zum Zeitpunkt
+    des Deltas umgerechnet - wie beim Zählerstand-kWh Sensor.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: EmlogCoordinator,
+        settings: EmlogEntrySettings,
+        align_to_settlement: bool = False,
+    ):
+        self.hass = hass
+        self.coordinator = coordinator
+        self._settings = settings
+        self._is_gas = coordinator.meter_type == METER_TYPE_GAS
+        self._settlement_month = (
+            int(settings.option(CONF_SETTLEMENT_MONTH, DEFAULT_SETTLEMENT_MONTH)) if align_to_settlement else None
+        )
+        self._store = accumulator_store(hass, entry)
+        self.last_stand: float | None = None
+        self.starts: dict[str, date] = {}
+        self.values: dict[str, float] = {period: 0.0 for period in ACCUMULATOR_PERIODS}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._save_pending = False
+
+    async def async_start(self) -> None:
+        """Lade den gesicherten Stand und folge den Zählerständen des Coordinators."""
+        if stored := await self._store.async_load():
+            self.last_stand = stored.get("last_stand")
+            for period, data in stored.get("periods", {}).items():
+                if period in ACCUMULATOR_PERIODS:
+                    self.starts[period] = date.fromisoformat(data["start"])
+                    self.values[period] = float(data["value"])
+        self._roll_periods(dt_util.now().date())
+
+        self._unsubs.append(self.coordinator.async_add_field_listener(self._async_handle_update, ("stand180",)))
+        self._unsubs.append(
+            async_track_time_change(self.hass, self._async_handle_midnight, hour=0, minute=0, second=0)
+        )
+
+    async def async_stop(self) -> None:
+        """Beende die Abonnements und sichere den aktuellen Stand sofort."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listener für geänderte Werte; gibt die Abmelde-Funktion zurück."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _async_remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return _async_remove_listener
+
+    @callback
+    def _async_handle_update(self) -> None:
+        data = self.coordinator.data
+        if data is None or data.reading is None:
+            return
+        self.async_add_reading(data.reading.stand180, dt_util.now())
+
+    @callback
+    def async_add_reading(self, stand: float, now: datetime) -> None:
+        """Verbuche das Delta zum letzten Zählerstand in allen Zeiträumen."""
+        rolled = self._roll_periods(now.date())
+        previous, self.last_stand = self.last_stand, stand
+
+        delta = stand - previous if previous is not None else 0.0
+        if delta < 0:
+            # Zähler getauscht oder zurückgesetzt: neuer Bezugswert, kein Verbrauch
+            _LOGGER.info(f"Zählerstand von {previous} auf {stand} gefallen, Verbrauch wird neu aufgesetzt")
+            delta = 0.0
+        if self._is_gas:
+            delta *= self._settings.get(
+                CONF_GAS_BRENNWERT_HELPER, CONF_GAS_BRENNWERT, DEFAULT_GAS_BRENNWERT
+            ) * self._settings.get(CONF_GAS_ZUSTANDSZAHL_HELPER, CONF_GAS_ZUSTANDSZAHL, DEFAULT_GAS_ZUSTANDSZAHL)
+
+        if delta:
+            for period in ACCUMULATOR_PERIODS:
+                self.values[period] += delta
+        self._async_schedule_save()
+        if delta or rolled:
+            self._async_notify()
+
+    @callback
+    def _async_handle_midnight(self, now: datetime) -> None:
+        """Tageswechsel ohne neuen Zählerstand: abgelaufene Zeiträume auf 0 setzen."""
+        if self._roll_periods(now.date()):
+            self._async_schedule_save()
+            self._async_notify()
+
+    def _roll_periods(self, day: date) -> bool:
+        """Beginne abgelaufene Zeiträume neu; True wenn sich etwas geändert hat."""
+        rolled = False
+        for period in ACCUMULATOR_PERIODS:
+            start = period_start(period, day, self._settlement_month)
+            if self.starts.get(period) != start:
+                self.starts[period] = start
+                self.values[period] = 0.0
+                rolled = True
+        return rolled
+
+    def last_reset(self, period: str) -> datetime | None:
+        """Beginn des laufenden Zeitraums (lokale Mitternacht)."""
+        if (start := self.starts.get(period)) is None:
+            return None
+        return dt_util.start_of_local_day(start)
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Verzögert sichern; nur neu planen, wenn kein Schreibvorgang aussteht.
+
+        Store.async_delay_save startet den Timer bei jedem Aufruf neu - bei
+        Polls unterhalb der Verzögerung würde sonst nie geschrieben.
+        """
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, ACCUMULATOR_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        return {
+            "last_stand": self.last_stand,
+            "periods": {
+                period: {"start": start.isoformat(), "value": self.values[period]}
+                for period, start in self.starts.items()
+            },
+        }
+
+
+async def async_start_accumulator(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: EmlogCoordinator,
+    settings: EmlogEntrySettings,
+    align_to_settlement: bool = False,
+) -> EmlogPeriodAccumulator:
+    """Starte den Verbrauchs-Akkumulator eines Entries (wird beim Entladen gesichert)."""
+    accumulator = EmlogPeriodAccumulator(hass, entry, coordinator, settings, align_to_settlement)
+    await accumulator.async_start()
+
+    accumulators: dict[str, EmlogPeriodAccumulator] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        DATA_ACCUMULATORS, {}
+    )
+    accumulators[entry.entry_id] = accumulator
+
+    @callback
+    def _async_stop_accumulator() -> None:
+        # Nur falls async_unload_entry ihn nicht schon gesichert hat (z.B. fehlgeschlagenes Setup)
+        if accumulators.pop(entry.entry_id, None) is accumulator:
+            hass.async_create_task(accumulator.async_stop())
+
+    entry.async_on_unload(_async_stop_accumulator)
+    return accumulator
+
+
+async def async_stop_accumulator(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Sichere und beende den Akkumulator eines Entries (abgeschlossen, bevor ein Reload neu lädt)."""
+    accumulators: dict[str, EmlogPeriodAccumulator] = hass.data.get(DOMAIN, {}).get(DATA_ACCUMULATORS, {})
+    if (accumulator := accumulators.pop(entry.entry_id, None)) is not None:
+        await accumulator.async_stop()
@@ -0,0 +1,168 @@
+"""HTTP-Client für die Emlog API (ein eigener Connection-Pool pro Gerät)."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.util.json import json_loads
+
+from .const import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    EMLOG_EXPORT_PATH,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    MAX_PARALLEL_REQUESTS_PER_HOST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EmlogHttpError(Exception):
+    """Emlog hat mit einem HTTP-Status != 200 geantwortet."""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+def _client_timeout(connect_timeout: float, read_timeout: float) -> aiohttp.ClientTimeout:
+    """Timeouts eines Requests.
+
+    sock_read greift nur zwischen zwei Datenpaketen - eine tröpfelnde Antwort
+    würde nie abbrechen. total begrenzt den gesamten Request, connect
+    zusätzlich das Warten auf eine freie Verbindung aus dem Pool.
+    """
+    return aiohttp.ClientTimeout(
+        total=connect_timeout + read_timeout,
+        connect=connect_timeout,
+        sock_connect=connect_timeout,
+        sock_read=read_timeout,
+    )
+
+
+@dataclass
+class EmlogClientStats:
+    """Zähler zur Kontrolle, ob Verbindungen zwischen den Polls offen bleiben."""
+
+    requests: int = 0
+    connections_created: int = 0  # Neue TCP-Verbindungen
+    connections_reused: int = 0  # Requests über eine bestehende Keep-Alive-Verbindung
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Anteil der Requests, die eine bestehende Verbindung genutzt haben."""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+
+class EmlogApiClient:
+    """Client für ein Emlog-Gerät mit eigenem, auf Keep-Alive getrimmtem Connector.
+
+    Die Session wird beim ersten Request angelegt und muss über
+    async_close() wieder geschlossen werden.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        host: str,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+    ):
+        self.hass = hass
+        self.host = host
+        self.stats = EmlogClientStats()
+        self._session: aiohttp.ClientSession | None = None
+        self._timeout = _client_timeout(connect_timeout, read_timeout)
+        self._keepalive_timeout = keepalive_timeout
+        self._reconnect = False  # Session mit neuem Keep-Alive anlegen, sobald kein Request läuft
+        self._in_flight = 0
+
+    def set_timeouts(self, connect_timeout: float, read_timeout: float) -> None:
+        """Passe Connect-/Read-Timeout an (gilt ab dem nächsten Request)."""
+        self._timeout = _client_timeout(connect_timeout, read_timeout)
+
+    def set_keepalive_timeout(self, keepalive_timeout: float) -> None:
+        """Passe die Keep-Alive-Dauer an.
+
+        Der Wert gehört zum Connector - die Session wird beim nächsten Request
+        neu angelegt, zu dem kein anderer mehr über die alte Session läuft.
+        """
+        if keepalive_timeout != self._keepalive_timeout:
+            self._keepalive_timeout = keepalive_timeout
+            self._reconnect = self._session is not None
+
+    @property
+    def keepalive_timeout(self) -> float:
+        return self._keepalive_timeout
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Liefere die Session des Geräts, lege sie bei Bedarf an."""
+        if self._reconnect and not self._in_flight and self._session is not None:
+            old_session, self._session = self._session, None
+            self.hass.async_create_task(old_session.close())
+        if self._session is None or self._session.closed:
+            self._reconnect = False
+            connector = aiohttp.TCPConnector(
+                limit_per_host=MAX_PARALLEL_REQUESTS_PER_HOST,
+                keepalive_timeout=self._keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            )
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_end.append(self._on_connection_create_end)
+            trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+        return self._session
+
+    async def _on_connection_create_end(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.stats.connections_created += 1
+
+    async def _on_connection_reuseconn(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.stats.connections_reused += 1
+
+    async def async_get_export_raw(self, meter_index: int) -> bytes:
+        """Rufe den Export eines Meter-Index als unverarbeiteten Body ab.
+
+        Raises:
+            EmlogHttpError: Bei HTTP-Status != 200
+            asyncio.TimeoutError: Bei Connect- oder Read-Timeout
+            aiohttp.ClientError: Bei Verbindungsfehlern
+        """
+        url = f"http://{self.host}{EMLOG_EXPORT_PATH}?export&meterindex={meter_index}"
+        self.stats.requests += 1
+
+        session = self._get_session()
+        self._in_flight += 1
+        try:
+            async with session.get(url, timeout=self._timeout) as resp:
+                if resp.status != 200:
+                    raise EmlogHttpError(resp.status)
+                return await resp.read()
+        finally:
+            self._in_flight -= 1
+
+    async def async_get_export(self, meter_index: int) -> Any:
+        """Rufe den Export eines Meter-Index ab und parse das JSON.
+
+        Raises:
+            Wie async_get_export_raw, zusätzlich ValueError bei ungültigem JSON
+        """
+        return json_loads(await self.async_get_export_raw(meter_index))
+
+    async def async_close(self) -> None:
+        """Schließe die Session und alle offenen Verbindungen."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -8,9 +8,11 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .api import EmlogApiClient, EmlogHttpError
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_ALIGN_TO_SETTLEMENT,
     CONF_BASE_PRICE_GAS,
     CONF_BASE_PRICE_GAS_HELPER,
     CONF_BASE_PRICE_GAS_NEW,
@@ -19,14 +21,24 @@ from .const import (
     CONF_BASE_PRICE_STROM_HELPER,
     CONF_BASE_PRICE_STROM_NEW,
     CONF_BASE_PRICE_STROM_NEW_HELPER,
+    CONF_CONNECT_TIMEOUT,
+    CONF_CONSUMPTION_SOURCE,
+    CONF_DYNAMIC_PRICE_ATTRIBUTE,
+    CONF_DYNAMIC_PRICE_CSV,
+    CONF_DYNAMIC_PRICE_ENTITY,
+    CONF_DYNAMIC_PRICE_SOURCE,
+    CONF_FAST_START,
     CONF_GAS_BRENNWERT,
     CONF_GAS_BRENNWERT_HELPER,
     CONF_GAS_ZUSTANDSZAHL,
     CONF_GAS_ZUSTANDSZAHL_HELPER,
+    CONF_HEARTBEAT_INTERVAL,
     CONF_HOST,
     CONF_INCLUDE_FEED_IN_SENSORS,
+    CONF_MAX_SCAN_INTERVAL,
     CONF_METER_INDEX,
     CONF_METER_TYPE,
+    CONF_MIN_SCAN_INTERVAL,
     CONF_MONTHLY_ADVANCE_GAS,
     CONF_MONTHLY_ADVANCE_GAS_HELPER,
     CONF_MONTHLY_ADVANCE_STROM,
@@ -39,23 +51,42 @@ from .const import (
     CONF_PRICE_KWH_NEW_GAS_HELPER,
     CONF_PRICE_KWH_NEW_STROM,
     CONF_PRICE_KWH_NEW_STROM_HELPER,
+    CONF_READ_TIMEOUT,
+    CONF_RECORD_TRACES,
+    CONF_SAMPLE_BUFFER_SIZE,
     CONF_SCAN_INTERVAL,
     CONF_SETTLEMENT_MONTH,
+    CONF_TARIFFS_GAS,
+    CONF_TARIFFS_STROM,
+    CONF_TIMESERIES_STORE,
+    CONSUMPTION_SOURCE_NATIVE,
+    CONSUMPTION_SOURCE_UTILITY_METER,
     DEFAULT_BASE_PRICE_GAS,
     DEFAULT_BASE_PRICE_STROM,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DYNAMIC_PRICE_ATTRIBUTE,
     DEFAULT_GAS_BRENNWERT,
     DEFAULT_GAS_ZUSTANDSZAHL,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
     DEFAULT_MONTHLY_ADVANCE_GAS,
     DEFAULT_MONTHLY_ADVANCE_STROM,
     DEFAULT_PRICE_KWH,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_SAMPLE_BUFFER_SIZE,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_SETTLEMENT_MONTH,
+    DYNAMIC_PRICE_SOURCE_CSV,
+    DYNAMIC_PRICE_SOURCE_FORECAST,
+    DYNAMIC_PRICE_SOURCE_HELPER,
+    DYNAMIC_PRICE_SOURCE_NONE,
     DOMAIN,
-    EMLOG_EXPORT_PATH,
     METER_INDICES,
     METER_TYPE_GAS,
     METER_TYPE_STROM,
 )
+from .tariff import format_tariff_periods, parse_tariff_periods
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -89,45 +120,42 @@ async def validate_emlog_connection(hass, host: str, meter_index: int) -> dict[s
     Returns:
         Dict mit error key wenn Fehler, sonst leeres dict
     """
-    session = async_get_clientsession(hass)
-    url = f"http://{host}{EMLOG_EXPORT_PATH}?export&meterindex={meter_index}"
+    client = EmlogApiClient(hass, host)
 
     try:
-        async with session.get(url, timeout=10) as resp:
-            if resp.status != 200:
-                return {"base": "cannot_connect", "error_detail": f"HTTP {resp.status} für Meter-Index {meter_index}"}
+        data = await client.async_get_export(meter_index)
 
-            # Versuche JSON zu parsen
-            try:
-                data = await resp.json(content_type=None)
-            except Exception as err:
-                return {"base": "invalid_response", "error_detail": f"Ungültige JSON-Antwort: {err}"}
+        # Prüfe ob die erwarteten Emlog-Felder vorhanden sind
+        if not isinstance(data, dict):
+            return {"base": "invalid_response", "error_detail": "JSON ist kein Dictionary"}
 
-            # Prüfe ob die erwarteten Emlog-Felder vorhanden sind
-            if not isinstance(data, dict):
-                return {"base": "invalid_response", "error_detail": "JSON ist kein Dictionary"}
+        # Prüfe auf typische Emlog-Felder
+        expected_fields = ["product", "version", "Zaehlerstand_Bezug", "Wirkleistung_Bezug"]
+        missing_fields = [field for field in expected_fields if field not in data]
 
-            # Prüfe auf typische Emlog-Felder
-            expected_fields = ["product", "version", "Zaehlerstand_Bezug", "Wirkleistung_Bezug"]
-            missing_fields = [field for field in expected_fields if field not in data]
+        if missing_fields:
+            return {"base": "invalid_response", "error_detail": f"Fehlende Felder: {', '.join(missing_fields)}"}
 
-            if missing_fields:
-                return {"base": "invalid_response", "error_detail": f"Fehlende Felder: {', '.join(missing_fields)}"}
+        # Prüfe ob es wirklich Emlog ist
+        product = data.get("product", "")
+        if "emlog" not in product.lower():
+            return {"base": "invalid_response", "error_detail": f"Kein Emlog-Gerät (product: {product})"}
 
-            # Prüfe ob es wirklich Emlog ist
-            product = data.get("product", "")
-            if "emlog" not in product.lower():
-                return {"base": "invalid_response", "error_detail": f"Kein Emlog-Gerät (product: {product})"}
-
-            _LOGGER.debug(f"Successfully validated meter (index {meter_index})")
-            return {}
+        _LOGGER.debug(f"Successfully validated meter (index {meter_index})")
+        return {}
 
+    except EmlogHttpError as err:
+        return {"base": "cannot_connect", "error_detail": f"HTTP {err.status} für Meter-Index {meter_index}"}
+    except ValueError as err:
+        return {"base": "invalid_response", "error_detail": f"Ungültige JSON-Antwort: {err}"}
     except asyncio.TimeoutError:
         return {"base": "timeout_connect", "error_detail": f"Timeout beim Verbinden zu {host}"}
     except aiohttp.ClientConnectorError as err:
         return {"base": "cannot_connect", "error_detail": f"Verbindung zu {host} fehlgeschlagen: {err}"}
     except Exception as err:
         return {"base": "unknown", "error_detail": f"Unerwarteter Fehler: {type(err).__name__} - {err}"}
+    finally:
+        await client.async_close()
 
 
 class EmlogConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -257,10 +285,26 @@ class EmlogOptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_MONTHLY_ADVANCE_GAS_HELPER, data.get(CONF_MONTHLY_ADVANCE_GAS_HELPER, "")
             )
 
+        tariffs_key = CONF_TARIFFS_STROM if meter_type == METER_TYPE_STROM else CONF_TARIFFS_GAS
+
         if user_input is not None:
-            # Entferne leere Helper-Entity-IDs aus der Eingabe
-            cleaned_input = {k: v for k, v in user_input.items() if not (k.endswith("_helper") and not v)}
-            return self.async_create_entry(title="", data=cleaned_input)
+            min_interval = user_input.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
+            max_interval = user_input.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+            if min_interval > max_interval:
+                errors["base"] = "invalid_scan_interval_bounds"
+            else:
+                # Tarif-Zeitleiste prüfen und normalisiert (sortiert) speichern
+                try:
+                    user_input[tariffs_key] = format_tariff_periods(
+                        parse_tariff_periods(user_input.get(tariffs_key, ""))
+                    )
+                except ValueError:
+                    errors["base"] = "invalid_tariff_timeline"
+
+            if not errors:
+                # Entferne leere Helper-Entity-IDs aus der Eingabe
+                cleaned_input = {k: v for k, v in user_input.items() if not (k.endswith("_helper") and not v)}
+                return self.async_create_entry(title="", data=cleaned_input)
 
         # Build schema dynamically: only include helper fields if they have values
         schema_dict = {
@@ -345,6 +389,41 @@ class EmlogOptionsFlowHandler(config_entries.OptionsFlow):
         else:
             schema_dict[vol.Optional(new_base_price_helper_key, default="")] = str
 
+        # Tarif-Zeitleiste: mehrere Perioden, je Zeile "JJJJ-MM-TT;Arbeitspreis;Grundpreis"
+        current_tariffs = options.get(tariffs_key, data.get(tariffs_key, ""))
+        schema_dict[vol.Optional(tariffs_key, default=current_tariffs)] = selector.TextSelector(
+            selector.TextSelectorConfig(multiline=True)
+        )
+
+        # Dynamische Preise (Kosten = Σ Verbrauchsdelta × zum Zeitpunkt gültiger Preis)
+        schema_dict[
+            vol.Optional(
+                CONF_DYNAMIC_PRICE_SOURCE,
+                default=options.get(CONF_DYNAMIC_PRICE_SOURCE, DYNAMIC_PRICE_SOURCE_NONE),
+            )
+        ] = vol.In(
+            {
+                DYNAMIC_PRICE_SOURCE_NONE: "Keine",
+                DYNAMIC_PRICE_SOURCE_HELPER: "Helper-Verlauf",
+                DYNAMIC_PRICE_SOURCE_CSV: "CSV-Datei",
+                DYNAMIC_PRICE_SOURCE_FORECAST: "Prognose-Attribut",
+            }
+        )
+        current_dynamic_price_entity = options.get(CONF_DYNAMIC_PRICE_ENTITY, "")
+        if current_dynamic_price_entity:
+            schema_dict[vol.Optional(CONF_DYNAMIC_PRICE_ENTITY, default=current_dynamic_price_entity)] = (
+                selector.EntitySelector(selector.EntitySelectorConfig(domain=["input_number", "sensor"]))
+            )
+        else:
+            schema_dict[vol.Optional(CONF_DYNAMIC_PRICE_ENTITY, default="")] = str
+        schema_dict[
+            vol.Optional(
+                CONF_DYNAMIC_PRICE_ATTRIBUTE,
+                default=options.get(CONF_DYNAMIC_PRICE_ATTRIBUTE, DEFAULT_DYNAMIC_PRICE_ATTRIBUTE),
+            )
+        ] = str
+        schema_dict[vol.Optional(CONF_DYNAMIC_PRICE_CSV, default=options.get(CONF_DYNAMIC_PRICE_CSV, ""))] = str
+
         # Settlement month (Abrechnungsmonat)
         schema_dict[vol.Optional(CONF_SETTLEMENT_MONTH, default=current_settlement_month)] = vol.In(
             {
@@ -363,6 +442,22 @@ class EmlogOptionsFlowHandler(config_entries.OptionsFlow):
             }
         )
 
+        # Verbrauch pro Tag/Monat/Jahr: externe Utility Meter oder integrierter Akkumulator
+        schema_dict[
+            vol.Optional(
+                CONF_CONSUMPTION_SOURCE,
+                default=options.get(CONF_CONSUMPTION_SOURCE, CONSUMPTION_SOURCE_UTILITY_METER),
+            )
+        ] = vol.In(
+            {
+                CONSUMPTION_SOURCE_UTILITY_METER: "Utility Meter",
+                CONSUMPTION_SOURCE_NATIVE: "Integriert",
+            }
+        )
+        schema_dict[
+            vol.Optional(CONF_ALIGN_TO_SETTLEMENT, default=options.get(CONF_ALIGN_TO_SETTLEMENT, False))
+        ] = bool
+
         # Feed-in sensors (only for electricity)
         if meter_type == METER_TYPE_STROM:
             current_include_feed_in = options.get(
@@ -370,6 +465,48 @@ class EmlogOptionsFlowHandler(config_entries.OptionsFlow):
             )
             schema_dict[vol.Optional(CONF_INCLUDE_FEED_IN_SENSORS, default=current_include_feed_in)] = bool
 
+        # HTTP-Timeouts (gelten für alle Zähler des Geräts, der großzügigste Wert gewinnt)
+        schema_dict[
+            vol.Optional(CONF_CONNECT_TIMEOUT, default=options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT))
+        ] = vol.All(vol.Coerce(float), vol.Range(min=1, max=60))
+        schema_dict[vol.Optional(CONF_READ_TIMEOUT, default=options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT))] = (
+            vol.All(vol.Coerce(float), vol.Range(min=1, max=120))
+        )
+
+        # Adaptives Polling (Intervall zwischen Minimum und Maximum je nach Änderung der Leistung)
+        schema_dict[vol.Optional(CONF_ADAPTIVE_POLLING, default=options.get(CONF_ADAPTIVE_POLLING, False))] = bool
+        schema_dict[
+            vol.Optional(CONF_MIN_SCAN_INTERVAL, default=options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL))
+        ] = vol.All(vol.Coerce(int), vol.Range(min=1, max=3600))
+        schema_dict[
+            vol.Optional(CONF_MAX_SCAN_INTERVAL, default=options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL))
+        ] = vol.All(vol.Coerce(int), vol.Range(min=1, max=3600))
+
+        # Zeitstempel-Refresh bei unveränderter Payload (0 = nur bei Änderungen)
+        schema_dict[
+            vol.Optional(
+                CONF_HEARTBEAT_INTERVAL, default=options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL)
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=86400))
+
+        # Ringpuffer der letzten Messwerte pro Zähler (0 = aus)
+        schema_dict[
+            vol.Optional(
+                CONF_SAMPLE_BUFFER_SIZE, default=options.get(CONF_SAMPLE_BUFFER_SIZE, DEFAULT_SAMPLE_BUFFER_SIZE)
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=100000))
+
+        # Schneller Start: Entities sofort mit letztem Zustand, erster Abruf im Hintergrund
+        schema_dict[vol.Optional(CONF_FAST_START, default=options.get(CONF_FAST_START, False))] = bool
+
+        # Persistente Zeitreihe unter .storage/emlog/
+        schema_dict[
+            vol.Optional(CONF_TIMESERIES_STORE, default=options.get(CONF_TIMESERIES_STORE, False))
+        ] = bool
+
+        # Mitschnitt der rohen API-Antworten für Replay-Tests
+        schema_dict[vol.Optional(CONF_RECORD_TRACES, default=options.get(CONF_RECORD_TRACES, False))] = bool
+
         # Gas-specific fields: only show for gas meters
         if meter_type == METER_TYPE_GAS:
             schema_dict[vol.Optional(CONF_GAS_BRENNWERT, default=current_brennwert)] = vol.Coerce(float)
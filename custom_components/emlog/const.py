@@ -21,6 +21,16 @@ CONF_SETTLEMENT_MONTH = "settlement_month"
 CONF_METER_TYPE = "meter_type"  # "strom" oder "gas"
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_INCLUDE_FEED_IN_SENSORS = "include_feed_in_sensors"
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+CONF_SAMPLE_BUFFER_SIZE = "sample_buffer_size"
+CONF_TIMESERIES_STORE = "timeseries_store"
+CONF_RECORD_TRACES = "record_traces"  # Rohe Antworten nach .storage/emlog/traces/ mitschneiden
+CONF_FAST_START = "fast_start"  # Erster Abruf im Hintergrund statt beim Setup
 
 # Tarifwechsel (für Preisänderungen)
 CONF_PRICE_CHANGE_DATE_STROM = "price_change_date_strom"
@@ -33,24 +43,93 @@ CONF_BASE_PRICE_STROM_NEW = "base_price_strom_new"
 CONF_BASE_PRICE_GAS_NEW = "base_price_gas_new"
 CONF_BASE_PRICE_STROM_NEW_HELPER = "base_price_strom_new_helper"
 CONF_BASE_PRICE_GAS_NEW_HELPER = "base_price_gas_new_helper"
+# Tarif-Zeitleiste (mehrere Perioden "JJJJ-MM-TT;Arbeitspreis;Grundpreis", ersetzt den einzelnen Wechsel)
+CONF_TARIFFS_STROM = "tariffs_strom"
+CONF_TARIFFS_GAS = "tariffs_gas"
+# Dynamische Preise (Zeitreihe statt eines festen Arbeitspreises)
+CONF_DYNAMIC_PRICE_SOURCE = "dynamic_price_source"
+CONF_DYNAMIC_PRICE_ENTITY = "dynamic_price_entity"  # Helper bzw. Entity mit Prognose-Attribut
+CONF_DYNAMIC_PRICE_ATTRIBUTE = "dynamic_price_attribute"
+CONF_DYNAMIC_PRICE_CSV = "dynamic_price_csv"  # Pfad relativ zum Config-Verzeichnis
+# Verbrauch pro Tag/Monat/Jahr (externe Utility Meter oder integrierter Akkumulator)
+CONF_CONSUMPTION_SOURCE = "consumption_source"
+CONF_ALIGN_TO_SETTLEMENT = "align_to_settlement"  # Verbrauchsjahr beginnt nach dem Abrechnungsmonat
 
 # Meter Types
 METER_TYPE_STROM = "strom"
 METER_TYPE_GAS = "gas"
 
+# Quellen für dynamische Preise
+DYNAMIC_PRICE_SOURCE_NONE = "none"
+DYNAMIC_PRICE_SOURCE_HELPER = "helper"  # Verlauf einer input_number/sensor Entity
+DYNAMIC_PRICE_SOURCE_CSV = "csv"  # Lokale Datei "Zeitpunkt;Preis"
+DYNAMIC_PRICE_SOURCE_FORECAST = "forecast"  # Attribut-Array, z.B. von Tibber/Nordpool
+
+# Quellen für den Verbrauch pro Zeitraum
+CONSUMPTION_SOURCE_UTILITY_METER = "utility_meter"  # Drei utility_meter Config Entries pro Zähler
+CONSUMPTION_SOURCE_NATIVE = "native"  # EmlogPeriodAccumulator direkt im Coordinator
+
 # Meter Indices
 METER_INDICES = [1, 2, 3, 4]
 
 # Defaults
 DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_MIN_SCAN_INTERVAL = 5
+DEFAULT_MAX_SCAN_INTERVAL = 300
+DEFAULT_HEARTBEAT_INTERVAL = 300  # Sekunden; Zeitstempel-Refresh bei unveränderter Payload (0 = aus)
+DEFAULT_SAMPLE_BUFFER_SIZE = 2880  # Samples im Ringpuffer pro Zähler (24 h bei 30 s, ca. 113 KiB)
 DEFAULT_PRICE_KWH = 0.0
 DEFAULT_BASE_PRICE_STROM = 0.0
 DEFAULT_BASE_PRICE_GAS = 0.0
 DEFAULT_MONTHLY_ADVANCE_STROM = 0.0
 DEFAULT_MONTHLY_ADVANCE_GAS = 0.0
 DEFAULT_SETTLEMENT_MONTH = 12
+DEFAULT_DYNAMIC_PRICE_ATTRIBUTE = "prices"
 DEFAULT_GAS_BRENNWERT = 10.88
 DEFAULT_GAS_ZUSTANDSZAHL = 1.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 10.0
+
+# Adaptives Polling
+ADAPTIVE_SPEEDUP_FACTOR = 0.5  # Intervall-Faktor, wenn sich Werte bewegen
+ADAPTIVE_BACKOFF_FACTOR = 1.5  # Intervall-Faktor bei flachen Werten
+ADAPTIVE_POWER_MIN_DELTA_W = 5.0  # Leistungsänderung unterhalb dieser Schwelle gilt als Rauschen
+ADAPTIVE_POWER_REL_DELTA = 0.05  # ... bzw. unterhalb von 5 % der letzten Leistung
+
+# Circuit Breaker pro Gerät
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3  # Fehlgeschlagene Zyklen bis der Breaker öffnet
+CIRCUIT_BREAKER_BASE_BACKOFF = 60  # Sekunden, verdoppelt sich bei jedem erneuten Öffnen
+CIRCUIT_BREAKER_MAX_BACKOFF = 900  # Sekunden
+CIRCUIT_BREAKER_JITTER = 0.2  # ±20 % Zufallsanteil, damit nicht alle Geräte gleichzeitig proben
+
+# Laufzeit-Metriken pro Zähler (Diagnose-Download und Diagnose-Sensoren)
+METRICS_WINDOW = 500  # Letzte Messungen pro Kennzahl für p50/p95/p99
+METRICS_LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)  # Obergrenzen des Histogramms
+ERROR_CLASS_HTTP = "http"  # HTTP-Status != 200
+ERROR_CLASS_TIMEOUT = "timeout"
+ERROR_CLASS_CIRCUIT_OPEN = "circuit_open"  # Kein Request, Breaker offen
+ERROR_CLASS_INVALID_JSON = "invalid_json"
+# Sonstige Fehler werden nach Exception-Klasse gezählt (z. B. ClientConnectorError)
+
+# hass.data[DOMAIN] Schlüssel
+DATA_COORDINATORS = "coordinators"  # host -> EmlogHostCoordinator
+DATA_SETTINGS = "settings"  # entry_id -> EmlogEntrySettings
+DATA_TIMESERIES = "timeseries"  # entry_id -> EmlogTimeSeriesStore
+DATA_SAMPLES = "samples"  # entry_id -> EmlogSampleBuffer
+DATA_ACCUMULATORS = "accumulators"  # entry_id -> EmlogPeriodAccumulator
+DATA_UTILITY_METER_TASKS = "utility_meter_tasks"  # entry_id -> laufendes Utility-Meter-Setup (asyncio.Task)
+
+# Dispatcher-Signale (Platzhalter: entry_id)
+SIGNAL_ENTITIES_REGISTERED = f"{DOMAIN}_entities_registered_{{}}"  # Zählerstands-Entity ist registriert
 
 # API
 EMLOG_EXPORT_PATH = "/pages/getinformation.php"
+MAX_PARALLEL_REQUESTS_PER_HOST = 4  # Gleichzeitige Requests an ein Emlog-Gerät (ein Zyklus ≈ ein Round Trip)
+# Keep-Alive muss über dem längsten Poll-Abstand liegen, sonst schließt jeder Poll die Verbindung.
+# Der Host-Coordinator leitet ihn aus den Intervallen seiner Zähler ab (mindestens HTTP_KEEPALIVE_TIMEOUT).
+HTTP_KEEPALIVE_TIMEOUT = 120  # Sekunden
+HTTP_KEEPALIVE_MARGIN = 30  # Sekunden über dem längsten (ggf. adaptiven) Poll-Intervall
+HTTP_DNS_CACHE_TTL = 300  # Sekunden
@@ -1,32 +1,313 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 import logging
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+import random
+import re
+import time
+from dataclasses import dataclass, replace
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant import config_entries
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
-from .const import DOMAIN, EMLOG_EXPORT_PATH
+from .api import EmlogApiClient, EmlogClientStats, EmlogHttpError
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_POWER_MIN_DELTA_W,
+    ADAPTIVE_POWER_REL_DELTA,
+    ADAPTIVE_SPEEDUP_FACTOR,
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CIRCUIT_BREAKER_BASE_BACKOFF,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_JITTER,
+    CIRCUIT_BREAKER_MAX_BACKOFF,
+    DATA_COORDINATORS,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_SAMPLE_BUFFER_SIZE,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    ERROR_CLASS_CIRCUIT_OPEN,
+    ERROR_CLASS_HTTP,
+    ERROR_CLASS_INVALID_JSON,
+    ERROR_CLASS_TIMEOUT,
+    HTTP_KEEPALIVE_MARGIN,
+    HTTP_KEEPALIVE_TIMEOUT,
+    MAX_PARALLEL_REQUESTS_PER_HOST,
+)
+from .metrics import EmlogCoordinatorMetrics
+from .samples import EmlogSampleBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60  # Sekunden; höchstens ein Schreibvorgang pro Minute und Zähler
 
-@dataclass
+
+@dataclass(slots=True)
+class EmlogReading:
+    """Einmal geparster Export eines Zählers mit bereits konvertierten Werten.
+
+    Ersetzt das verschachtelte API-JSON, damit Entities nur noch Attribute
+    lesen statt bei jedem Zugriff .get(...).get(...) und float(...) auszuführen.
+    """
+
+    product: str = "Unknown"
+    version: float = 0.0
+    # Zaehlerstand_Bezug / Zaehlerstand_Lieferung
+    stand180: float = 0.0
+    stand280: float = 0.0
+    # Wirkleistung_Bezug / Wirkleistung_Lieferung
+    leistung170: float = 0.0
+    leistung171: float = 0.0
+    leistung172: float = 0.0
+    leistung173: float = 0.0
+    leistung270: float = 0.0
+    leistung271: float = 0.0
+    leistung272: float = 0.0
+    leistung273: float = 0.0
+    # Kwh_Bezug / Kwh_Lieferung (Tagesverbrauch)
+    kwh180: float = 0.0
+    kwh181: float = 0.0
+    kwh182: float = 0.0
+    kwh280: float = 0.0
+    kwh281: float = 0.0
+    kwh282: float = 0.0
+    # Betrag_Bezug / Betrag_Lieferung / DiffBezugLieferung
+    betrag180: float = 0.0
+    betrag280: float = 0.0
+    betrag_diff: float = 0.0
+    currency: str = "EUR"
+
+    @classmethod
+    def from_export(cls, data: dict) -> EmlogReading:
+        """Parse die Emlog-Export-Antwort.
+
+        Raises:
+            ValueError / TypeError: Bei nicht konvertierbaren Werten
+        """
+        bezug = data.get("Zaehlerstand_Bezug") or {}
+        lieferung = data.get("Zaehlerstand_Lieferung") or {}
+        leistung_bezug = data.get("Wirkleistung_Bezug") or {}
+        leistung_lieferung = data.get("Wirkleistung_Lieferung") or {}
+        kwh_bezug = data.get("Kwh_Bezug") or {}
+        kwh_lieferung = data.get("Kwh_Lieferung") or {}
+        betrag_bezug = data.get("Betrag_Bezug") or {}
+        betrag_lieferung = data.get("Betrag_Lieferung") or {}
+        diff = data.get("DiffBezugLieferung") or {}
+
+        return cls(
+            product=str(data.get("product", "Unknown")),
+            version=float(data.get("version", 0) or 0),
+            stand180=float(bezug.get("Stand180", 0) or 0),
+            stand280=float(lieferung.get("Stand280", 0) or 0),
+            leistung170=float(leistung_bezug.get("Leistung170", 0) or 0),
+            leistung171=float(leistung_bezug.get("Leistung171", 0) or 0),
+            leistung172=float(leistung_bezug.get("Leistung172", 0) or 0),
+            leistung173=float(leistung_bezug.get("Leistung173", 0) or 0),
+            leistung270=float(leistung_lieferung.get("Leistung270", 0) or 0),
+            leistung271=float(leistung_lieferung.get("Leistung271", 0) or 0),
+            leistung272=float(leistung_lieferung.get("Leistung272", 0) or 0),
+            leistung273=float(leistung_lieferung.get("Leistung273", 0) or 0),
+            kwh180=float(kwh_bezug.get("Kwh180", 0) or 0),
+            kwh181=float(kwh_bezug.get("Kwh181", 0) or 0),
+            kwh182=float(kwh_bezug.get("Kwh182", 0) or 0),
+            kwh280=float(kwh_lieferung.get("Kwh280", 0) or 0),
+            kwh281=float(kwh_lieferung.get("Kwh281", 0) or 0),
+            kwh282=float(kwh_lieferung.get("Kwh282", 0) or 0),
+            betrag180=float(betrag_bezug.get("Betrag180", 0) or 0),
+            betrag280=float(betrag_lieferung.get("Betrag280", 0) or 0),
+            betrag_diff=float(diff.get("Betrag", 0) or 0),
+            # Währung kann an verschiedenen Positionen stehen
+            currency=betrag_bezug.get("Waehrung") or betrag_lieferung.get("Waehrung") or "EUR",
+        )
+
+
+READING_FIELDS = tuple(field.name for field in dataclasses.fields(EmlogReading))
+
+
+@dataclass(slots=True)
 class EmlogData:
     """Data from Emlog API for a single meter."""
 
-    meter_data: dict  # Raw JSON data from API
-    api_status: str = "connected"  # "connected" oder "failed" oder "initializing"
+    reading: EmlogReading | None  # Geparster Export, None solange noch keine Daten vorliegen
+    api_status: str = "connected"  # "connected", "failed", "initializing" oder "restored" (aus Snapshot)
     last_error: str | None = None  # Fehlerbeschreibung bei Fehler
     last_successful_update: datetime | None = None  # Letzter erfolgreicher Update
     currency: str = "EUR"  # Währung aus API, default EUR
 
+    def as_snapshot(self) -> dict[str, Any]:
+        """JSON-fähiger Snapshot der letzten Messwerte (für den Store)."""
+        return {
+            "reading": dataclasses.asdict(self.reading) if self.reading is not None else None,
+            "last_successful_update": (
+                self.last_successful_update.isoformat() if self.last_successful_update is not None else None
+            ),
+            "currency": self.currency,
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict[str, Any]) -> EmlogData | None:
+        """EmlogData mit api_status "restored" aus einem gespeicherten Snapshot.
+
+        Unbekannte Felder (ältere/neuere Versionen) werden ignoriert, fehlende
+        bekommen den Default. Liefert None, wenn der Snapshot keine Messwerte enthält.
+        """
+        values = snapshot.get("reading")
+        if not isinstance(values, dict):
+            return None
+
+        reading = EmlogReading(**{field: values[field] for field in READING_FIELDS if field in values})
+        last_update = snapshot.get("last_successful_update")
+        return cls(
+            reading=reading,
+            api_status="restored",
+            last_error=None,
+            last_successful_update=datetime.fromisoformat(last_update) if last_update else None,
+            currency=snapshot.get("currency") or reading.currency,
+        )
+
+
+def snapshot_store(hass: HomeAssistant, host: str, meter_index: int) -> Store[dict[str, Any]]:
+    """Store des Snapshots eines Zählers (Host wird für den Schlüssel bereinigt)."""
+    return Store(
+        hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.snapshot.{re.sub(r'[^A-Za-z0-9]+', '_', host)}_{meter_index}"
+    )
+
+
+# Felder von EmlogData, die neben den Werten der EmlogReading per Diff verglichen werden
+STATUS_FIELDS = ("api_status", "last_error", "last_successful_update")
+
+
+def changed_fields(old: EmlogData | None, new: EmlogData | None) -> set[str] | None:
+    """Ermittle die geänderten Felder zwischen zwei Snapshots eines Zählers.
+
+    Messwerte werden unter ihrem EmlogReading-Attribut geliefert (z.B.
+    "leistung170", "currency"), Status-Werte unter ihrem EmlogData-Namen.
+
+    Returns:
+        Menge der geänderten Felder, None wenn alles als geändert gilt
+        (erster Snapshot)
+    """
+    if old is None or new is None:
+        return None
+
+    changed = {field for field in STATUS_FIELDS if getattr(old, field) != getattr(new, field)}
+
+    old_reading, new_reading = old.reading, new.reading
+    if old_reading is new_reading:
+        return changed
+    if old_reading is None or new_reading is None:
+        changed.update(READING_FIELDS)
+        return changed
+
+    changed.update(field for field in READING_FIELDS if getattr(old_reading, field) != getattr(new_reading, field))
+    return changed
+
+
+class EmlogCircuitBreaker:
+    """Circuit Breaker pro Emlog-Gerät.
+
+    closed:    normaler Betrieb, fehlgeschlagene Zyklen werden gezählt
+    open:      nach failure_threshold Fehlzyklen - keine Requests bis zum Ablauf
+               des Backoffs (exponentiell, mit Jitter)
+    half_open: Backoff abgelaufen - ein einzelner Probe-Request entscheidet,
+               ob der Breaker schließt oder mit doppeltem Backoff wieder öffnet
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        base_backoff: float = CIRCUIT_BREAKER_BASE_BACKOFF,
+        max_backoff: float = CIRCUIT_BREAKER_MAX_BACKOFF,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = BREAKER_CLOSED
+        self.failed_cycles = 0  # Aufeinanderfolgende Zyklen ohne eine einzige erfolgreiche Antwort
+        self.retry_delay = 0.0  # Aktueller Backoff in Sekunden (inkl. Jitter)
+        self._open_count = 0  # Wie oft der Breaker seit dem letzten Erfolg geöffnet wurde
+        self._retry_at = 0.0  # time.monotonic() des nächsten Probe-Requests
+
+    @property
+    def is_blocking(self) -> bool:
+        """True, solange der Breaker offen ist und der Backoff noch läuft."""
+        return self.state == BREAKER_OPEN and time.monotonic() < self._retry_at
+
+    @property
+    def retry_in(self) -> float:
+        """Sekunden bis zum nächsten Probe-Request (0 wenn nicht offen)."""
+        if self.state != BREAKER_OPEN:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def start_cycle(self) -> bool:
+        """Zu Beginn eines Poll-Zyklus aufrufen.
+
+        Solange der Breaker offen ist, plant der Host-Coordinator den nächsten
+        Zyklus erst nach Ablauf des Backoffs - ein Zyklus bei offenem Breaker
+        ist daher immer der Probe-Zyklus.
+
+        Returns:
+            True, wenn dieser Zyklus nur ein Probe-Request (half_open) sein darf
+        """
+        if self.state == BREAKER_OPEN:
+            self.state = BREAKER_HALF_OPEN
+        return self.state == BREAKER_HALF_OPEN
+
+    def record_success(self) -> None:
+        """Mindestens eine Antwort im Zyklus war erfolgreich."""
+        if self.state != BREAKER_CLOSED:
+            _LOGGER.info(f"Circuit breaker closed after {self.failed_cycles} failed cycles")
+        self.state = BREAKER_CLOSED
+        self.failed_cycles = 0
+        self.retry_delay = 0.0
+        self._open_count = 0
+
+    def record_failure(self) -> None:
+        """Kein einziger Request im Zyklus war erfolgreich."""
+        self.failed_cycles += 1
+        if self.state == BREAKER_HALF_OPEN or self.failed_cycles >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        """Öffne den Breaker mit exponentiellem Backoff und Jitter."""
+        self._open_count += 1
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (self._open_count - 1))
+        self.retry_delay = backoff * random.uniform(1 - CIRCUIT_BREAKER_JITTER, 1 + CIRCUIT_BREAKER_JITTER)
+        self._retry_at = time.monotonic() + self.retry_delay
+        if self._open_count == 1:
+            _LOGGER.warning(
+                f"Circuit breaker open after {self.failed_cycles} failed cycles - "
+                f"next probe in {self.retry_delay:.0f}s"
+            )
+        else:
+            _LOGGER.debug(f"Circuit breaker probe failed - next probe in {self.retry_delay:.0f}s")
+        self.state = BREAKER_OPEN
+
 
 class EmlogCoordinator(DataUpdateCoordinator[EmlogData]):
-    """Coordinator für einen einzelnen Emlog-Zähler (Strom ODER Gas)."""
+    """Coordinator für einen einzelnen Emlog-Zähler (Strom ODER Gas).
+
+    Pollt nicht selbst, sondern ist eine Sicht auf den gemeinsamen
+    EmlogHostCoordinator des Geräts. Nur der initiale Refresh beim Setup
+    läuft direkt über diesen Coordinator.
+    """
 
     def __init__(
         self,
@@ -36,12 +317,49 @@ class EmlogCoordinator(DataUpdateCoordinator[EmlogData]):
         meter_index: int,
         scan_interval_s: int,
         config_entry=None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        adaptive_polling: bool = False,
+        min_scan_interval_s: int = DEFAULT_MIN_SCAN_INTERVAL,
+        max_scan_interval_s: int = DEFAULT_MAX_SCAN_INTERVAL,
+        heartbeat_interval_s: int = DEFAULT_HEARTBEAT_INTERVAL,
+        sample_buffer_size: int = DEFAULT_SAMPLE_BUFFER_SIZE,
     ):
         self.hass = hass
         self.host = host
         self.meter_type = meter_type  # "strom" oder "gas"
         self.meter_index = meter_index
         self.config_entry = config_entry  # Store for dynamic value access
+        self.scan_interval = scan_interval_s  # Gewünschtes Intervall, wird vom Host-Coordinator ausgewertet
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # Adaptives Polling: Intervall folgt der beobachteten Änderung der Leistung (Leistung170)
+        self.adaptive_polling = adaptive_polling
+        self.min_scan_interval = min_scan_interval_s
+        self.max_scan_interval = max_scan_interval_s
+        self._adaptive_interval = float(scan_interval_s)
+        self._last_power: float | None = None
+        # Unveränderte Payloads lösen keine Listener aus, nur alle heartbeat_interval Sekunden
+        # wird der Zeitstempel des letzten Updates aufgefrischt (0 = nie)
+        self.heartbeat_interval = heartbeat_interval_s
+        self._payload_fingerprint: int | None = None
+        # Feld-Listener: Callback -> Felder, bei deren Änderung er aufgerufen wird
+        self._field_listeners: dict[CALLBACK_TYPE, frozenset[str]] = {}
+        self._dispatched_data: EmlogData | None = None
+        # Poll-Listener: laufen nach jedem Poll, auch bei unveränderter Payload (Laufzeit-Metriken)
+        self._poll_listeners: list[CALLBACK_TYPE] = []
+        # Letzte Messwerte im Speicher für Fensterabfragen ohne Recorder (0 = aus)
+        self.samples = EmlogSampleBuffer(sample_buffer_size)
+        # Letzter Snapshot unter .storage, damit Entities nach einem Neustart sofort Werte haben
+        self._snapshot_store = snapshot_store(hass, host, meter_index)
+        self._snapshot_save_pending = False
+        # Optionaler persistenter Zeitreihen-Speicher (EmlogTimeSeriesStore), wird vom Setup gesetzt
+        self.timeseries = None
+        # Optionaler Mitschnitt der rohen Antworten (EmlogTraceRecorder), wird vom Setup gesetzt
+        self.trace_recorder = None
+        # Latenz, Payload, Parse-/Fan-out-Zeit und Fehlerklassen (diagnostics.py, Diagnose-Sensoren)
+        self.metrics = EmlogCoordinatorMetrics()
+        self._host_coordinator = async_get_host_coordinator(hass, host)
         self._failed_updates = 0  # Zähler für aufeinanderfolgende Fehler
         self._last_error: str | None = None  # Beschreibung des letzten Fehlers
 
@@ -49,35 +367,138 @@ class EmlogCoordinator(DataUpdateCoordinator[EmlogData]):
             hass,
             logger=_LOGGER,
             name=f"{DOMAIN}_{host}_{meter_type}_{meter_index}",
-            update_interval=timedelta(seconds=scan_interval_s),
+            update_interval=None,  # Polling übernimmt der EmlogHostCoordinator
         )
 
-    async def _fetch_export(self) -> tuple[dict | None, str | None]:
-        """Fetch export data from Emlog.
+    @property
+    def poll_interval(self) -> float:
+        """Aktuell gewünschtes Poll-Intervall dieses Zählers in Sekunden."""
+        if self.adaptive_polling:
+            return self._adaptive_interval
+        return self.scan_interval
+
+    @callback
+    def _async_adapt_interval(self, reading: EmlogReading) -> None:
+        """Passe das adaptive Intervall an die Änderung seit dem letzten Poll an.
+
+        Ändert sich die Leistung über die Rauschschwelle hinaus, wird das
+        Intervall halbiert (bis min_scan_interval), bei gleichbleibender
+        Leistung schrittweise bis max_scan_interval verlängert. Der Zählerstand
+        zählt bewusst nicht: unter jeder Grundlast steigt er bei jedem Poll,
+        das Intervall bliebe sonst dauerhaft beim Minimum.
+        """
+        power = reading.leistung170
+
+        if self._last_power is not None:
+            power_threshold = max(ADAPTIVE_POWER_MIN_DELTA_W, abs(self._last_power) * ADAPTIVE_POWER_REL_DELTA)
+
+            if abs(power - self._last_power) > power_threshold:
+                self._adaptive_interval = max(
+                    float(self.min_scan_interval), self._adaptive_interval * ADAPTIVE_SPEEDUP_FACTOR
+                )
+            else:
+                self._adaptive_interval = min(
+                    float(self.max_scan_interval), self._adaptive_interval * ADAPTIVE_BACKOFF_FACTOR
+                )
+
+        self._last_power = power
+
+    @property
+    def circuit_breaker(self) -> EmlogCircuitBreaker:
+        """Circuit Breaker des Geräts (gemeinsam für alle Zähler des Hosts)."""
+        return self._host_coordinator.circuit_breaker
+
+    @property
+    def client_stats(self) -> EmlogClientStats:
+        """Verbindungsstatistik des Geräts (gemeinsam für alle Zähler des Hosts)."""
+        return self._host_coordinator.client.stats
+
+    @callback
+    def async_attach(self) -> CALLBACK_TYPE:
+        """Hänge diesen Zähler an den Poll-Zyklus des Host-Coordinators.
 
         Returns:
-            Tuple of (data, error_message)
-            - (dict, None): Erfolgreich
-            - (None, str): Fehler
+            Callback zum Abmelden (für entry.async_on_unload)
         """
-        session = async_get_clientsession(self.hass)
-        url = f"http://{self.host}{EMLOG_EXPORT_PATH}?export&meterindex={self.meter_index}"
+        return self._host_coordinator.async_register_meter(self)
 
-        try:
-            async with session.get(url, timeout=10) as resp:
-                if resp.status != 200:
-                    error_msg = f"HTTP {resp.status} von {self.host} (Index {self.meter_index})"
-                    _LOGGER.warning(error_msg)
-                    return None, error_msg
-                return await resp.json(content_type=None), None
-        except asyncio.TimeoutError:
-            error_msg = f"Timeout beim Verbindungsaufbau zu {self.host} (Index {self.meter_index})"
-            _LOGGER.warning(error_msg)
-            return None, error_msg
-        except Exception as err:
-            error_msg = f"Fehler bei {self.host} (Index {self.meter_index}): {type(err).__name__} - {err}"
-            _LOGGER.warning(error_msg)
-            return None, error_msg
+    @callback
+    def async_handle_host_update(self) -> None:
+        """Übernimm die Daten dieses Zählers aus dem gemeinsamen Host-Poll."""
+        if not self._host_coordinator.data:
+            return
+        meter_data = self._host_coordinator.data.get(self.meter_index)
+        if meter_data is None:
+            return
+        # Identisches Objekt = unveränderte Payload, kein Fan-out an die Entities
+        if meter_data is not self.data:
+            self.async_set_updated_data(meter_data)
+        for update_callback in list(self._poll_listeners):
+            update_callback()
+
+    @callback
+    def async_add_poll_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Registriere einen Listener, der nach jedem Poll dieses Zählers läuft.
+
+        Anders als async_add_listener auch bei unveränderter Payload, für
+        Werte, die sich mit jedem Poll ändern (Latenz, erreichtes Intervall).
+
+        Returns:
+            Callback zum Abmelden
+        """
+        self._poll_listeners.append(update_callback)
+
+        @callback
+        def _async_remove_poll_listener() -> None:
+            if update_callback in self._poll_listeners:
+                self._poll_listeners.remove(update_callback)
+
+        return _async_remove_poll_listener
+
+    @callback
+    def async_add_field_listener(self, update_callback: CALLBACK_TYPE, fields: Iterable[str] | None) -> CALLBACK_TYPE:
+        """Registriere einen Listener nur für bestimmte Felder.
+
+        Der Callback wird nur aufgerufen, wenn sich mindestens eines der Felder
+        (siehe changed_fields) geändert hat. fields=None entspricht
+        async_add_listener (bei jedem Update).
+
+        Returns:
+            Callback zum Abmelden
+        """
+        if fields is None:
+            return self.async_add_listener(update_callback)
+
+        self._field_listeners[update_callback] = frozenset(fields)
+
+        @callback
+        def _async_remove_field_listener() -> None:
+            self._field_listeners.pop(update_callback, None)
+
+        return _async_remove_field_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Benachrichtige alle Listener und Feld-Listener mit geänderten Feldern."""
+        started = time.perf_counter()
+        super().async_update_listeners()
+
+        previous, self._dispatched_data = self._dispatched_data, self.data
+        changed = changed_fields(previous, self.data)
+        for update_callback, fields in list(self._field_listeners.items()):
+            if changed is None or not fields.isdisjoint(changed):
+                update_callback()
+        self.metrics.record_fanout(time.perf_counter() - started)
+
+    async def _fetch_export(self) -> tuple[bytes | None, str | None]:
+        """Fetch export data for this meter via the host coordinator.
+
+        Returns:
+            Tuple of (payload, error_message)
+            - (bytes, None): Erfolgreich
+            - (None, str): Fehler
+        """
+        return await self._host_coordinator.async_fetch_export(self.meter_index)
 
     async def _async_update_data(self) -> EmlogData:
         """Fetch data from API.
@@ -93,7 +514,45 @@ class EmlogCoordinator(DataUpdateCoordinator[EmlogData]):
         - API nicht erreichbar: Alte Daten behalten, api_status="failed", last_error=Details
         - Keine alten Daten: Leere Daten mit failed status
         """
-        meter_data, error = await self._fetch_export()
+        payload, error = await self._fetch_export()
+        return self.async_process_export(payload, error)
+
+    @callback
+    def async_process_export(self, payload: bytes | None, error: str | None) -> EmlogData:
+        """Erzeuge EmlogData aus dem Ergebnis eines Export-Abrufs.
+
+        Wird sowohl beim initialen Refresh als auch vom Host-Coordinator
+        nach dem gebündelten Abruf aller Zähler aufgerufen. Ist der Body
+        identisch zum letzten erfolgreichen Abruf, wird das bisherige
+        EmlogData-Objekt zurückgegeben (siehe async_handle_host_update).
+        """
+        if self.trace_recorder is not None:
+            self.trace_recorder.async_record(payload, error)
+        self.metrics.record_poll(time.monotonic())
+        reading: EmlogReading | None = None
+        if not error:
+            self.metrics.record_payload(len(payload))
+            fingerprint = hash(payload)
+            if (
+                fingerprint == self._payload_fingerprint
+                and self.data is not None
+                and self.data.api_status == "connected"
+            ):
+                self.metrics.record_success()
+                return self._async_process_unchanged()
+            started = time.perf_counter()
+            try:
+                meter_data = json_loads(payload)
+                if not isinstance(meter_data, dict):
+                    raise ValueError("JSON ist kein Dictionary")
+                reading = EmlogReading.from_export(meter_data)
+                self._payload_fingerprint = fingerprint
+            except (ValueError, TypeError, AttributeError) as err:
+                error = f"Ungültige JSON-Antwort von {self.host} (Index {self.meter_index}): {err}"
+                _LOGGER.warning(error)
+                self.metrics.record_failure(ERROR_CLASS_INVALID_JSON)
+            else:
+                self.metrics.record_parse(time.perf_counter() - started)
 
         if error:
             # Fehler beim Abrufen der Daten
@@ -112,7 +571,7 @@ class EmlogCoordinator(DataUpdateCoordinator[EmlogData]):
                     f"(failed updates: {self._failed_updates})"
                 )
                 return EmlogData(
-                    meter_data=self.data.meter_data,
+                    reading=self.data.reading,
                     api_status="failed",
                     last_error=last_error,
                     last_successful_update=self.data.last_successful_update,
@@ -122,7 +581,7 @@ class EmlogCoordinator(DataUpdateCoordinator[EmlogData]):
             # Beim allerersten Fehler: Gib fehlerhafte Daten zurück
             _LOGGER.debug("No previous data available, returning empty data with failed status")
             return EmlogData(
-                meter_data={},
+                reading=None,
                 api_status="failed",
                 last_error=last_error,
                 last_successful_update=None,
@@ -134,30 +593,289 @@ class EmlogCoordinator(DataUpdateCoordinator[EmlogData]):
             _LOGGER.info(f"Connection to Emlog API restored after {self._failed_updates} failed attempts")
         self._failed_updates = 0
         self._last_error = None
+        self.metrics.record_success()
 
-        # Nutze HA Timezone falls verfügbar, sonst UTC
-        if hasattr(self.hass, "config") and self.hass.config.time_zone:
-            from homeassistant.util import dt as dt_util
-
-            tz = dt_util.get_time_zone(self.hass.config.time_zone)
-            now = datetime.now(tz) if tz else datetime.now(timezone.utc)
-        else:
-            now = datetime.now(timezone.utc)
-
-        # Extrahiere Währung aus API-Response
-        currency = "EUR"  # Default
-        if meter_data:
-            # Versuche Währung aus verschiedenen Positionen zu extrahieren
-            currency = (
-                meter_data.get("Betrag_Bezug", {}).get("Waehrung")
-                or meter_data.get("Betrag_Lieferung", {}).get("Waehrung")
-                or "EUR"
-            )
+        if self.adaptive_polling:
+            self._async_adapt_interval(reading)
+        self._record_sample(reading)
+        self._async_schedule_snapshot_save()
 
         return EmlogData(
-            meter_data=meter_data or {},
+            reading=reading,
             api_status="connected",
             last_error=None,
-            last_successful_update=now,
-            currency=currency,
+            last_successful_update=self._now(),
+            currency=reading.currency,
         )
+
+    @callback
+    def _async_process_unchanged(self) -> EmlogData:
+        """Gleiche Payload wie beim letzten Poll - bisherige Daten weiterverwenden."""
+        if self.data.reading is not None:
+            if self.adaptive_polling:
+                self._async_adapt_interval(self.data.reading)
+            self._record_sample(self.data.reading)
+            self._async_schedule_snapshot_save()
+
+        last_update = self.data.last_successful_update
+        if self.heartbeat_interval and last_update is not None:
+            now = self._now()
+            if now - last_update >= timedelta(seconds=self.heartbeat_interval):
+                # Heartbeat: nur der Zeitstempel ändert sich
+                return replace(self.data, last_successful_update=now)
+        return self.data
+
+    def _record_sample(self, reading: EmlogReading) -> None:
+        """Übernimm die Werte eines erfolgreichen Polls in Ringpuffer und Zeitreihe."""
+        values = (time.time(), reading.stand180, reading.leistung170, reading.stand280, reading.leistung270)
+        self.samples.append(*values)
+        if self.timeseries is not None:
+            self.timeseries.async_append(*values)
+
+    async def async_restore_snapshot(self) -> bool:
+        """Setze die Daten aus dem gespeicherten Snapshot, solange noch keine Live-Daten vorliegen.
+
+        Returns:
+            True, wenn ein Snapshot übernommen wurde
+        """
+        if self.data is not None:
+            return False
+        try:
+            snapshot = await self._snapshot_store.async_load()
+            data = EmlogData.from_snapshot(snapshot) if isinstance(snapshot, dict) else None
+        except (TypeError, ValueError) as err:
+            _LOGGER.warning(f"Snapshot für {self.host} (Index {self.meter_index}) ist ungültig: {err}")
+            return False
+
+        if data is None or self.data is not None:
+            return False
+        self.data = data
+        _LOGGER.debug(f"Letzte Messwerte für {self.host} (Index {self.meter_index}) aus Snapshot übernommen")
+        return True
+
+    @callback
+    def _async_schedule_snapshot_save(self) -> None:
+        """Snapshot verzögert sichern.
+
+        Store.async_delay_save startet den Timer bei jedem Aufruf neu - bei
+        Polls unterhalb der Verzögerung würde nie geschrieben. Deshalb wird
+        erst wieder geplant, wenn der letzte Schreibvorgang gelaufen ist; die
+        Daten werden erst beim Schreiben gelesen und sind damit aktuell.
+        """
+        if not self._snapshot_save_pending:
+            self._snapshot_save_pending = True
+            self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    async def async_flush_snapshot(self) -> None:
+        """Ausstehenden Snapshot sofort schreiben (beim Entladen, bevor der Entry neu geladen oder gelöscht wird)."""
+        if self._snapshot_save_pending:
+            await self._snapshot_store.async_save(self._snapshot_data())
+
+    def _snapshot_data(self) -> dict[str, Any]:
+        self._snapshot_save_pending = False
+        return self.data.as_snapshot() if self.data is not None else {}
+
+    def _now(self) -> datetime:
+        """Aktuelle Zeit in der HA-Zeitzone, sonst UTC."""
+        if hasattr(self.hass, "config") and self.hass.config.time_zone:
+            tz = dt_util.get_time_zone(self.hass.config.time_zone)
+            return dt_util.now(tz) if tz else dt_util.utcnow()
+        return dt_util.utcnow()
+
+
+class EmlogHostCoordinator(DataUpdateCoordinator[dict[int, EmlogData]]):
+    """Gemeinsamer Coordinator für alle Zähler eines Emlog-Geräts.
+
+    Ein Timer pro Host statt einer pro Config Entry: jeder Zyklus fragt alle
+    registrierten Meter-Indizes ab und verteilt die Ergebnisse an die
+    EmlogCoordinator-Sichten der einzelnen Zähler.
+    """
+
+    def __init__(self, hass: HomeAssistant, host: str):
+        self.host = host
+        self._meters: dict[int, EmlogCoordinator] = {}
+        # Begrenzt parallele Requests an das (kleine, eingebettete) Emlog-Webinterface
+        self._request_semaphore = asyncio.Semaphore(MAX_PARALLEL_REQUESTS_PER_HOST)
+        self.client = EmlogApiClient(hass, host)
+        self.circuit_breaker = EmlogCircuitBreaker()
+        self._unsub_close = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_handle_hass_close)
+
+        super().__init__(
+            hass,
+            logger=_LOGGER,
+            name=f"{DOMAIN}_{host}",
+            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+        )
+
+    @property
+    def meter_indices(self) -> list[int]:
+        """Alle aktuell registrierten Meter-Indizes dieses Hosts."""
+        return sorted(self._meters)
+
+    def get_meter(self, meter_index: int) -> EmlogCoordinator | None:
+        """Registrierter Zähler-Coordinator für einen Meter-Index."""
+        return self._meters.get(meter_index)
+
+    @callback
+    def async_register_meter(self, meter: EmlogCoordinator) -> CALLBACK_TYPE:
+        """Registriere einen Zähler für den gemeinsamen Poll-Zyklus."""
+        self._meters[meter.meter_index] = meter
+        self._async_update_settings()
+        remove_listener = self.async_add_listener(meter.async_handle_host_update)
+
+        @callback
+        def _async_unregister() -> None:
+            remove_listener()
+            if self._meters.get(meter.meter_index) is meter:
+                del self._meters[meter.meter_index]
+            if not self._meters:
+                # Letzter Zähler entfernt - Host aus der Registry nehmen und Verbindungen schließen
+                self.hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {}).pop(self.host, None)
+                self._unsub_close()
+                self.hass.async_create_task(self.client.async_close())
+                return
+            self._async_update_settings()
+
+        return _async_unregister
+
+    @callback
+    def _async_update_settings(self) -> None:
+        """Intervall, Timeouts und Keep-Alive aus den Einstellungen aller Zähler dieses Hosts ableiten.
+
+        Kürzestes (ggf. adaptives) Poll-Intervall gewinnt, bei den Timeouts der
+        großzügigste Wert. Der Keep-Alive deckt das längste Intervall ab, das
+        ein Zähler erreichen kann (bei adaptivem Polling das Maximum) - bei
+        offenem Breaker ist das Gerät ohnehin nicht erreichbar.
+        """
+        if not self._meters:
+            return
+        meters = self._meters.values()
+        if self.circuit_breaker.state == BREAKER_OPEN:
+            # Breaker offen: nächster Zyklus erst nach Ablauf des Backoffs (Probe-Request)
+            self.update_interval = timedelta(seconds=max(1.0, self.circuit_breaker.retry_delay))
+        else:
+            self.update_interval = timedelta(seconds=min(meter.poll_interval for meter in meters))
+        self.client.set_timeouts(
+            connect_timeout=max(meter.connect_timeout for meter in meters),
+            read_timeout=max(meter.read_timeout for meter in meters),
+        )
+        longest_interval = max(
+            meter.max_scan_interval if meter.adaptive_polling else meter.scan_interval for meter in meters
+        )
+        self.client.set_keepalive_timeout(max(HTTP_KEEPALIVE_TIMEOUT, longest_interval + HTTP_KEEPALIVE_MARGIN))
+
+    async def _async_handle_hass_close(self, _event: Event) -> None:
+        """Schließe die Verbindungen beim Beenden von Home Assistant."""
+        await self.client.async_close()
+
+    async def async_fetch_export(self, meter_index: int) -> tuple[bytes | None, str | None]:
+        """Fetch export data for one meter index from Emlog.
+
+        Returns:
+            Tuple of (payload, error_message)
+            - (bytes, None): Erfolgreich, unverarbeiteter Body
+            - (None, str): Fehler
+        """
+        if self.circuit_breaker.is_blocking:
+            # Gerät gilt als nicht erreichbar - keine hängenden Requests bis zum nächsten Probe
+            error_msg = (
+                f"Circuit Breaker offen für {self.host} (Index {meter_index}), "
+                f"nächster Versuch in {self.circuit_breaker.retry_in:.0f}s"
+            )
+            _LOGGER.debug(error_msg)
+            if meter := self._meters.get(meter_index):
+                meter.metrics.record_failure(ERROR_CLASS_CIRCUIT_OPEN)
+            return None, error_msg
+
+        started: float | None = None
+        try:
+            async with self._request_semaphore:
+                # Latenz ab Request-Start, ohne Wartezeit auf den Semaphore
+                started = time.perf_counter()
+                payload = await self.client.async_get_export_raw(meter_index)
+        except EmlogHttpError as err:
+            error_class = ERROR_CLASS_HTTP
+            error_msg = f"HTTP {err.status} von {self.host} (Index {meter_index})"
+        except asyncio.TimeoutError:
+            error_class = ERROR_CLASS_TIMEOUT
+            error_msg = f"Timeout beim Verbindungsaufbau zu {self.host} (Index {meter_index})"
+        except Exception as err:
+            error_class = type(err).__name__
+            error_msg = f"Fehler bei {self.host} (Index {meter_index}): {type(err).__name__} - {err}"
+        else:
+            self._async_record_request(meter_index, started, None)
+            return payload, None
+
+        _LOGGER.warning(error_msg)
+        self._async_record_request(meter_index, started, error_class)
+        return None, error_msg
+
+    @callback
+    def _async_record_request(self, meter_index: int, started: float | None, error_class: str | None) -> None:
+        """Latenz und ggf. Fehlerklasse eines Requests in den Metriken des Zählers ablegen."""
+        if (meter := self._meters.get(meter_index)) is None:
+            return
+        if started is not None:
+            meter.metrics.record_request(time.perf_counter() - started)
+        if error_class is not None:
+            meter.metrics.record_failure(error_class)
+
+    async def async_fetch_exports(self, meter_indices: list[int]) -> dict[int, tuple[bytes | None, str | None]]:
+        """Fetch all given meter indices concurrently (begrenzt durch den Host-Semaphore)."""
+        results = await asyncio.gather(*(self.async_fetch_export(meter_index) for meter_index in meter_indices))
+        return dict(zip(meter_indices, results))
+
+    async def _async_update_data(self) -> dict[int, EmlogData]:
+        """Frage alle registrierten Zähler in einem Zyklus ab und liefere einen gemeinsamen Snapshot."""
+        meters = list(self._meters.values())
+        meter_indices = [meter.meter_index for meter in meters]
+
+        if self.circuit_breaker.start_cycle() and meter_indices:
+            # Half-open: erst ein einzelner Probe-Request, der Rest nur wenn das Gerät antwortet
+            probe_index = meter_indices[0]
+            exports = {probe_index: await self.async_fetch_export(probe_index)}
+            probe_error = exports[probe_index][1]
+            if probe_error is None:
+                exports.update(await self.async_fetch_exports(meter_indices[1:]))
+            else:
+                exports.update(
+                    {
+                        meter_index: (
+                            None,
+                            f"{self.host} nicht erreichbar (Probe über Index {probe_index} fehlgeschlagen), "
+                            f"Index {meter_index} übersprungen",
+                        )
+                        for meter_index in meter_indices[1:]
+                    }
+                )
+        else:
+            exports = await self.async_fetch_exports(meter_indices)
+
+        if any(error is None for _, error in exports.values()):
+            self.circuit_breaker.record_success()
+        elif exports:
+            self.circuit_breaker.record_failure()
+
+        results = {meter.meter_index: meter.async_process_export(*exports[meter.meter_index]) for meter in meters}
+
+        # Adaptive Intervalle bzw. Breaker-Backoff für den nächsten Zyklus übernehmen
+        self._async_update_settings()
+        return results
+
+
+@callback
+def async_get_host_coordinator(hass: HomeAssistant, host: str) -> EmlogHostCoordinator:
+    """Liefere den Host-Coordinator aus hass.data[DOMAIN] oder lege ihn an."""
+    coordinators: dict[str, EmlogHostCoordinator] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_COORDINATORS, {})
+
+    if (coordinator := coordinators.get(host)) is None:
+        # Der Host-Coordinator gehört keinem einzelnen Config Entry - sonst würde
+        # das Entladen des ersten Entries den Poll-Zyklus aller Zähler beenden.
+        token = config_entries.current_entry.set(None)
+        try:
+            coordinator = EmlogHostCoordinator(hass, host)
+        finally:
+            config_entries.current_entry.reset(token)
+        coordinators[host] = coordinator
+
+    return coordinator
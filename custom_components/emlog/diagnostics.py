@@ -0,0 +1,68 @@
+"""Diagnose-Download eines Emlog Config Entries (Geräte & Dienste -> Diagnose herunterladen)."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_HOST, CONF_METER_INDEX, DATA_COORDINATORS, DOMAIN
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Einstellungen, Zustand und Laufzeit-Metriken des Zählers.
+
+    Die Metriken stammen aus dem EmlogCoordinator (siehe metrics.py), Circuit
+    Breaker und Verbindungsstatistik aus dem gemeinsamen Host-Coordinator.
+    """
+    host = entry.data[CONF_HOST]
+    meter_index = int(entry.data[CONF_METER_INDEX])
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+    }
+
+    host_coordinator = hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {}).get(host)
+    meter = host_coordinator.get_meter(meter_index) if host_coordinator is not None else None
+    if meter is None:
+        # Entry nicht geladen (z. B. deaktiviert oder Setup fehlgeschlagen)
+        diagnostics["coordinator"] = None
+        return diagnostics
+
+    data = meter.data
+    last_error = data.last_error if data is not None else None
+    breaker = host_coordinator.circuit_breaker
+    stats = host_coordinator.client.stats
+    update_interval = host_coordinator.update_interval
+
+    diagnostics["coordinator"] = {
+        "meter_type": meter.meter_type,
+        "api_status": data.api_status if data is not None else None,
+        # Fehlermeldungen enthalten den Host
+        "last_error": last_error.replace(host, REDACTED) if last_error else None,
+        "last_successful_update": (
+            data.last_successful_update.isoformat()
+            if data is not None and data.last_successful_update is not None
+            else None
+        ),
+        "poll_interval_s": meter.poll_interval,
+        "adaptive_polling": meter.adaptive_polling,
+        "host_update_interval_s": update_interval.total_seconds() if update_interval is not None else None,
+        "meters_on_host": host_coordinator.meter_indices,
+        "samples_buffered": len(meter.samples),
+    }
+    diagnostics["circuit_breaker"] = {
+        "state": breaker.state,
+        "failed_cycles": breaker.failed_cycles,
+        "retry_delay_s": round(breaker.retry_delay, 1),
+    }
+    diagnostics["client"] = {**asdict(stats), "reuse_ratio": round(stats.reuse_ratio, 3)}
+    diagnostics["metrics"] = meter.metrics.as_dict(meter.poll_interval)
+    return diagnostics
@@ -0,0 +1,467 @@
+"""Dynamische Preise: Kosten aus Zählerstands-Deltas × Preis-Zeitreihe."""
+
+from __future__ import annotations
+
+import logging
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event, async_track_time_change
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_DYNAMIC_PRICE_ATTRIBUTE,
+    CONF_DYNAMIC_PRICE_CSV,
+    CONF_DYNAMIC_PRICE_ENTITY,
+    CONF_DYNAMIC_PRICE_SOURCE,
+    DEFAULT_DYNAMIC_PRICE_ATTRIBUTE,
+    DYNAMIC_PRICE_SOURCE_CSV,
+    DYNAMIC_PRICE_SOURCE_FORECAST,
+    DYNAMIC_PRICE_SOURCE_HELPER,
+    DYNAMIC_PRICE_SOURCE_NONE,
+)
+from .settings import EmlogEntrySettings
+
+_LOGGER = logging.getLogger(__name__)
+
+# Schlüssel, unter denen gängige Preis-Integrationen (Tibber, Nordpool, EPEX, ...) Start und Preis ablegen
+FORECAST_START_KEYS = ("start", "starts_at", "startsAt", "start_time", "from")
+FORECAST_PRICE_KEYS = ("value", "price", "total", "price_per_kwh")
+
+# Kosten-Zeiträume der dynamischen Kosten (wie in template.COST_PERIODS)
+DYNAMIC_COST_PERIODS = ("tag", "monat", "jahr")
+
+
+class PriceSeries:
+    """Stufenfunktion: prices[i] gilt ab starts[i] bis starts[i + 1] (UTC-Timestamps).
+
+    Vor dem ersten Punkt gilt der erste bekannte Preis, nach dem letzten der letzte.
+    """
+
+    def __init__(self, points: Iterable[tuple[float, float]] = ()):
+        self.starts = array("d")
+        self.prices = array("d")
+        self.set_points(points)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def set_points(self, points: Iterable[tuple[float, float]]) -> None:
+        """Ersetze die Zeitreihe (Punkte werden sortiert, spätere Duplikate gewinnen)."""
+        merged = dict(sorted(points))
+        self.starts = array("d", merged.keys())
+        self.prices = array("d", merged.values())
+
+    def merge(self, points: Iterable[tuple[float, float]]) -> None:
+        """Ersetze alle Punkte ab dem ersten neuen Punkt (z.B. aktualisierte Prognose)."""
+        points = sorted(points)
+        if not points:
+            return
+        cut = bisect_left(self.starts, points[0][0])
+        del self.starts[cut:]
+        del self.prices[cut:]
+        for start, price in points:
+            self.add_point(start, price)
+
+    def add_point(self, start: float, price: float) -> None:
+        """Füge einen Preis ab start hinzu (O(1) wenn chronologisch)."""
+        if not self.starts or start > self.starts[-1]:
+            self.starts.append(start)
+            self.prices.append(price)
+            return
+        index = bisect_left(self.starts, start)
+        if index < len(self.starts) and self.starts[index] == start:
+            self.prices[index] = price
+        else:
+            self.starts.insert(index, start)
+            self.prices.insert(index, price)
+
+    def prune_before(self, timestamp: float) -> None:
+        """Entferne Punkte vor timestamp, behalte aber den dort gültigen Preis."""
+        index = bisect_right(self.starts, timestamp) - 1
+        if index > 0:
+            del self.starts[:index]
+            del self.prices[:index]
+
+    def price_at(self, timestamp: float) -> float | None:
+        """Preis zum Zeitpunkt timestamp, None wenn keine Preise bekannt sind."""
+        if not self.starts:
+            return None
+        index = max(bisect_right(self.starts, timestamp) - 1, 0)
+        return self.prices[index]
+
+    def _integrate_from(self, index: int, t0: float, t1: float, energy: float) -> float:
+        """Kosten über [t0, t1] ab der Preisstufe index (die bei t0 gültige)."""
+        starts, prices = self.starts, self.prices
+        if t1 <= t0:
+            return energy * prices[index]
+
+        last = len(starts) - 1
+        rate = energy / (t1 - t0)
+        cost = 0.0
+        segment_start = t0
+        while segment_start < t1:
+            segment_end = min(starts[index + 1], t1) if index < last else t1
+            cost += rate * (segment_end - segment_start) * prices[index]
+            segment_start = segment_end
+            if index < last:
+                index += 1
+        return cost
+
+    def integrate(self, t0: float, t1: float, energy: float) -> float | None:
+        """Kosten von energy, gleichmäßig über [t0, t1] verteilt, gegen die Preisstufen."""
+        if not self.starts:
+            return None
+        return self._integrate_from(max(bisect_right(self.starts, t0) - 1, 0), t0, t1, energy)
+
+    def integrate_since(self, t0: float, t1: float, energy: float, since: float) -> float | None:
+        """Anteil von integrate(t0, t1, energy), der ab since anfällt (z.B. ab Tagesbeginn)."""
+        if since <= t0:
+            return self.integrate(t0, t1, energy)
+        if not self.starts:
+            return None
+        if since >= t1:
+            return 0.0
+        return self._integrate_from(
+            max(bisect_right(self.starts, since) - 1, 0), since, t1, energy * (t1 - since) / (t1 - t0)
+        )
+
+    def integrate_batch(self, timestamps: Sequence[float], energies: Sequence[float]) -> list[float]:
+        """Kosten je Intervall (timestamps[i-1], timestamps[i]] mit Energie energies[i].
+
+        Ein gemeinsamer Durchlauf über Samples und Preisstufen (Merge zweier
+        sortierter Folgen, O(n + m)) statt einer Bisektion pro Intervall.
+        """
+        costs = [0.0] * len(timestamps)
+        if not self.starts or len(timestamps) < 2:
+            return costs
+
+        starts = self.starts
+        last = len(starts) - 1
+        index = 0
+        for i in range(1, len(timestamps)):
+            t0 = timestamps[i - 1]
+            while index < last and starts[index + 1] <= t0:
+                index += 1
+            if energies[i]:
+                costs[i] = self._integrate_from(index, t0, timestamps[i], energies[i])
+
+        return costs
+
+
+def _parse_timestamp(value: Any) -> float | None:
+    """ISO-String, datetime oder Unix-Timestamp nach UTC-Timestamp."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str):
+        parsed = dt_util.parse_datetime(value.strip())
+    else:
+        return None
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return parsed.timestamp()
+
+
+def parse_price_csv(text: str) -> list[tuple[float, float]]:
+    """Parse eine CSV mit Zeilen "Zeitpunkt;Preis" (auch "," als Trenner).
+
+    Kopfzeilen und ungültige Zeilen werden übersprungen.
+    """
+    points: list[tuple[float, float]] = []
+    for line in text.splitlines():
+        if not (line := line.strip()) or line.startswith("#"):
+            continue
+        separator = ";" if ";" in line else ","
+        parts = [part.strip() for part in line.split(separator)]
+        if len(parts) < 2:
+            continue
+        try:
+            timestamp = _parse_timestamp(parts[0])
+            price = float(parts[1].replace(",", "."))
+        except ValueError:
+            continue
+        if timestamp is not None:
+            points.append((timestamp, price))
+    return points
+
+
+def parse_forecast_attribute(items: Any) -> list[tuple[float, float]]:
+    """Parse ein Prognose-Array ([{start, value}, ...]) aus einem Entity-Attribut."""
+    points: list[tuple[float, float]] = []
+    if not isinstance(items, (list, tuple)):
+        return points
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        start = next((item[key] for key in FORECAST_START_KEYS if key in item), None)
+        price = next((item[key] for key in FORECAST_PRICE_KEYS if key in item), None)
+        try:
+            timestamp = _parse_timestamp(start)
+            price = float(price)
+        except (TypeError, ValueError):
+            continue
+        if timestamp is not None:
+            points.append((timestamp, price))
+    return points
+
+
+def _state_to_float(state: State | None) -> float | None:
+    """Numerischer State oder None."""
+    if state is None or state.state in ("unknown", "unavailable"):
+        return None
+    try:
+        return float(state.state)
+    except (ValueError, TypeError):
+        return None
+
+
+class EmlogDynamicCostEngine:
+    """Integriert Zählerstands-Deltas gegen eine Preis-Zeitreihe (Tag/Monat/Jahr).
+
+    Pro neuem Zählerstand wird nur das Delta seit dem letzten Stand bewertet
+    (inkrementell). Nach einem Neustart werden die laufenden Zeiträume einmalig
+    aus der Recorder-Historie in einem Batch-Durchlauf nachgerechnet.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        meter_type: str,
+        meter_index: int,
+        settings: EmlogEntrySettings,
+    ):
+        self.hass = hass
+        self._settings = settings
+        self.source = settings.option(CONF_DYNAMIC_PRICE_SOURCE, DYNAMIC_PRICE_SOURCE_NONE)
+        self._stand_entity_id = f"sensor.emlog_{meter_type}_{meter_index}_zaehlerstand_kwh"
+        self.series = PriceSeries()
+        self.values: dict[str, float | None] = {period: None for period in DYNAMIC_COST_PERIODS}
+        self._totals = {period: 0.0 for period in DYNAMIC_COST_PERIODS}
+        self._listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._last_ts: float | None = None
+        self._last_stand: float | None = None
+        self._period_starts: dict[str, float] = {}
+        self._next_day_ts = 0.0
+
+    @property
+    def current_price(self) -> float | None:
+        """Aktuell gültiger Preis der Zeitreihe."""
+        return self.series.price_at(dt_util.utcnow().timestamp())
+
+    @callback
+    def async_add_listener(self, key: str, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Registriere einen Callback für Änderungen eines Ergebniswerts."""
+        listeners = self._listeners.setdefault(key, [])
+        listeners.append(update_callback)
+
+        @callback
+        def _async_remove_listener() -> None:
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+
+        return _async_remove_listener
+
+    async def async_start(self) -> None:
+        """Lade die Preisquelle, rechne die laufenden Zeiträume nach und abonniere die Eingänge."""
+        self._roll_periods(dt_util.utcnow().timestamp())
+        await self._async_load_series()
+        await self._async_recompute_from_history()
+
+        self._unsubs.append(
+            async_track_state_change_event(self.hass, [self._stand_entity_id], self._async_handle_stand_change)
+        )
+        price_entity = self._settings.option(CONF_DYNAMIC_PRICE_ENTITY, "")
+        if price_entity and self.source in (DYNAMIC_PRICE_SOURCE_HELPER, DYNAMIC_PRICE_SOURCE_FORECAST):
+            self._unsubs.append(
+                async_track_state_change_event(self.hass, [price_entity], self._async_handle_price_change)
+            )
+        # Tageswechsel auch ohne neuen Zählerstand sichtbar machen
+        self._unsubs.append(
+            async_track_time_change(self.hass, self._async_handle_midnight, hour=0, minute=0, second=0)
+        )
+        self._async_publish()
+
+    @callback
+    def async_stop(self) -> None:
+        """Beende alle Abonnements."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+
+    async def _async_load_series(self) -> None:
+        """Initiale Preis-Zeitreihe aus der konfigurierten Quelle laden."""
+        price_entity = self._settings.option(CONF_DYNAMIC_PRICE_ENTITY, "")
+
+        if self.source == DYNAMIC_PRICE_SOURCE_CSV:
+            path = self.hass.config.path(self._settings.option(CONF_DYNAMIC_PRICE_CSV, ""))
+            try:
+                text = await self.hass.async_add_executor_job(_read_text, path)
+            except OSError as err:
+                _LOGGER.warning(f"Preis-CSV {path} konnte nicht gelesen werden: {err}")
+                return
+            self.series.set_points(parse_price_csv(text))
+
+        elif self.source == DYNAMIC_PRICE_SOURCE_FORECAST and price_entity:
+            self._load_forecast(self.hass.states.get(price_entity))
+
+        elif self.source == DYNAMIC_PRICE_SOURCE_HELPER and price_entity:
+            # Preisverlauf des Helpers seit Jahresbeginn, sonst nur der aktuelle Wert
+            states = await self._async_get_history(price_entity, self._period_starts["jahr"])
+            if not states and (state := self.hass.states.get(price_entity)) is not None:
+                states = [state]
+            self.series.set_points(
+                (state.last_changed.timestamp(), price)
+                for state in states
+                if (price := _state_to_float(state)) is not None
+            )
+
+    @callback
+    def _load_forecast(self, state: State | None) -> None:
+        """Prognose-Array aus dem konfigurierten Attribut übernehmen."""
+        if state is None:
+            return
+        attribute = self._settings.option(CONF_DYNAMIC_PRICE_ATTRIBUTE, DEFAULT_DYNAMIC_PRICE_ATTRIBUTE)
+        self.series.merge(parse_forecast_attribute(state.attributes.get(attribute)))
+
+    async def _async_get_history(self, entity_id: str, start_ts: float) -> list[State]:
+        """States einer Entity seit start_ts aus dem Recorder (leer ohne Recorder)."""
+        if "recorder" not in self.hass.config.components:
+            return []
+
+        from homeassistant.components.recorder import get_instance, history
+
+        start_time = dt_util.utc_from_timestamp(start_ts)
+        try:
+            result = await get_instance(self.hass).async_add_executor_job(
+                history.state_changes_during_period, self.hass, start_time, None, entity_id, True
+            )
+        except Exception as err:
+            _LOGGER.debug(f"Historie von {entity_id} nicht verfügbar: {err}")
+            return []
+        return list(result.get(entity_id, []))
+
+    async def _async_recompute_from_history(self) -> None:
+        """Laufende Zeiträume aus dem Zählerstand-Verlauf nachrechnen (Batch)."""
+        states = await self._async_get_history(self._stand_entity_id, self._period_starts["jahr"])
+
+        timestamps: list[float] = []
+        stands: list[float] = []
+        for state in states:
+            if (stand := _state_to_float(state)) is not None:
+                timestamps.append(state.last_changed.timestamp())
+                stands.append(stand)
+
+        if not timestamps:
+            return
+
+        # Energie je Intervall; Zählertausch/Rücksprung (negatives Delta) zählt nicht
+        energies = [0.0] + [max(stands[i] - stands[i - 1], 0.0) for i in range(1, len(stands))]
+        costs = self.series.integrate_batch(timestamps, energies)
+        cumulative = list(accumulate(costs))
+
+        for period in DYNAMIC_COST_PERIODS:
+            # Intervalle, die nach Beginn des Zeitraums enden
+            start = self._period_starts[period]
+            first = bisect_right(timestamps, start)
+            if first >= len(cumulative):
+                continue
+            total = cumulative[-1] - cumulative[first]
+            if first > 0:
+                # Das Intervall über den Beginn des Zeitraums zählt nur mit dem Anteil danach
+                total += (
+                    self.series.integrate_since(timestamps[first - 1], timestamps[first], energies[first], start)
+                    or 0.0
+                )
+            else:
+                total += costs[first]
+            self._totals[period] = total
+
+        self._last_ts = timestamps[-1]
+        self._last_stand = stands[-1]
+
+    def _roll_periods(self, timestamp: float) -> None:
+        """Setze abgelaufene Zeiträume zurück (nur beim Tageswechsel nötig)."""
+        if timestamp < self._next_day_ts:
+            return
+
+        local = dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+        day_start = dt_util.start_of_local_day(local)
+        starts = {
+            "tag": day_start.timestamp(),
+            "monat": day_start.replace(day=1).timestamp(),
+            "jahr": day_start.replace(month=1, day=1).timestamp(),
+        }
+        for period, start in starts.items():
+            if self._period_starts.get(period) != start:
+                self._totals[period] = 0.0
+        self._period_starts = starts
+        self._next_day_ts = dt_util.start_of_local_day(local.date() + timedelta(days=1)).timestamp()
+        self.series.prune_before(starts["jahr"])
+
+    @callback
+    def _async_handle_stand_change(self, event: Event) -> None:
+        """Neuer Zählerstand: Delta seit dem letzten Stand bewerten (O(1))."""
+        new_state: State | None = event.data.get("new_state")
+        if (stand := _state_to_float(new_state)) is None:
+            return
+
+        timestamp = new_state.last_changed.timestamp()
+        self._roll_periods(timestamp)
+
+        if self._last_stand is not None and self._last_ts is not None and stand > self._last_stand:
+            last_ts, energy = self._last_ts, stand - self._last_stand
+            cost = self.series.integrate(last_ts, timestamp, energy)
+            if cost is not None:
+                for period in DYNAMIC_COST_PERIODS:
+                    start = self._period_starts[period]
+                    # Intervall über Mitternacht bzw. Monats-/Jahresbeginn: nur der Anteil danach zählt
+                    self._totals[period] += (
+                        cost if last_ts >= start else self.series.integrate_since(last_ts, timestamp, energy, start)
+                    )
+
+        self._last_ts = timestamp
+        self._last_stand = stand
+        self._async_publish()
+
+    @callback
+    def _async_handle_midnight(self, now: datetime) -> None:
+        """Neuer Tag (ggf. Monat/Jahr): Zeiträume zurücksetzen."""
+        self._roll_periods(now.timestamp())
+        self._async_publish()
+
+    @callback
+    def _async_handle_price_change(self, event: Event) -> None:
+        """Neuer Helper-Preis bzw. aktualisierte Prognose übernehmen."""
+        new_state: State | None = event.data.get("new_state")
+        if self.source == DYNAMIC_PRICE_SOURCE_FORECAST:
+            self._load_forecast(new_state)
+        elif (price := _state_to_float(new_state)) is not None:
+            self.series.add_point(new_state.last_changed.timestamp(), price)
+
+    @callback
+    def _async_publish(self) -> None:
+        """Gerundete Werte übernehmen und nur geänderte Entities benachrichtigen."""
+        has_prices = len(self.series) > 0
+        for period in DYNAMIC_COST_PERIODS:
+            value = round(self._totals[period], 2) if has_prices else None
+            if self.values.get(period) == value:
+                continue
+            self.values[period] = value
+            for update_callback in list(self._listeners.get(period, ())):
+                update_callback()
+
+
+def _read_text(path: str) -> str:
+    """Datei lesen (läuft im Executor)."""
+    with open(path, encoding="utf-8") as file:
+        return file.read()
@@ -0,0 +1,119 @@
+"""Laufzeit-Metriken eines Zählers: Latenz, Payload, Parse-/Fan-out-Zeit, Fehlerklassen, Poll-Abstand."""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections import Counter, deque
+from typing import Any
+
+from .const import METRICS_LATENCY_BUCKETS_MS, METRICS_WINDOW
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """q-Perzentil (Nearest Rank) einer sortierten Liste, None wenn leer."""
+    if not values:
+        return None
+    return values[max(math.ceil(q / 100 * len(values)) - 1, 0)]
+
+
+def window_percentile(window: deque[float], q: float, digits: int = 3) -> float | None:
+    """q-Perzentil eines (unsortierten) Fensters, gerundet."""
+    return _round(percentile(sorted(window), q), digits)
+
+
+def summarize(window: deque[float], digits: int = 3) -> dict[str, Any]:
+    """p50/p95/p99, Maximum und Anzahl der Messungen im Fenster."""
+    values = sorted(window)
+    summary: dict[str, Any] = {f"p{q}": _round(percentile(values, q), digits) for q in PERCENTILES}
+    summary["max"] = _round(values[-1] if values else None, digits)
+    summary["samples"] = len(values)
+    return summary
+
+
+def mean(window: deque[float], digits: int = 3) -> float | None:
+    """Mittelwert eines Fensters, None wenn noch keine Messung vorliegt."""
+    return round(sum(window) / len(window), digits) if window else None
+
+
+def _round(value: float | None, digits: int) -> float | None:
+    return round(value, digits) if value is not None else None
+
+
+class EmlogCoordinatorMetrics:
+    """Sammelt Kennzahlen eines EmlogCoordinator.
+
+    Perzentile beziehen sich auf die letzten window Messungen (deque mit
+    fester Länge), Histogramm und Zähler laufen seit dem Setup. Alle
+    Zeiten werden vom Aufrufer gemessen und in Sekunden übergeben - das
+    Modul liest selbst keine Uhr.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.request_latency_ms: deque[float] = deque(maxlen=window)
+        self.latency_histogram = [0] * (len(METRICS_LATENCY_BUCKETS_MS) + 1)
+        self.payload_bytes: deque[float] = deque(maxlen=window)
+        self.parse_time_ms: deque[float] = deque(maxlen=window)
+        self.fanout_time_ms: deque[float] = deque(maxlen=window)
+        self.poll_interval_s: deque[float] = deque(maxlen=window)
+        self.successes = 0  # Polls mit gültigen Daten (auch unveränderte Payload)
+        self.failures: Counter[str] = Counter()  # Fehlerklasse -> Anzahl
+        self._last_poll: float | None = None
+
+    def record_request(self, duration_s: float) -> None:
+        """Dauer eines HTTP-Requests an das Gerät (erfolgreich oder nicht)."""
+        latency_ms = duration_s * 1000
+        self.request_latency_ms.append(latency_ms)
+        self.latency_histogram[bisect_left(METRICS_LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def record_failure(self, error_class: str) -> None:
+        self.failures[error_class] += 1
+
+    def record_success(self) -> None:
+        self.successes += 1
+
+    def record_payload(self, size: int) -> None:
+        self.payload_bytes.append(size)
+
+    def record_parse(self, duration_s: float) -> None:
+        """Dauer von json_loads + EmlogReading.from_export."""
+        self.parse_time_ms.append(duration_s * 1000)
+
+    def record_fanout(self, duration_s: float) -> None:
+        """Dauer, bis alle Listener eines Updates gelaufen sind."""
+        self.fanout_time_ms.append(duration_s * 1000)
+
+    def record_poll(self, monotonic_now: float) -> None:
+        """Zeitpunkt eines Polls; der Abstand zum vorherigen ist das erreichte Intervall."""
+        if self._last_poll is not None:
+            self.poll_interval_s.append(monotonic_now - self._last_poll)
+        self._last_poll = monotonic_now
+
+    @property
+    def failures_total(self) -> int:
+        return sum(self.failures.values())
+
+    def as_dict(self, configured_interval_s: float) -> dict[str, Any]:
+        """Alle Kennzahlen als JSON-fähiges Dictionary (Diagnose-Download)."""
+        bounds = [f"<={bound}" for bound in METRICS_LATENCY_BUCKETS_MS] + [f">{METRICS_LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            "request_latency_ms": {
+                **summarize(self.request_latency_ms, 1),
+                "histogram": dict(zip(bounds, self.latency_histogram)),
+            },
+            "payload_bytes": {
+                **summarize(self.payload_bytes, 0),
+                "last": self.payload_bytes[-1] if self.payload_bytes else None,
+            },
+            "parse_time_ms": summarize(self.parse_time_ms),
+            "fanout_time_ms": summarize(self.fanout_time_ms),
+            "poll_interval_s": {
+                "configured": configured_interval_s,
+                "achieved_mean": mean(self.poll_interval_s, 1),
+                **{f"achieved_{key}": value for key, value in summarize(self.poll_interval_s, 1).items()},
+            },
+            "successes": self.successes,
+            "failures": dict(self.failures),
+        }
@@ -0,0 +1,210 @@
+"""Ringpuffer der letzten Messwerte eines Zählers (feste Größe, ohne Recorder)."""
+
+from __future__ import annotations
+
+from array import array
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DATA_SAMPLES, DOMAIN
+
+# Felder eines Samples (entsprechen den Attributen von EmlogReading)
+SAMPLE_FIELDS = ("stand180", "leistung170", "stand280", "leistung270")
+
+SERVICE_READ_SAMPLES = "read_samples"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_FIELD = "field"
+ATTR_MINUTES = "minutes"
+
+
+class EmlogSampleBuffer:
+    """Begrenzter Ringpuffer von (Zeitstempel, Stand180, Leistung170, Stand280, Leistung270).
+
+    Jede Spalte ist ein vorab allokiertes array('d') mit capacity Einträgen -
+    der Speicherbedarf ist fest (5 × 8 Byte × capacity). Zeitstempel sind
+    Unix-Sekunden und müssen monoton steigen; Fensterabfragen suchen den
+    Fensteranfang per Binärsuche und laufen nur über die Samples im Fenster.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(int(capacity), 0)
+        self._timestamps = array("d", bytes(8 * self.capacity))
+        self._columns = {field: array("d", bytes(8 * self.capacity)) for field in SAMPLE_FIELDS}
+        self._start = 0  # Physischer Index des ältesten Samples
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def memory_bytes(self) -> int:
+        """Belegter Speicher der Spalten in Byte (unabhängig vom Füllstand)."""
+        return 8 * self.capacity * (1 + len(SAMPLE_FIELDS))
+
+    def append(
+        self,
+        timestamp: float,
+        stand180: float,
+        leistung170: float,
+        stand280: float,
+        leistung270: float,
+    ) -> None:
+        """Füge ein Sample hinzu, bei vollem Puffer wird das älteste überschrieben."""
+        if not self.capacity:
+            return
+        if self._size and timestamp < self._timestamps[self._physical(self._size - 1)]:
+            # Uhr zurückgestellt: Fensterabfragen setzen monotone Zeitstempel voraus
+            self.clear()
+
+        if self._size < self.capacity:
+            index = self._physical(self._size)
+            self._size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._timestamps[index] = timestamp
+        columns = self._columns
+        columns["stand180"][index] = stand180
+        columns["leistung170"][index] = leistung170
+        columns["stand280"][index] = stand280
+        columns["leistung270"][index] = leistung270
+
+    def clear(self) -> None:
+        """Verwerfe alle Samples (Speicher bleibt allokiert)."""
+        self._start = 0
+        self._size = 0
+
+    def _physical(self, logical: int) -> int:
+        """Logischer Index (0 = ältestes Sample) -> Index in den Arrays."""
+        return (self._start + logical) % self.capacity
+
+    def _window_start(self, since: float) -> int:
+        """Logischer Index des ersten Samples mit Zeitstempel >= since."""
+        low, high = 0, self._size
+        timestamps = self._timestamps
+        while low < high:
+            middle = (low + high) // 2
+            if timestamps[self._physical(middle)] < since:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def window(self, field: str, minutes: float, now: float | None = None) -> list[tuple[float, float]]:
+        """Samples (Zeitstempel, Wert) eines Felds der letzten minutes Minuten.
+
+        now: Bezugszeitpunkt, Default ist der Zeitstempel des neuesten Samples
+        """
+        if not self._size:
+            return []
+        column = self._columns[field]
+        if now is None:
+            now = self._timestamps[self._physical(self._size - 1)]
+        first = self._window_start(now - minutes * 60)
+        return [
+            (self._timestamps[index], column[index])
+            for index in (self._physical(logical) for logical in range(first, self._size))
+        ]
+
+    def _values(self, field: str, minutes: float, now: float | None) -> list[float]:
+        return [value for _, value in self.window(field, minutes, now)]
+
+    def mean(self, field: str, minutes: float, now: float | None = None) -> float | None:
+        """Mittelwert der Samples im Fenster (None ohne Samples)."""
+        values = self._values(field, minutes, now)
+        return sum(values) / len(values) if values else None
+
+    def minimum(self, field: str, minutes: float, now: float | None = None) -> float | None:
+        """Kleinster Wert im Fenster."""
+        values = self._values(field, minutes, now)
+        return min(values) if values else None
+
+    def maximum(self, field: str, minutes: float, now: float | None = None) -> float | None:
+        """Größter Wert im Fenster."""
+        values = self._values(field, minutes, now)
+        return max(values) if values else None
+
+    def delta(self, field: str, minutes: float, now: float | None = None) -> float | None:
+        """Differenz zwischen letztem und erstem Wert im Fenster (z.B. Verbrauch aus Stand180)."""
+        samples = self.window(field, minutes, now)
+        if len(samples) < 2:
+            return None
+        return samples[-1][1] - samples[0][1]
+
+    def rate(self, field: str, minutes: float, now: float | None = None) -> float | None:
+        """Änderung pro Stunde im Fenster (z.B. kWh/h = mittlere Leistung in kW aus Stand180)."""
+        samples = self.window(field, minutes, now)
+        if len(samples) < 2 or samples[-1][0] <= samples[0][0]:
+            return None
+        return (samples[-1][1] - samples[0][1]) * 3600 / (samples[-1][0] - samples[0][0])
+
+
+@callback
+def async_register_sample_buffer(hass: HomeAssistant, entry: ConfigEntry, buffer: EmlogSampleBuffer) -> None:
+    """Registriere den Ringpuffer eines Entries für den Service (bis zum Entladen)."""
+    buffers: dict[str, EmlogSampleBuffer] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SAMPLES, {})
+    buffers[entry.entry_id] = buffer
+    async_setup_services(hass)
+
+    @callback
+    def _async_unregister_buffer() -> None:
+        buffers.pop(entry.entry_id, None)
+        if not buffers:
+            async_unload_services(hass)
+
+    entry.async_on_unload(_async_unregister_buffer)
+
+
+READ_SAMPLES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FIELD, default="leistung170"): vol.In(SAMPLE_FIELDS),
+        vol.Optional(ATTR_MINUTES, default=15): vol.All(vol.Coerce(float), vol.Range(min=0, max=525600)),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Registriere den Service für Fensterabfragen auf dem Ringpuffer (einmalig)."""
+    if hass.services.has_service(DOMAIN, SERVICE_READ_SAMPLES):
+        return
+
+    async def _async_read_samples(call: ServiceCall) -> ServiceResponse:
+        buffers: dict[str, EmlogSampleBuffer] = hass.data.get(DOMAIN, {}).get(DATA_SAMPLES, {})
+        buffer = buffers.get(call.data[ATTR_CONFIG_ENTRY_ID])
+        if buffer is None:
+            raise HomeAssistantError("Für diesen Zähler ist der Ringpuffer nicht aktiviert")
+
+        field, minutes = call.data[ATTR_FIELD], call.data[ATTR_MINUTES]
+        samples = buffer.window(field, minutes)
+        return {
+            "field": field,
+            "minutes": minutes,
+            "count": len(samples),
+            "mean": buffer.mean(field, minutes),
+            "min": buffer.minimum(field, minutes),
+            "max": buffer.maximum(field, minutes),
+            "delta": buffer.delta(field, minutes),
+            "rate_per_hour": buffer.rate(field, minutes),
+            "samples": [list(sample) for sample in samples],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_READ_SAMPLES,
+        _async_read_samples,
+        schema=READ_SAMPLES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Entferne den Service, wenn kein Zähler mehr einen Ringpuffer hat."""
+    hass.services.async_remove(DOMAIN, SERVICE_READ_SAMPLES)
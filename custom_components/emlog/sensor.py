@@ -1,35 +1,72 @@
 from __future__ import annotations
 
+import logging
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_ALIGN_TO_SETTLEMENT,
+    CONF_CONNECT_TIMEOUT,
+    CONF_CONSUMPTION_SOURCE,
+    CONF_DYNAMIC_PRICE_SOURCE,
+    CONF_FAST_START,
     CONF_GAS_BRENNWERT,
     CONF_GAS_BRENNWERT_HELPER,
     CONF_GAS_ZUSTANDSZAHL,
     CONF_GAS_ZUSTANDSZAHL_HELPER,
+    CONF_HEARTBEAT_INTERVAL,
     CONF_HOST,
     CONF_INCLUDE_FEED_IN_SENSORS,
+    CONF_MAX_SCAN_INTERVAL,
     CONF_METER_INDEX,
     CONF_METER_TYPE,
+    CONF_MIN_SCAN_INTERVAL,
     CONF_PRICE_HELPER,
     CONF_PRICE_KWH,
+    CONF_READ_TIMEOUT,
+    CONF_RECORD_TRACES,
+    CONF_SAMPLE_BUFFER_SIZE,
     CONF_SCAN_INTERVAL,
+    CONF_TIMESERIES_STORE,
+    CONSUMPTION_SOURCE_NATIVE,
+    DEFAULT_CONNECT_TIMEOUT,
     DEFAULT_GAS_BRENNWERT,
     DEFAULT_GAS_ZUSTANDSZAHL,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
     DEFAULT_PRICE_KWH,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_SAMPLE_BUFFER_SIZE,
+    DYNAMIC_PRICE_SOURCE_NONE,
     METER_TYPE_STROM,
+    SIGNAL_ENTITIES_REGISTERED,
 )
-from .coordinator import EmlogCoordinator
+from .accumulator import ACCUMULATOR_PERIODS, EmlogPeriodAccumulator, async_start_accumulator
+from .coordinator import EmlogCoordinator, EmlogReading
+from .metrics import mean, window_percentile
+from .settings import EmlogEntrySettings, async_get_entry_settings
+from .template import async_setup_cost_entities, async_setup_dynamic_cost_entities
+from .samples import async_register_sample_buffer
+from .timeseries import async_open_timeseries_store
+from .traces import async_start_trace_recorder
+
+_LOGGER = logging.getLogger(__name__)
 
 
 @dataclass
@@ -41,7 +78,103 @@ class EmlogSensorDef:
     state_class: SensorStateClass | None
     icon: str | None = None
     suggested_display_precision: int | None = None
+    # Felder (siehe coordinator.changed_fields), bei deren Änderung der Sensor neu geschrieben wird.
+    # None = bei jedem Coordinator-Update
+    fields: tuple[str, ...] | None = None
+    # Liefert den Zustand aus dem aktuellen Reading; wird einmal pro Entity aufgelöst
+    value_fn: Callable[[EmlogSensorEntity, EmlogReading], Any] | None = None
+    # Zustand hängt von Preis/Brennwert/Zustandszahl ab -> bei Helper-Änderung sofort neu schreiben
+    uses_settings: bool = False
+
 
+@dataclass
+class EmlogMetricDef:
+    key: str
+    name: str
+    unit: str | None
+    device_class: SensorDeviceClass | None
+    state_class: SensorStateClass | None
+    icon: str
+    # Liefert den Zustand aus coordinator.metrics
+    value_fn: Callable[[EmlogCoordinator], Any]
+    attributes_fn: Callable[[EmlogCoordinator], dict[str, Any]] | None = None
+
+
+def _metric_percentiles(attribute: str, digits: int = 3) -> Callable[[EmlogCoordinator], dict[str, Any]]:
+    """Attribute p50/p99 zu einem Fenster der Metriken (der Zustand ist p95)."""
+    return lambda coordinator: {
+        "p50": window_percentile(getattr(coordinator.metrics, attribute), 50, digits),
+        "p99": window_percentile(getattr(coordinator.metrics, attribute), 99, digits),
+    }
+
+
+# Diagnose-Sensoren aus den Laufzeit-Metriken des Coordinators (standardmäßig deaktiviert)
+METRIC_SENSORS: list[EmlogMetricDef] = [
+    EmlogMetricDef(
+        "request_latency_p95",
+        "Request-Latenz p95",
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        "mdi:timer-outline",
+        value_fn=lambda coordinator: window_percentile(coordinator.metrics.request_latency_ms, 95, 1),
+        attributes_fn=_metric_percentiles("request_latency_ms", 1),
+    ),
+    EmlogMetricDef(
+        "payload_bytes",
+        "Payload-Größe",
+        UnitOfInformation.BYTES,
+        SensorDeviceClass.DATA_SIZE,
+        SensorStateClass.MEASUREMENT,
+        "mdi:file-document-outline",
+        value_fn=lambda coordinator: (
+            coordinator.metrics.payload_bytes[-1] if coordinator.metrics.payload_bytes else None
+        ),
+    ),
+    EmlogMetricDef(
+        "parse_time_p95",
+        "JSON-Parse-Zeit p95",
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        "mdi:code-json",
+        value_fn=lambda coordinator: window_percentile(coordinator.metrics.parse_time_ms, 95),
+        attributes_fn=_metric_percentiles("parse_time_ms"),
+    ),
+    EmlogMetricDef(
+        "fanout_time_p95",
+        "Listener-Fan-out p95",
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        "mdi:call-split",
+        value_fn=lambda coordinator: window_percentile(coordinator.metrics.fanout_time_ms, 95),
+        attributes_fn=_metric_percentiles("fanout_time_ms"),
+    ),
+    EmlogMetricDef(
+        "poll_interval_achieved",
+        "Poll-Intervall erreicht",
+        UnitOfTime.SECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        "mdi:timer-sync-outline",
+        value_fn=lambda coordinator: mean(coordinator.metrics.poll_interval_s, 1),
+        attributes_fn=lambda coordinator: {"configured_s": coordinator.poll_interval},
+    ),
+    EmlogMetricDef(
+        "failed_requests",
+        "Fehlgeschlagene Abrufe",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        "mdi:alert-circle-outline",
+        value_fn=lambda coordinator: coordinator.metrics.failures_total,
+        attributes_fn=lambda coordinator: {
+            "successes": coordinator.metrics.successes,
+            **coordinator.metrics.failures,
+        },
+    ),
+]
 
 # Gemeinsame Info-Sensoren (für beide Meter-Typen)
 COMMON_SENSORS: list[EmlogSensorDef] = [
@@ -52,6 +185,8 @@ COMMON_SENSORS: list[EmlogSensorDef] = [
         None,
         None,
         "mdi:chip",
+        fields=("product",),
+        value_fn=lambda entity, reading: reading.product,
     ),
     EmlogSensorDef(
         "version",
@@ -60,6 +195,8 @@ COMMON_SENSORS: list[EmlogSensorDef] = [
         None,
         None,
         "mdi:information-outline",
+        fields=("version",),
+        value_fn=lambda entity, reading: reading.version,
     ),
 ]
 
@@ -72,6 +209,8 @@ STROM_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.ENERGY,
         SensorStateClass.TOTAL_INCREASING,
         "mdi:flash",
+        fields=("stand180",),
+        value_fn=lambda entity, reading: reading.stand180,
     ),
     EmlogSensorDef(
         "wirkleistung_w",
@@ -80,6 +219,8 @@ STROM_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.POWER,
         SensorStateClass.MEASUREMENT,
         "mdi:flash-outline",
+        fields=("leistung170",),
+        value_fn=lambda entity, reading: reading.leistung170,
     ),
     EmlogSensorDef(
         "verbrauch_tag_kwh",
@@ -88,6 +229,8 @@ STROM_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.ENERGY,
         SensorStateClass.TOTAL,
         "mdi:counter",
+        fields=("kwh180",),
+        value_fn=lambda entity, reading: reading.kwh180,
     ),
     EmlogSensorDef(
         "betrag_tag_eur",
@@ -96,6 +239,8 @@ STROM_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.MONETARY,
         SensorStateClass.TOTAL,
         "mdi:currency-eur",
+        fields=("betrag180", "currency"),
+        value_fn=lambda entity, reading: reading.betrag180,
     ),
     EmlogSensorDef(
         "preis_eur_kwh",
@@ -104,6 +249,9 @@ STROM_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.MONETARY,
         None,
         "mdi:tag",
+        fields=("currency",),
+        value_fn=lambda entity, reading: entity._price_kwh,
+        uses_settings=True,
     ),
 ]
 
@@ -116,6 +264,8 @@ STROM_FEED_IN_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.ENERGY,
         SensorStateClass.TOTAL_INCREASING,
         "mdi:flash-export",
+        fields=("stand280",),
+        value_fn=lambda entity, reading: reading.stand280,
     ),
     EmlogSensorDef(
         "wirkleistung_lieferung_w",
@@ -124,6 +274,8 @@ STROM_FEED_IN_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.POWER,
         SensorStateClass.MEASUREMENT,
         "mdi:flash-export-outline",
+        fields=("leistung270",),
+        value_fn=lambda entity, reading: reading.leistung270,
     ),
     EmlogSensorDef(
         "verbrauch_lieferung_tag_kwh",
@@ -132,6 +284,8 @@ STROM_FEED_IN_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.ENERGY,
         SensorStateClass.TOTAL,
         "mdi:counter",
+        fields=("kwh280",),
+        value_fn=lambda entity, reading: reading.kwh280,
     ),
     EmlogSensorDef(
         "betrag_lieferung_eur",
@@ -140,6 +294,8 @@ STROM_FEED_IN_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.MONETARY,
         SensorStateClass.TOTAL,
         "mdi:currency-eur",
+        fields=("betrag280",),
+        value_fn=lambda entity, reading: reading.betrag280,
     ),
 ]
 
@@ -152,6 +308,8 @@ GAS_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.GAS,
         SensorStateClass.TOTAL_INCREASING,
         "mdi:gas-cylinder",
+        fields=("stand180",),
+        value_fn=lambda entity, reading: reading.stand180,
     ),
     EmlogSensorDef(
         "zaehlerstand_kwh",
@@ -160,6 +318,9 @@ GAS_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.ENERGY,
         SensorStateClass.TOTAL_INCREASING,
         "mdi:gas-burner",
+        fields=("stand180",),
+        value_fn=lambda entity, reading: reading.stand180 * entity._gas_brennwert * entity._gas_zustandszahl,
+        uses_settings=True,
     ),
     EmlogSensorDef(
         "wirkleistung_w",
@@ -168,6 +329,8 @@ GAS_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.POWER,
         SensorStateClass.MEASUREMENT,
         "mdi:fire",
+        fields=("leistung170",),
+        value_fn=lambda entity, reading: reading.leistung170,
     ),
     EmlogSensorDef(
         "verbrauch_tag_kwh",
@@ -176,6 +339,8 @@ GAS_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.ENERGY,
         SensorStateClass.TOTAL,
         "mdi:counter",
+        fields=("kwh180",),
+        value_fn=lambda entity, reading: reading.kwh180,
     ),
     EmlogSensorDef(
         "betrag_tag_eur",
@@ -184,6 +349,8 @@ GAS_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.MONETARY,
         SensorStateClass.TOTAL,
         "mdi:currency-eur",
+        fields=("betrag180", "currency"),
+        value_fn=lambda entity, reading: reading.betrag180,
     ),
     EmlogSensorDef(
         "preis_eur_kwh",
@@ -192,6 +359,9 @@ GAS_SENSORS: list[EmlogSensorDef] = [
         SensorDeviceClass.MONETARY,
         None,
         "mdi:tag",
+        fields=("currency",),
+        value_fn=lambda entity, reading: entity._price_kwh,
+        uses_settings=True,
     ),
     EmlogSensorDef(
         "brennwert",
@@ -200,6 +370,8 @@ GAS_SENSORS: list[EmlogSensorDef] = [
         None,
         None,
         "mdi:fire-circle",
+        value_fn=lambda entity, reading: entity._gas_brennwert,
+        uses_settings=True,
     ),
     EmlogSensorDef(
         "zustandszahl",
@@ -208,6 +380,8 @@ GAS_SENSORS: list[EmlogSensorDef] = [
         None,
         None,
         "mdi:gauge",
+        value_fn=lambda entity, reading: entity._gas_zustandszahl,
+        uses_settings=True,
     ),
 ]
 
@@ -218,45 +392,76 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     meter_type = entry.data[CONF_METER_TYPE]
     meter_index = int(entry.data[CONF_METER_INDEX])
     scan_interval = int(entry.options.get(CONF_SCAN_INTERVAL, entry.data.get(CONF_SCAN_INTERVAL, 30)))
-
-    # Helper function to get value from entity or fallback to config
-    def get_value_from_helper_or_config(helper_key: str, config_key: str, default_value: float) -> float:
-        """Get value from helper entity state or fallback to config/options/default."""
-        helper_entity_id = entry.options.get(helper_key, entry.data.get(helper_key, ""))
-
-        if helper_entity_id:
-            # Try to get state from helper entity
-            state = hass.states.get(helper_entity_id)
-            if state and state.state not in ("unknown", "unavailable"):
-                try:
-                    return float(state.state)
-                except (ValueError, TypeError):
-                    hass.logger.warning(
-                        f"Could not convert helper entity {helper_entity_id} state '{state.state}' "
-                        f"to float, using config value"
-                    )
-
-        # Fallback to options/data/default
-        return float(entry.options.get(config_key, entry.data.get(config_key, default_value)))
-
-    # Get values with priority: Helper state > Options > Data > Default
-    price_kwh = get_value_from_helper_or_config(CONF_PRICE_HELPER, CONF_PRICE_KWH, DEFAULT_PRICE_KWH)
-    gas_brennwert = get_value_from_helper_or_config(
-        CONF_GAS_BRENNWERT_HELPER, CONF_GAS_BRENNWERT, DEFAULT_GAS_BRENNWERT
-    )
-    gas_zustandszahl = get_value_from_helper_or_config(
-        CONF_GAS_ZUSTANDSZAHL_HELPER, CONF_GAS_ZUSTANDSZAHL, DEFAULT_GAS_ZUSTANDSZAHL
+    connect_timeout = float(entry.options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT))
+    read_timeout = float(entry.options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT))
+    adaptive_polling = bool(entry.options.get(CONF_ADAPTIVE_POLLING, False))
+    min_scan_interval = int(entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL))
+    max_scan_interval = int(entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL))
+    heartbeat_interval = int(entry.options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL))
+    sample_buffer_size = int(entry.options.get(CONF_SAMPLE_BUFFER_SIZE, DEFAULT_SAMPLE_BUFFER_SIZE))
+
+    # Preis, Brennwert und Zustandszahl kommen aus dem gecachten Einstellungs-Objekt des Entries
+    settings = async_get_entry_settings(hass, entry)
+
+    # Erstelle den Coordinator für diesen einen Zähler (Sicht auf den gemeinsamen Host-Coordinator)
+    coordinator = EmlogCoordinator(
+        hass,
+        host,
+        meter_type,
+        meter_index,
+        scan_interval,
+        entry,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        adaptive_polling=adaptive_polling,
+        min_scan_interval_s=min_scan_interval,
+        max_scan_interval_s=max_scan_interval,
+        heartbeat_interval_s=heartbeat_interval,
+        sample_buffer_size=sample_buffer_size,
     )
 
-    # Erstelle den Coordinator für diesen einen Zähler
-    coordinator = EmlogCoordinator(hass, host, meter_type, meter_index, scan_interval, entry)
+    # Fensterabfragen auf den letzten Messwerten über den Service emlog.read_samples
+    if coordinator.samples.capacity:
+        async_register_sample_buffer(hass, entry, coordinator.samples)
 
-    # Versuche den Coordinator zu initialisieren, aber ignoriere Fehler beim Start
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        # Fehler beim initialen Refresh sind OK - der Coordinator wird weiterhin versuchen, Daten zu fetchen
-        hass.logger.warning(f"Initial Emlog coordinator refresh failed (will retry): {err}")
+    # Optionaler persistenter Zeitreihen-Speicher; der Coordinator hängt jeden erfolgreichen Poll an
+    if entry.options.get(CONF_TIMESERIES_STORE, False):
+        try:
+            coordinator.timeseries = await async_open_timeseries_store(hass, entry, host, meter_index)
+        except OSError as err:
+            _LOGGER.warning(f"Zeitreihen-Speicher für {host} Zähler {meter_index} nicht verfügbar: {err}")
+
+    # Optionaler Mitschnitt aller rohen Antworten (abspielbar mit tests/mock/replay_server.py)
+    if entry.options.get(CONF_RECORD_TRACES, False):
+        coordinator.trace_recorder = async_start_trace_recorder(hass, entry, host, meter_index)
+
+    # Ab jetzt pollt der Host-Coordinator alle Zähler dieses Geräts in einem Zyklus
+    entry.async_on_unload(coordinator.async_attach())
+
+    # Integrierter Verbrauch pro Zeitraum statt externer Utility Meter (vor dem ersten Refresh,
+    # damit schon der erste Zählerstand als Bezugswert dient)
+    accumulator = None
+    if entry.options.get(CONF_CONSUMPTION_SOURCE) == CONSUMPTION_SOURCE_NATIVE:
+        accumulator = await async_start_accumulator(
+            hass, entry, coordinator, settings, bool(entry.options.get(CONF_ALIGN_TO_SETTLEMENT, False))
+        )
+
+    # Letzte Messwerte aus dem Snapshot, bis der erste Abruf Live-Daten liefert (api_status "restored")
+    await coordinator.async_restore_snapshot()
+
+    if entry.options.get(CONF_FAST_START, False):
+        # Schneller Start: Entities sofort registrieren (mit wiederhergestelltem Zustand),
+        # der erste Abruf läuft im Hintergrund und blockiert den HA-Start nicht
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"emlog first refresh {host} {meter_type} {meter_index}"
+        )
+    else:
+        # Versuche den Coordinator zu initialisieren, aber ignoriere Fehler beim Start
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception as err:
+            # Fehler beim initialen Refresh sind OK - der Coordinator wird weiterhin versuchen, Daten zu fetchen
+            _LOGGER.warning(f"Initial Emlog coordinator refresh failed (will retry): {err}")
 
     entities: list[SensorEntity] = []
 
@@ -275,9 +480,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
                 meter_index,
                 meter_name,
                 sensor_def,
-                price_kwh,
-                gas_brennwert,
-                gas_zustandszahl,
+                settings,
             )
         )
 
@@ -293,9 +496,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
                 meter_index,
                 meter_name,
                 sensor_def,
-                price_kwh,
-                gas_brennwert,
-                gas_zustandszahl,
+                settings,
             )
         )
 
@@ -311,21 +512,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
                     meter_index,
                     meter_name,
                     sensor_def,
-                    price_kwh,
-                    gas_brennwert,
-                    gas_zustandszahl,
+                    settings,
                 )
             )
 
+    # Verbrauch Tag/Monat/Jahr aus dem integrierten Akkumulator
+    if accumulator is not None:
+        for period, period_name in ACCUMULATOR_PERIODS.items():
+            entities.append(
+                EmlogConsumptionEntity(accumulator, host, meter_type, meter_index, meter_name, period, period_name)
+            )
+
     # Status-Entitäten (für alle Meter-Typen)
     entities.append(EmlogStatusEntity(coordinator, host, meter_type, meter_index, meter_name))
     entities.append(EmlogLastErrorEntity(coordinator, host, meter_type, meter_index, meter_name))
     entities.append(EmlogLastUpdateEntity(coordinator, host, meter_type, meter_index, meter_name))
 
+    # Laufzeit-Metriken als Diagnose-Sensoren (in der Entity-Registry standardmäßig deaktiviert)
+    for metric_def in METRIC_SENSORS:
+        entities.append(EmlogMetricEntity(coordinator, host, meter_type, meter_index, meter_name, metric_def))
+
+    # Kosten (Tag/Monat/Jahr) und Abschlag aus der Kosten-Engine des Zählers
+    entities.extend(async_setup_cost_entities(hass, entry, host, meter_type, meter_index, settings))
+
+    # Dynamische Kosten nur, wenn eine Preis-Zeitreihe konfiguriert ist
+    if settings.option(CONF_DYNAMIC_PRICE_SOURCE, DYNAMIC_PRICE_SOURCE_NONE) != DYNAMIC_PRICE_SOURCE_NONE:
+        entities.extend(
+            await async_setup_dynamic_cost_entities(hass, entry, host, meter_type, meter_index, settings)
+        )
+
     async_add_entities(entities)
 
 
-class EmlogSensorEntity(SensorEntity):
+class EmlogSensorEntity(RestoreSensor):
     """Representation of an Emlog Sensor."""
 
     def __init__(
@@ -336,9 +555,7 @@ class EmlogSensorEntity(SensorEntity):
         meter_index: int,
         meter_name: str,
         definition: EmlogSensorDef,
-        price_kwh: float,
-        gas_brennwert: float,
-        gas_zustandszahl: float,
+        settings: EmlogEntrySettings,
     ):
         self.coordinator = coordinator
         self._host = host
@@ -346,10 +563,9 @@ class EmlogSensorEntity(SensorEntity):
         self._meter_index = meter_index
         self._meter_name = meter_name
         self._definition = definition
-        # Store initial values but will read from coordinator for dynamic updates
-        self._initial_price_kwh = price_kwh
-        self._initial_gas_brennwert = gas_brennwert
-        self._initial_gas_zustandszahl = gas_zustandszahl
+        self._value_fn = definition.value_fn
+        self._settings = settings
+        self._restored_value = None  # Letzter Zustand vor dem Neustart, bis der Coordinator Daten hat
 
         # Entity ID mit Zählernummer für Konsistenz mit Utility Metern
         self.entity_id = f"sensor.emlog_{meter_type}_{meter_index}_{definition.key}"
@@ -365,19 +581,8 @@ class EmlogSensorEntity(SensorEntity):
 
     @property
     def _price_kwh(self) -> float:
-        """Get current price from coordinator's config entry."""
-        try:
-            if hasattr(self.coordinator, "config_entry"):
-                entry = self.coordinator.config_entry
-                helper_id = entry.options.get(CONF_PRICE_HELPER, entry.data.get(CONF_PRICE_HELPER, ""))
-                if helper_id:
-                    state = self.coordinator.hass.states.get(helper_id)
-                    if state and state.state not in ("unknown", "unavailable"):
-                        return float(state.state)
-                return float(entry.options.get(CONF_PRICE_KWH, entry.data.get(CONF_PRICE_KWH, self._initial_price_kwh)))
-        except Exception:
-            pass
-        return self._initial_price_kwh
+        """Get current price (helper state or config) from the settings cache."""
+        return self._settings.get(CONF_PRICE_HELPER, CONF_PRICE_KWH, DEFAULT_PRICE_KWH)
 
     @property
     def _currency(self) -> str:
@@ -399,45 +604,13 @@ class EmlogSensorEntity(SensorEntity):
 
     @property
     def _gas_brennwert(self) -> float:
-        """Get current brennwert from coordinator's config entry."""
-        try:
-            if hasattr(self.coordinator, "config_entry"):
-                entry = self.coordinator.config_entry
-                helper_id = entry.options.get(CONF_GAS_BRENNWERT_HELPER, entry.data.get(CONF_GAS_BRENNWERT_HELPER, ""))
-                if helper_id:
-                    state = self.coordinator.hass.states.get(helper_id)
-                    if state and state.state not in ("unknown", "unavailable"):
-                        return float(state.state)
-                return float(
-                    entry.options.get(
-                        CONF_GAS_BRENNWERT, entry.data.get(CONF_GAS_BRENNWERT, self._initial_gas_brennwert)
-                    )
-                )
-        except Exception:
-            pass
-        return self._initial_gas_brennwert
+        """Get current brennwert (helper state or config) from the settings cache."""
+        return self._settings.get(CONF_GAS_BRENNWERT_HELPER, CONF_GAS_BRENNWERT, DEFAULT_GAS_BRENNWERT)
 
     @property
     def _gas_zustandszahl(self) -> float:
-        """Get current zustandszahl from coordinator's config entry."""
-        try:
-            if hasattr(self.coordinator, "config_entry"):
-                entry = self.coordinator.config_entry
-                helper_id = entry.options.get(
-                    CONF_GAS_ZUSTANDSZAHL_HELPER, entry.data.get(CONF_GAS_ZUSTANDSZAHL_HELPER, "")
-                )
-                if helper_id:
-                    state = self.coordinator.hass.states.get(helper_id)
-                    if state and state.state not in ("unknown", "unavailable"):
-                        return float(state.state)
-                return float(
-                    entry.options.get(
-                        CONF_GAS_ZUSTANDSZAHL, entry.data.get(CONF_GAS_ZUSTANDSZAHL, self._initial_gas_zustandszahl)
-                    )
-                )
-        except Exception:
-            pass
-        return self._initial_gas_zustandszahl
+        """Get current zustandszahl (helper state or config) from the settings cache."""
+        return self._settings.get(CONF_GAS_ZUSTANDSZAHL_HELPER, CONF_GAS_ZUSTANDSZAHL, DEFAULT_GAS_ZUSTANDSZAHL)
 
     @staticmethod
     def _get_decimal_places(value: float) -> int:
@@ -461,8 +634,8 @@ class EmlogSensorEntity(SensorEntity):
     def available(self) -> bool:
         """Return True if entity is available."""
         try:
-            # Verfügbar, wenn Coordinator Daten hat (auch wenn Status "failed")
-            return self.coordinator.data is not None
+            # Verfügbar, wenn Coordinator Daten hat (auch wenn Status "failed") oder ein Zustand wiederhergestellt wurde
+            return self.coordinator.data is not None or self._restored_value is not None
         except Exception:
             return False
 
@@ -486,68 +659,84 @@ class EmlogSensorEntity(SensorEntity):
     def native_value(self):
         """Return the state of the sensor."""
         try:
-            if self.coordinator.data is None:
-                return None
+            if self.coordinator.data is None or self.coordinator.data.reading is None:
+                return self._restored_value
 
-            meter_data = self.coordinator.data.meter_data
-            if not meter_data:
+            reading = self.coordinator.data.reading
+            if self._value_fn is None:
                 return None
 
-            # Extrahiere Wert basierend auf Sensor-Typ
-            key = self._definition.key
-
-            # Gemeinsame Info-Sensoren
-            if key == "product":
-                return str(meter_data.get("product", "Unknown"))
-            elif key == "version":
-                return float(meter_data.get("version", 0) or 0)
-
-            # Meter-spezifische Sensoren
-            elif key == "zaehlerstand_kwh":
-                # Strom: Stand180 bereits kWh
-                if self._meter_type == METER_TYPE_STROM:
-                    return float(meter_data.get("Zaehlerstand_Bezug", {}).get("Stand180", 0) or 0)
-                # Gas: konvertiere m3 -> kWh mit Brennwert/Zustandszahl
-                m3 = float(meter_data.get("Zaehlerstand_Bezug", {}).get("Stand180", 0) or 0)
-                return m3 * self._gas_brennwert * self._gas_zustandszahl
-            elif key == "zaehlerstand_m3":
-                return float(meter_data.get("Zaehlerstand_Bezug", {}).get("Stand180", 0) or 0)
-            elif key == "wirkleistung_w":
-                return float(meter_data.get("Wirkleistung_Bezug", {}).get("Leistung170", 0) or 0)
-            elif key == "verbrauch_tag_kwh":
-                return float(meter_data.get("Kwh_Bezug", {}).get("Kwh180", 0) or 0)
-            elif key == "betrag_tag_eur":
-                return float(meter_data.get("Betrag_Bezug", {}).get("Betrag180", 0) or 0)
-            elif key == "preis_eur_kwh":
-                return float(self._price_kwh)
-            elif key == "brennwert":
-                return float(self._gas_brennwert)
-            elif key == "zustandszahl":
-                return float(self._gas_zustandszahl)
-            # Lieferungs-Sensoren (Einspeitung)
-            elif key == "zaehlerstand_lieferung_kwh":
-                return float(meter_data.get("Zaehlerstand_Lieferung", {}).get("Stand280", 0) or 0)
-            elif key == "wirkleistung_lieferung_w":
-                return float(meter_data.get("Wirkleistung_Lieferung", {}).get("Leistung270", 0) or 0)
-            elif key == "verbrauch_lieferung_tag_kwh":
-                return float(meter_data.get("Kwh_Lieferung", {}).get("Kwh280", 0) or 0)
-            elif key == "betrag_lieferung_eur":
-                return float(meter_data.get("Betrag_Lieferung", {}).get("Betrag280", 0) or 0)
-
-            return None
+            return self._value_fn(self, reading)
         except Exception:
             return None
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         try:
-            self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+            # Nur bei Änderung der Felder dieses Sensors neu schreiben
+            self.async_on_remove(
+                self.coordinator.async_add_field_listener(self.async_write_ha_state, self._definition.fields)
+            )
+            if self._definition.uses_settings:
+                self.async_on_remove(self._settings.async_add_listener(self.async_write_ha_state))
+
+            if self.coordinator.data is None and (last_data := await self.async_get_last_sensor_data()):
+                self._restored_value = last_data.native_value
         except Exception:
             pass
 
+        if self._definition.key == "zaehlerstand_kwh" and self.coordinator.config_entry is not None:
+            # Quelle der Utility Meter ist registriert -> deren Setup kann starten
+            async_dispatcher_send(
+                self.hass, SIGNAL_ENTITIES_REGISTERED.format(self.coordinator.config_entry.entry_id)
+            )
+
+
+class EmlogConsumptionEntity(SensorEntity):
+    """Verbrauch (kWh) im laufenden Tag/Monat/Jahr aus dem EmlogPeriodAccumulator."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_native_unit_of_measurement = "kWh"
+    _attr_suggested_display_precision = 3
+    _attr_icon = "mdi:counter"
+
+    def __init__(
+        self,
+        accumulator: EmlogPeriodAccumulator,
+        host: str,
+        meter_type: str,
+        meter_index: int,
+        meter_name: str,
+        period: str,
+        period_name: str,
+    ):
+        self._accumulator = accumulator
+        self._period = period
+        # Gleiche Entity ID wie der bisherige Utility Meter, damit Dashboards weiter funktionieren
+        self.entity_id = f"sensor.emlog_{meter_type}_{meter_index}_verbrauch_{period}"
+        self._attr_name = f"Emlog {meter_name} {meter_index} Verbrauch {period_name}"
+        self._attr_unique_id = f"emlog_{host}_{meter_type}_{meter_index}_verbrauch_{period}".replace(".", "_")
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def native_value(self) -> float:
+        return self._accumulator.values[self._period]
+
+    @property
+    def last_reset(self) -> datetime | None:
+        return self._accumulator.last_reset(self._period)
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        self.async_on_remove(self._accumulator.async_add_listener(self.async_write_ha_state))
+
 
 class EmlogStatusEntity(SensorEntity):
-    """Zeigt den API-Status an: 'connected', 'failed' oder 'initializing'."""
+    """Zeigt den API-Status an: 'connected', 'failed', 'initializing' oder 'restored'."""
 
     def __init__(self, coordinator: EmlogCoordinator, host: str, meter_type: str, meter_index: int, meter_name: str):
         self.coordinator = coordinator
@@ -578,8 +767,26 @@ class EmlogStatusEntity(SensorEntity):
         except Exception:
             return "Unknown"
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Zustand des Circuit Breakers und Wiederverwendung der Keep-Alive-Verbindungen des Geräts."""
+        try:
+            breaker = self.coordinator.circuit_breaker
+            stats = self.coordinator.client_stats
+            return {
+                "circuit_breaker": breaker.state,
+                "failed_cycles": breaker.failed_cycles,
+                "retry_delay_s": round(breaker.retry_delay),
+                "connections_created": stats.connections_created,
+                "connections_reused": stats.connections_reused,
+                "connection_reuse_ratio": round(stats.reuse_ratio, 2),
+            }
+        except Exception:
+            return {}
+
     async def async_added_to_hass(self) -> None:
         try:
+            # Bei jedem Update: die Breaker-Attribute ändern sich auch ohne neuen api_status
             self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
         except Exception:
             pass
@@ -620,7 +827,9 @@ class EmlogLastErrorEntity(SensorEntity):
 
     async def async_added_to_hass(self) -> None:
         try:
-            self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+            self.async_on_remove(
+                self.coordinator.async_add_field_listener(self.async_write_ha_state, ("last_error",))
+            )
         except Exception:
             pass
 
@@ -660,6 +869,52 @@ class EmlogLastUpdateEntity(SensorEntity):
 
     async def async_added_to_hass(self) -> None:
         try:
-            self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+            self.async_on_remove(
+                self.coordinator.async_add_field_listener(self.async_write_ha_state, ("last_successful_update",))
+            )
         except Exception:
             pass
+
+
+class EmlogMetricEntity(SensorEntity):
+    """Diagnose-Sensor für eine Laufzeit-Kennzahl des Coordinators (siehe metrics.py)."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: EmlogCoordinator,
+        host: str,
+        meter_type: str,
+        meter_index: int,
+        meter_name: str,
+        definition: EmlogMetricDef,
+    ):
+        self.coordinator = coordinator
+        self._definition = definition
+
+        self._attr_name = f"Emlog {meter_name} {meter_index} {definition.name}"
+        self._attr_unique_id = f"emlog_{host}_{meter_type}_{meter_index}_{definition.key}".replace(".", "_")
+        self._attr_icon = definition.icon
+        self._attr_native_unit_of_measurement = definition.unit
+        self._attr_device_class = definition.device_class
+        self._attr_state_class = definition.state_class
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def native_value(self):
+        return self._definition.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if self._definition.attributes_fn is None:
+            return None
+        return self._definition.attributes_fn(self.coordinator)
+
+    async def async_added_to_hass(self) -> None:
+        # Kennzahlen ändern sich bei jedem Poll, auch wenn unveränderte Payloads keine Listener auslösen
+        self.async_on_remove(self.coordinator.async_add_poll_listener(self.async_write_ha_state))
@@ -0,0 +1,175 @@
+"""Zwischengespeicherte Einstellungen eines Config Entries (Optionen + Helper-Entities)."""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CONF_BASE_PRICE_GAS_HELPER,
+    CONF_BASE_PRICE_GAS_NEW_HELPER,
+    CONF_BASE_PRICE_STROM_HELPER,
+    CONF_BASE_PRICE_STROM_NEW_HELPER,
+    CONF_GAS_BRENNWERT_HELPER,
+    CONF_GAS_ZUSTANDSZAHL_HELPER,
+    CONF_MONTHLY_ADVANCE_GAS_HELPER,
+    CONF_MONTHLY_ADVANCE_STROM_HELPER,
+    CONF_PRICE_HELPER,
+    CONF_PRICE_KWH_NEW_GAS_HELPER,
+    CONF_PRICE_KWH_NEW_STROM_HELPER,
+    DATA_SETTINGS,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Alle Optionen, die auf eine Helper-Entity (input_number, Sensor, ...) zeigen können
+HELPER_KEYS = (
+    CONF_PRICE_HELPER,
+    CONF_GAS_BRENNWERT_HELPER,
+    CONF_GAS_ZUSTANDSZAHL_HELPER,
+    CONF_BASE_PRICE_STROM_HELPER,
+    CONF_BASE_PRICE_GAS_HELPER,
+    CONF_MONTHLY_ADVANCE_STROM_HELPER,
+    CONF_MONTHLY_ADVANCE_GAS_HELPER,
+    CONF_PRICE_KWH_NEW_STROM_HELPER,
+    CONF_PRICE_KWH_NEW_GAS_HELPER,
+    CONF_BASE_PRICE_STROM_NEW_HELPER,
+    CONF_BASE_PRICE_GAS_NEW_HELPER,
+)
+
+
+class EmlogEntrySettings:
+    """Hält die aufgelösten Werte (Helper-State > Options > Data > Default) eines Entries.
+
+    Werte werden beim ersten Zugriff aufgelöst und bleiben gecacht, bis sich
+    eine Helper-Entity oder die Optionen ändern. Abhängige Entities melden sich
+    über async_add_listener() an und werden dann sofort aktualisiert.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+        self.hass = hass
+        self.entry = entry
+        self._cache: dict[tuple[str | None, str, float], float] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsub_track: CALLBACK_TYPE | None = None
+        self._unsub_options: CALLBACK_TYPE | None = None
+
+    def option(self, key: str, default=None):
+        """Liefere eine Einstellung aus den Optionen mit Fallback auf die Entry-Daten."""
+        return self.entry.options.get(key, self.entry.data.get(key, default))
+
+    def get(self, helper_key: str | None, config_key: str, default: float) -> float:
+        """Liefere den gecachten Wert einer Einstellung, löse ihn bei Bedarf auf."""
+        cache_key = (helper_key, config_key, default)
+        if (value := self._cache.get(cache_key)) is None:
+            value = self._cache[cache_key] = self._resolve(helper_key, config_key, default)
+        return value
+
+    def _resolve(self, helper_key: str | None, config_key: str, default: float) -> float:
+        """Lese Helper-State bzw. Option und konvertiere nach float."""
+        helper_id = self.option(helper_key, "") if helper_key else ""
+
+        if helper_id:
+            state = self.hass.states.get(helper_id)
+            if state and state.state not in ("unknown", "unavailable"):
+                try:
+                    return float(state.state)
+                except (ValueError, TypeError):
+                    _LOGGER.warning(
+                        f"Could not convert helper entity {helper_id} state '{state.state}' "
+                        f"to float, using config value"
+                    )
+
+        try:
+            return float(self.option(config_key, default))
+        except (ValueError, TypeError):
+            return float(default)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Registriere einen Callback, der bei geänderten Werten aufgerufen wird."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _async_remove_listener() -> None:
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+
+        return _async_remove_listener
+
+    @callback
+    def async_start(self) -> None:
+        """Abonniere Optionsänderungen und die State-Changes der konfigurierten Helper."""
+        self._unsub_options = self.entry.add_update_listener(self._async_options_updated)
+        self._async_track_helpers()
+
+    @callback
+    def async_stop(self) -> None:
+        """Beende alle Abonnements."""
+        if self._unsub_track is not None:
+            self._unsub_track()
+            self._unsub_track = None
+        if self._unsub_options is not None:
+            self._unsub_options()
+            self._unsub_options = None
+        self._listeners.clear()
+
+    @callback
+    def _async_track_helpers(self) -> None:
+        """(Neu) abonnieren der aktuell konfigurierten Helper-Entities."""
+        if self._unsub_track is not None:
+            self._unsub_track()
+            self._unsub_track = None
+
+        helper_ids = {helper_id for key in HELPER_KEYS if (helper_id := self.option(key, ""))}
+        if helper_ids:
+            self._unsub_track = async_track_state_change_event(
+                self.hass, sorted(helper_ids), self._async_handle_helper_change
+            )
+
+    @callback
+    def _async_handle_helper_change(self, event: Event) -> None:
+        """Helper-State hat sich geändert - gecachte Werte neu auflösen."""
+        self._async_refresh_cache()
+
+    async def _async_options_updated(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Optionen wurden geändert - Helper neu abonnieren und Werte neu auflösen.
+
+        Listener werden immer benachrichtigt, da sich auch nicht gecachte
+        Optionen (z.B. das Datum eines Tarifwechsels) geändert haben können.
+        """
+        self._async_track_helpers()
+        self._async_refresh_cache(force=True)
+
+    @callback
+    def _async_refresh_cache(self, force: bool = False) -> None:
+        """Löse alle bisher genutzten Werte neu auf und benachrichtige bei Änderungen."""
+        previous = self._cache
+        self._cache = {key: self._resolve(*key) for key in previous}
+
+        if force or self._cache != previous:
+            for update_callback in list(self._listeners):
+                update_callback()
+
+
+@callback
+def async_get_entry_settings(hass: HomeAssistant, entry: ConfigEntry) -> EmlogEntrySettings:
+    """Liefere den Einstellungs-Cache eines Entries aus hass.data[DOMAIN] oder lege ihn an."""
+    all_settings: dict[str, EmlogEntrySettings] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SETTINGS, {})
+
+    if (settings := all_settings.get(entry.entry_id)) is None:
+        settings = all_settings[entry.entry_id] = EmlogEntrySettings(hass, entry)
+        settings.async_start()
+
+        @callback
+        def _async_remove_settings() -> None:
+            settings.async_stop()
+            all_settings.pop(entry.entry_id, None)
+
+        entry.async_on_unload(_async_remove_settings)
+
+    return settings
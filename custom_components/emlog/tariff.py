@@ -0,0 +1,87 @@
+"""Tarif-Zeitleiste: geordnete Preisperioden pro Zählertyp."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime
+
+# Format einer Zeile in den Optionen: "JJJJ-MM-TT;Arbeitspreis;Grundpreis"
+TARIFF_DATE_FORMAT = "%Y-%m-%d"
+TARIFF_SEPARATOR = ";"
+
+
+@dataclass(frozen=True, slots=True)
+class TariffPeriod:
+    """Ein Tarif, der ab valid_from (Tagesbeginn, lokale Zeit) gilt."""
+
+    valid_from: date
+    price_kwh: float
+    base_price: float  # pro Monat
+
+
+def parse_tariff_periods(text: str) -> list[TariffPeriod]:
+    """Parse die Tarif-Zeilen aus den Optionen (eine Periode pro Zeile).
+
+    Leere Zeilen werden ignoriert, Kommas als Dezimaltrenner akzeptiert.
+
+    Raises:
+        ValueError: Bei ungültigem Format oder doppeltem Datum
+    """
+    periods: dict[date, TariffPeriod] = {}
+
+    for line in text.splitlines():
+        if not (line := line.strip()):
+            continue
+
+        parts = [part.strip() for part in line.split(TARIFF_SEPARATOR)]
+        if len(parts) != 3:
+            raise ValueError(f"Ungültige Tarif-Zeile: {line}")
+
+        valid_from = datetime.strptime(parts[0], TARIFF_DATE_FORMAT).date()
+        if valid_from in periods:
+            raise ValueError(f"Doppeltes Datum in Tarif-Zeitleiste: {parts[0]}")
+
+        periods[valid_from] = TariffPeriod(
+            valid_from=valid_from,
+            price_kwh=float(parts[1].replace(",", ".")),
+            base_price=float(parts[2].replace(",", ".")),
+        )
+
+    return sorted(periods.values(), key=lambda period: period.valid_from)
+
+
+def format_tariff_periods(periods: Iterable[TariffPeriod]) -> str:
+    """Normalisierte Textform der Perioden (sortiert, eine pro Zeile).
+
+    Preise als repr(float): kürzeste Darstellung, die beim erneuten Parsen
+    exakt denselben Wert ergibt (":g" rundet auf 6 signifikante Stellen).
+    """
+    return "\n".join(
+        f"{period.valid_from.strftime(TARIFF_DATE_FORMAT)}{TARIFF_SEPARATOR}"
+        f"{period.price_kwh!r}{TARIFF_SEPARATOR}{period.base_price!r}"
+        for period in sorted(periods, key=lambda period: period.valid_from)
+    )
+
+
+class EmlogTariffTimeline:
+    """Geordnete Tarifperioden mit Lookup per Bisektion.
+
+    Daten werden nur beim Aufbau verarbeitet; period_at() und next_change()
+    arbeiten auf einer vorsortierten Liste der Starttage.
+    """
+
+    def __init__(self, periods: Iterable[TariffPeriod]):
+        self.periods = sorted(periods, key=lambda period: period.valid_from)
+        self._starts = [period.valid_from for period in self.periods]
+
+    def period_at(self, day: date) -> TariffPeriod | None:
+        """Der an einem Tag gültige Tarif, None vor der ersten Periode."""
+        index = bisect_right(self._starts, day) - 1
+        return self.periods[index] if index >= 0 else None
+
+    def next_change(self, day: date) -> date | None:
+        """Starttag der nächsten Periode nach day, None wenn keine mehr folgt."""
+        index = bisect_right(self._starts, day)
+        return self._starts[index] if index < len(self._starts) else None
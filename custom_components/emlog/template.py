@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import logging
+from datetime import date, datetime
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time, async_track_state_change_event
+from homeassistant.util import dt as dt_util
 
 from .const import (
     CONF_BASE_PRICE_GAS,
@@ -30,341 +32,383 @@ from .const import (
     CONF_PRICE_KWH_NEW_GAS_HELPER,
     CONF_PRICE_KWH_NEW_STROM,
     CONF_PRICE_KWH_NEW_STROM_HELPER,
+    CONF_TARIFFS_GAS,
+    CONF_TARIFFS_STROM,
     DEFAULT_BASE_PRICE_GAS,
     DEFAULT_BASE_PRICE_STROM,
     DEFAULT_MONTHLY_ADVANCE_GAS,
     DEFAULT_MONTHLY_ADVANCE_STROM,
     METER_TYPE_STROM,
 )
+from .dynamic_price import DYNAMIC_COST_PERIODS, EmlogDynamicCostEngine
+from .settings import EmlogEntrySettings
+from .tariff import EmlogTariffTimeline, TariffPeriod, parse_tariff_periods
 
+_LOGGER = logging.getLogger(__name__)
 
-class EmlogCostSensor(SensorEntity):
-    """Sensor for cost calculation with tariff change support."""
+# Kosten-Zeiträume und ihre deutschen Namen
+COST_PERIODS = {
+    "tag": "Tag",
+    "monat": "Monat",
+    "jahr": "Jahr",
+}
 
-    _attr_device_class = SensorDeviceClass.MONETARY
-    _attr_state_class = SensorStateClass.TOTAL
+# Schlüssel der Abschlags-Werte im Ergebnis der Kosten-Engine
+ADVANCE_TOTAL = "advance_total"
+ADVANCE_DIFFERENCE = "advance_difference"
+
+
+class EmlogCostEngine:
+    """Berechnet Kosten (Tag/Monat/Jahr) und Abschlagswerte eines Zählers in einem Durchlauf.
+
+    Statt dass jede Entity periodisch gepollt wird, rechnet die Engine nur neu,
+    wenn sich ein Eingangswert ändert: Verbrauchs-Sensoren, Helper-/Optionswerte
+    (über EmlogEntrySettings) oder der aktive Tarif der Tarif-Zeitleiste.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         meter_type: str,
         meter_index: int,
-        period: str,  # "tag", "monat", "jahr"
-        entry: ConfigEntry,
+        settings: EmlogEntrySettings,
     ):
-        """Initialize cost sensor."""
         self.hass = hass
         self._meter_type = meter_type
         self._meter_index = meter_index
-        self._period = period
-        self._entry = entry
-        self._currency = "EUR"
-        self._attr_should_poll = True
-
-        # Map period to German name
-        period_name = {
-            "tag": "Tag",
-            "monat": "Monat",
-            "jahr": "Jahr",
-        }.get(period, period)
-
-        meter_name = "Strom" if meter_type == METER_TYPE_STROM else "Gas"
-        self._attr_name = f"Emlog {meter_name} {meter_index} Kosten {period_name}"
-        self._attr_unique_id = f"emlog_{meter_type}_{meter_index}_kosten_{period}"
-
-    @property
-    def unit_of_measurement(self) -> str:
-        """Return unit of measurement (currency)."""
-        return self._currency
-
-    def _get_value_from_helper_or_config(self, helper_key: str, config_key: str, default_value: float) -> float:
-        """Get value from helper entity or config with fallback."""
-        helper_id = self._entry.options.get(helper_key, self._entry.data.get(helper_key, ""))
-
-        if helper_id:
-            state = self.hass.states.get(helper_id)
-            if state and state.state not in ("unknown", "unavailable"):
-                try:
-                    return float(state.state)
-                except (ValueError, TypeError):
-                    pass
-
-        return float(self._entry.options.get(config_key, self._entry.data.get(config_key, default_value)))
-
-    def _get_config_for_meter_type(self, config_type: str) -> tuple:
-        """Get configuration keys for current meter type."""
-        if config_type == "price":
-            if self._meter_type == METER_TYPE_STROM:
-                return (
-                    CONF_PRICE_CHANGE_DATE_STROM,
-                    CONF_PRICE_KWH_NEW_STROM_HELPER,
-                    CONF_PRICE_KWH_NEW_STROM,
-                    CONF_PRICE_HELPER,
-                    CONF_PRICE_KWH,
-                )
-            else:
-                return (
-                    CONF_PRICE_CHANGE_DATE_GAS,
-                    CONF_PRICE_KWH_NEW_GAS_HELPER,
-                    CONF_PRICE_KWH_NEW_GAS,
-                    CONF_PRICE_HELPER,
-                    CONF_PRICE_KWH,
-                )
-        elif config_type == "base_price":
-            if self._meter_type == METER_TYPE_STROM:
-                return (
-                    CONF_PRICE_CHANGE_DATE_STROM,
-                    CONF_BASE_PRICE_STROM_NEW_HELPER,
-                    CONF_BASE_PRICE_STROM_NEW,
-                    CONF_BASE_PRICE_STROM_HELPER,
-                    CONF_BASE_PRICE_STROM,
-                    DEFAULT_BASE_PRICE_STROM,
-                )
-            else:
-                return (
-                    CONF_PRICE_CHANGE_DATE_GAS,
-                    CONF_BASE_PRICE_GAS_NEW_HELPER,
-                    CONF_BASE_PRICE_GAS_NEW,
-                    CONF_BASE_PRICE_GAS_HELPER,
-                    CONF_BASE_PRICE_GAS,
-                    DEFAULT_BASE_PRICE_GAS,
-                )
-        return ()
-
-    def _get_effective_value_with_tariff_change(self, config_type: str, default_value: float = 0.0) -> float:
-        """Get effective value considering tariff change date."""
-        config = self._get_config_for_meter_type(config_type)
-        change_date_key = config[0]
-        new_helper_key = config[1]
-        new_key = config[2]
-        current_helper_key = config[3]
-        current_key = config[4]
-        default = config[5] if len(config) > 5 else default_value
-
-        # Check if tariff change date has passed
-        change_date_str = self._entry.options.get(change_date_key, self._entry.data.get(change_date_key, ""))
-
-        if change_date_str:
-            try:
-                change_date = datetime.strptime(change_date_str, "%Y-%m-%d").date()
-                if datetime.now().date() >= change_date:
-                    # Use new value
-                    return self._get_value_from_helper_or_config(new_helper_key, new_key, 0.0)
-            except ValueError:
-                pass
-
-        # Use current value
-        return self._get_value_from_helper_or_config(current_helper_key, current_key, default)
-
-    def _get_effective_price(self) -> float:
-        """Get effective price considering tariff change date."""
-        return self._get_effective_value_with_tariff_change("price", 0.0)
-
-    def _get_effective_base_price(self) -> float:
-        """Get effective base price considering tariff change date."""
-        return self._get_effective_value_with_tariff_change("base_price")
-
-    @property
-    def native_value(self) -> float | None:
-        """Calculate cost: consumption × price + base_rate / days_in_period."""
-        try:
-            # Get consumption sensor with meter_index
-            consumption_sensor = f"sensor.emlog_{self._meter_type}_{self._meter_index}_verbrauch_{self._period}_kwh"
-            consumption_state = self.hass.states.get(consumption_sensor)
-            if not consumption_state or consumption_state.state in (
-                "unknown",
-                "unavailable",
-            ):
-                return None
-
-            consumption = float(consumption_state.state)
-
-            # Get effective prices with tariff change consideration
-            price_kwh = self._get_effective_price()
-            base_price = self._get_effective_base_price()
-
-            # Calculate cost
-            if self._period == "tag":
+        self._settings = settings
+        # Verbrauch je Zeitraum aus dem Akkumulator bzw. den Utility Metern (gleiche Entity IDs)
+        self._consumption_entity_ids = {
+            period: f"sensor.emlog_{meter_type}_{meter_index}_verbrauch_{period}" for period in COST_PERIODS
+        }
+        self.values: dict[str, float | None] = {}
+        self._listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._timeline = EmlogTariffTimeline([])
+        self.tariff: TariffPeriod | None = None
+        self._unsub_tariff_change: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_listener(self, key: str, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Registriere einen Callback für Änderungen eines Ergebniswerts."""
+        listeners = self._listeners.setdefault(key, [])
+        listeners.append(update_callback)
+
+        @callback
+        def _async_remove_listener() -> None:
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+
+        return _async_remove_listener
+
+    @callback
+    def async_start(self) -> None:
+        """Abonniere alle Eingänge und berechne die Startwerte."""
+        self._unsubs.append(
+            async_track_state_change_event(
+                self.hass,
+                list(self._consumption_entity_ids.values()),
+                self._async_handle_input_change,
+            )
+        )
+        self._unsubs.append(self._settings.async_add_listener(self._async_handle_settings_change))
+        self._async_rebuild_timeline()
+        self.async_recalculate()
+
+    @callback
+    def async_stop(self) -> None:
+        """Beende alle Abonnements und Timer."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._unsub_tariff_change is not None:
+            self._unsub_tariff_change()
+            self._unsub_tariff_change = None
+
+    @callback
+    def _async_handle_input_change(self, event: Event) -> None:
+        """Ein Verbrauchs-Sensor hat sich geändert."""
+        self.async_recalculate()
+
+    @callback
+    def _async_handle_settings_change(self) -> None:
+        """Helper oder Optionen haben sich geändert - Zeitleiste neu aufbauen."""
+        self._async_rebuild_timeline()
+        self.async_recalculate()
+
+    @callback
+    def _async_handle_tariff_change(self, now: datetime) -> None:
+        """Die nächste Tarifperiode beginnt - mit den neuen Preisen neu rechnen."""
+        self._unsub_tariff_change = None
+        self._async_activate_tariff()
+        self.async_recalculate()
+
+    @callback
+    def async_recalculate(self) -> None:
+        """Berechne alle Werte neu und benachrichtige nur die geänderten Entities."""
+        previous, self.values = self.values, self._calculate()
+
+        for key, value in self.values.items():
+            if key in previous and previous[key] == value:
+                continue
+            for update_callback in list(self._listeners.get(key, ())):
+                update_callback()
+
+    def _calculate(self) -> dict[str, float | None]:
+        """Ein Durchlauf über alle Kosten- und Abschlagswerte."""
+        values: dict[str, float | None] = {}
+
+        price_kwh = self.tariff.price_kwh if self.tariff else 0.0
+        base_price = self.tariff.base_price if self.tariff else 0.0
+
+        for period in COST_PERIODS:
+            consumption = self._get_consumption(period)
+            if consumption is None:
+                values[period] = None
+                continue
+
+            if period == "tag":
                 # Daily: consumption × price + (base_price / 30 days)
                 cost = (consumption * price_kwh) + (base_price / 30)
-            elif self._period == "monat":
+            elif period == "monat":
                 # Monthly: consumption × price + base_price
                 cost = (consumption * price_kwh) + base_price
-            elif self._period == "jahr":
+            else:
                 # Yearly: consumption × price + (base_price × 12 months)
                 cost = (consumption * price_kwh) + (base_price * 12)
-            else:
-                return None
+            values[period] = round(cost, 2)
+
+        yearly_advance = self._get_monthly_advance() * 12
+        values[ADVANCE_TOTAL] = round(yearly_advance, 2)
+        # Positiv: zu viel gezahlt (Erstattung), negativ: Nachzahlung
+        yearly_cost = values["jahr"]
+        values[ADVANCE_DIFFERENCE] = None if yearly_cost is None else round(yearly_cost - yearly_advance, 2)
 
-            return round(cost, 2)
+        return values
 
-        except Exception:
+    def _get_consumption(self, period: str) -> float | None:
+        """Aktueller Verbrauch eines Zeitraums aus dem Verbrauchs-Sensor."""
+        state = self.hass.states.get(self._consumption_entity_ids[period])
+        if not state or state.state in ("unknown", "unavailable"):
+            return None
+        try:
+            return float(state.state)
+        except (ValueError, TypeError):
             return None
 
+    @callback
+    def _async_rebuild_timeline(self) -> None:
+        """Baue die Tarif-Zeitleiste aus Optionen und Helper-Werten neu auf.
 
-class EmlogAdvanceTotalSensor(SensorEntity):
-    """Calculate total yearly advance payment (monthly_advance × 12)."""
+        Vor der ersten konfigurierten Periode gilt der aktuelle Preis/Grundpreis
+        (Helper oder Option). Ist keine Zeitleiste konfiguriert, wird der
+        einzelne Tarifwechsel (Datum + neue Preise) als zweite Periode übernommen.
+        """
+        if self._meter_type == METER_TYPE_STROM:
+            tariffs_key = CONF_TARIFFS_STROM
+            change_date_key = CONF_PRICE_CHANGE_DATE_STROM
+            new_price_keys = (CONF_PRICE_KWH_NEW_STROM_HELPER, CONF_PRICE_KWH_NEW_STROM)
+            base_price_keys = (CONF_BASE_PRICE_STROM_HELPER, CONF_BASE_PRICE_STROM, DEFAULT_BASE_PRICE_STROM)
+            new_base_price_keys = (CONF_BASE_PRICE_STROM_NEW_HELPER, CONF_BASE_PRICE_STROM_NEW)
+        else:
+            tariffs_key = CONF_TARIFFS_GAS
+            change_date_key = CONF_PRICE_CHANGE_DATE_GAS
+            new_price_keys = (CONF_PRICE_KWH_NEW_GAS_HELPER, CONF_PRICE_KWH_NEW_GAS)
+            base_price_keys = (CONF_BASE_PRICE_GAS_HELPER, CONF_BASE_PRICE_GAS, DEFAULT_BASE_PRICE_GAS)
+            new_base_price_keys = (CONF_BASE_PRICE_GAS_NEW_HELPER, CONF_BASE_PRICE_GAS_NEW)
+
+        periods = [
+            TariffPeriod(
+                valid_from=date.min,
+                price_kwh=self._settings.get(CONF_PRICE_HELPER, CONF_PRICE_KWH, 0.0),
+                base_price=self._settings.get(*base_price_keys),
+            )
+        ]
 
-    _attr_device_class = SensorDeviceClass.MONETARY
-    _attr_state_class = SensorStateClass.TOTAL
-    _attr_should_poll = True
+        if tariffs_text := self._settings.option(tariffs_key, ""):
+            try:
+                periods.extend(parse_tariff_periods(tariffs_text))
+            except ValueError as err:
+                _LOGGER.warning(f"Ungültige Tarif-Zeitleiste für {self._meter_type} {self._meter_index}: {err}")
+        elif change_date_str := self._settings.option(change_date_key, ""):
+            try:
+                change_date = datetime.strptime(change_date_str, "%Y-%m-%d").date()
+            except ValueError:
+                pass
+            else:
+                periods.append(
+                    TariffPeriod(
+                        valid_from=change_date,
+                        price_kwh=self._settings.get(*new_price_keys, 0.0),
+                        base_price=self._settings.get(*new_base_price_keys, 0.0),
+                    )
+                )
 
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        meter_type: str,
-        meter_index: int,
-        entry: ConfigEntry,
-    ):
-        """Initialize advance total sensor."""
-        self.hass = hass
-        self._meter_type = meter_type
-        self._meter_index = meter_index
-        self._entry = entry
-        self._currency = "EUR"
+        self._timeline = EmlogTariffTimeline(periods)
+        self._async_activate_tariff()
 
-        meter_name = "Strom" if meter_type == METER_TYPE_STROM else "Gas"
-        self._attr_name = f"Emlog {meter_name} {meter_index} Abschlag Jahresgesamt"
-        self._attr_unique_id = f"emlog_{meter_type}_{meter_index}_advance_total"
+    @callback
+    def _async_activate_tariff(self) -> None:
+        """Setze den heute gültigen Tarif und einen Timer auf den nächsten Wechsel."""
+        if self._unsub_tariff_change is not None:
+            self._unsub_tariff_change()
+            self._unsub_tariff_change = None
 
-    @property
-    def unit_of_measurement(self) -> str:
-        """Return currency."""
-        return self._currency
+        today = dt_util.now().date()
+        self.tariff = self._timeline.period_at(today)
 
-    def _get_monthly_advance_config_keys(self) -> tuple:
-        """Get config keys for monthly advance based on meter type."""
-        if self._meter_type == METER_TYPE_STROM:
-            return (
-                CONF_MONTHLY_ADVANCE_STROM_HELPER,
-                CONF_MONTHLY_ADVANCE_STROM,
-                DEFAULT_MONTHLY_ADVANCE_STROM,
-            )
-        else:
-            return (
-                CONF_MONTHLY_ADVANCE_GAS_HELPER,
-                CONF_MONTHLY_ADVANCE_GAS,
-                DEFAULT_MONTHLY_ADVANCE_GAS,
+        if (next_change := self._timeline.next_change(today)) is not None:
+            self._unsub_tariff_change = async_track_point_in_time(
+                self.hass, self._async_handle_tariff_change, dt_util.start_of_local_day(next_change)
             )
 
-    def _get_advance_value(self) -> float:
+    def _get_monthly_advance(self) -> float:
         """Get monthly advance value from helper or config."""
-        helper_key, config_key, default = self._get_monthly_advance_config_keys()
+        if self._meter_type == METER_TYPE_STROM:
+            return self._settings.get(
+                CONF_MONTHLY_ADVANCE_STROM_HELPER, CONF_MONTHLY_ADVANCE_STROM, DEFAULT_MONTHLY_ADVANCE_STROM
+            )
+        return self._settings.get(
+            CONF_MONTHLY_ADVANCE_GAS_HELPER, CONF_MONTHLY_ADVANCE_GAS, DEFAULT_MONTHLY_ADVANCE_GAS
+        )
 
-        helper_id = self._entry.options.get(helper_key, self._entry.data.get(helper_key, ""))
-        if helper_id:
-            state = self.hass.states.get(helper_id)
-            if state and state.state not in ("unknown", "unavailable"):
-                try:
-                    return float(state.state)
-                except (ValueError, TypeError):
-                    pass
 
-        return float(self._entry.options.get(config_key, self._entry.data.get(config_key, default)))
+class EmlogEngineSensor(SensorEntity):
+    """Basis für Sensoren, deren Wert aus der Kosten-Engine stammt."""
+
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_native_unit_of_measurement = "EUR"
+    _attr_should_poll = False
+
+    def __init__(self, engine: EmlogCostEngine | EmlogDynamicCostEngine, key: str):
+        self._engine = engine
+        self._key = key
 
     @property
     def native_value(self) -> float | None:
-        """Calculate yearly advance: monthly_advance × 12."""
-        try:
-            monthly_advance = self._get_advance_value()
-            return round(monthly_advance * 12, 2)
-        except Exception:
-            return None
+        """Return the value computed by the cost engine."""
+        return self._engine.values.get(self._key)
 
+    async def async_added_to_hass(self) -> None:
+        """Nur bei Änderung des eigenen Werts neu schreiben."""
+        self.async_on_remove(self._engine.async_add_listener(self._key, self.async_write_ha_state))
 
-class EmlogAdvanceDifferenceSensor(SensorEntity):
-    """Calculate difference between yearly costs and advance payments."""
 
-    _attr_device_class = SensorDeviceClass.MONETARY
-    _attr_state_class = SensorStateClass.TOTAL
-    _attr_should_poll = True
+class EmlogCostSensor(EmlogEngineSensor):
+    """Sensor for cost calculation with tariff change support.
+
+    Cost: consumption × price + base_rate / days_in_period.
+    """
 
     def __init__(
         self,
-        hass: HomeAssistant,
+        engine: EmlogCostEngine,
+        host: str,
         meter_type: str,
         meter_index: int,
-        entry: ConfigEntry,
+        period: str,  # "tag", "monat", "jahr"
     ):
-        """Initialize advance difference sensor."""
-        self.hass = hass
-        self._meter_type = meter_type
-        self._meter_index = meter_index
-        self._entry = entry
-        self._currency = "EUR"
+        """Initialize cost sensor."""
+        super().__init__(engine, period)
+        self._period = period
 
         meter_name = "Strom" if meter_type == METER_TYPE_STROM else "Gas"
-        self._attr_name = f"Emlog {meter_name} {meter_index} Abschlag Differenz"
-        self._attr_unique_id = f"emlog_{meter_type}_{meter_index}_advance_difference"
+        self._attr_name = f"Emlog {meter_name} {meter_index} Kosten {COST_PERIODS.get(period, period)}"
+        self._attr_unique_id = f"emlog_{host}_{meter_type}_{meter_index}_kosten_{period}".replace(".", "_")
 
     @property
-    def unit_of_measurement(self) -> str:
-        """Return currency."""
-        return self._currency
+    def extra_state_attributes(self) -> dict[str, float | None]:
+        """Preise des heute gültigen Tarifs."""
+        tariff = self._engine.tariff
+        return {
+            "price_kwh": tariff.price_kwh if tariff else None,
+            "base_price": tariff.base_price if tariff else None,
+        }
 
-    def _get_monthly_advance(self) -> float:
-        """Get monthly advance value from helper or config."""
-        if self._meter_type == METER_TYPE_STROM:
-            helper_key = CONF_MONTHLY_ADVANCE_STROM_HELPER
-            config_key = CONF_MONTHLY_ADVANCE_STROM
-            default = DEFAULT_MONTHLY_ADVANCE_STROM
-        else:
-            helper_key = CONF_MONTHLY_ADVANCE_GAS_HELPER
-            config_key = CONF_MONTHLY_ADVANCE_GAS
-            default = DEFAULT_MONTHLY_ADVANCE_GAS
 
-        helper_id = self._entry.options.get(helper_key, self._entry.data.get(helper_key, ""))
-        if helper_id:
-            state = self.hass.states.get(helper_id)
-            if state and state.state not in ("unknown", "unavailable"):
-                try:
-                    return float(state.state)
-                except (ValueError, TypeError):
-                    pass
+class EmlogAdvanceTotalSensor(EmlogEngineSensor):
+    """Calculate total yearly advance payment (monthly_advance × 12)."""
 
-        return float(self._entry.options.get(config_key, self._entry.data.get(config_key, default)))
+    def __init__(self, engine: EmlogCostEngine, host: str, meter_type: str, meter_index: int):
+        """Initialize advance total sensor."""
+        super().__init__(engine, ADVANCE_TOTAL)
 
-    @property
-    def native_value(self) -> float | None:
-        """Calculate difference: yearly_cost - (monthly_advance × 12).
+        meter_name = "Strom" if meter_type == METER_TYPE_STROM else "Gas"
+        self._attr_name = f"Emlog {meter_name} {meter_index} Abschlag Jahresgesamt"
+        self._attr_unique_id = f"emlog_{host}_{meter_type}_{meter_index}_advance_total".replace(".", "_")
 
-        Positive value: Customer paid too much (should get refund)
-        Negative value: Customer paid too little (should pay more)
-        """
-        try:
-            # Get yearly cost sensor with meter_index
-            yearly_cost_sensor = f"sensor.emlog_{self._meter_type}_{self._meter_index}_kosten_jahr"
-            yearly_cost_state = self.hass.states.get(yearly_cost_sensor)
-            if not yearly_cost_state or yearly_cost_state.state in (
-                "unknown",
-                "unavailable",
-            ):
-                return None
-            yearly_cost = float(yearly_cost_state.state)
-
-            monthly_advance = self._get_monthly_advance()
-            yearly_advance = monthly_advance * 12
-            difference = yearly_cost - yearly_advance
-
-            return round(difference, 2)
-
-        except Exception:
-            return None
 
+class EmlogAdvanceDifferenceSensor(EmlogEngineSensor):
+    """Calculate difference between yearly costs and advance payments.
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
-    """Set up Emlog cost and advance sensors from a config entry."""
-    meter_type = entry.data.get("meter_type")
-    meter_index = entry.data.get("meter_index")
+    Positive value: Customer paid too much (should get refund)
+    Negative value: Customer paid too little (should pay more)
+    """
 
-    entities = []
+    def __init__(self, engine: EmlogCostEngine, host: str, meter_type: str, meter_index: int):
+        """Initialize advance difference sensor."""
+        super().__init__(engine, ADVANCE_DIFFERENCE)
 
-    # Create cost sensors for day/month/year
-    for period in ["tag", "monat", "jahr"]:
-        entities.append(EmlogCostSensor(hass, meter_type, meter_index, period, entry))
+        meter_name = "Strom" if meter_type == METER_TYPE_STROM else "Gas"
+        self._attr_name = f"Emlog {meter_name} {meter_index} Abschlag Differenz"
+        self._attr_unique_id = f"emlog_{host}_{meter_type}_{meter_index}_advance_difference".replace(".", "_")
 
-    # Create advance payment sensors
-    entities.append(EmlogAdvanceTotalSensor(hass, meter_type, meter_index, entry))
-    entities.append(EmlogAdvanceDifferenceSensor(hass, meter_type, meter_index, entry))
 
-    async_add_entities(entities)
+class EmlogDynamicCostSensor(EmlogEngineSensor):
+    """Kosten nach dynamischem Preis: Σ Verbrauchsdelta × zum Zeitpunkt gültiger Preis."""
+
+    def __init__(self, engine: EmlogDynamicCostEngine, host: str, meter_type: str, meter_index: int, period: str):
+        """Initialize dynamic cost sensor."""
+        super().__init__(engine, period)
+        self._period = period
+
+        meter_name = "Strom" if meter_type == METER_TYPE_STROM else "Gas"
+        self._attr_name = f"Emlog {meter_name} {meter_index} Kosten dynamisch {COST_PERIODS.get(period, period)}"
+        self._attr_unique_id = f"emlog_{host}_{meter_type}_{meter_index}_kosten_dynamisch_{period}".replace(".", "_")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | str | None]:
+        """Aktueller Preis und Preisquelle."""
+        return {
+            "current_price": self._engine.current_price,
+            "price_source": self._engine.source,
+        }
+
+
+@callback
+def async_setup_cost_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    host: str,
+    meter_type: str,
+    meter_index: int,
+    settings: EmlogEntrySettings,
+) -> list[SensorEntity]:
+    """Starte die Kosten-Engine eines Entries und erstelle ihre Sensoren (aus sensor.async_setup_entry)."""
+    # Eine Engine pro Zähler rechnet alle Werte gemeinsam, ausgelöst durch State-Changes
+    engine = EmlogCostEngine(hass, meter_type, meter_index, settings)
+    engine.async_start()
+    entry.async_on_unload(engine.async_stop)
+
+    entities: list[SensorEntity] = [
+        EmlogCostSensor(engine, host, meter_type, meter_index, period) for period in COST_PERIODS
+    ]
+    entities.append(EmlogAdvanceTotalSensor(engine, host, meter_type, meter_index))
+    entities.append(EmlogAdvanceDifferenceSensor(engine, host, meter_type, meter_index))
+    return entities
+
+
+async def async_setup_dynamic_cost_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    host: str,
+    meter_type: str,
+    meter_index: int,
+    settings: EmlogEntrySettings,
+) -> list[SensorEntity]:
+    """Starte die Engine für dynamische Kosten und erstelle ihre Sensoren (aus sensor.async_setup_entry)."""
+    engine = EmlogDynamicCostEngine(hass, meter_type, meter_index, settings)
+    await engine.async_start()
+    entry.async_on_unload(engine.async_stop)
+    return [EmlogDynamicCostSensor(engine, host, meter_type, meter_index, period) for period in DYNAMIC_COST_PERIODS]
@@ -0,0 +1,414 @@
+"""Persistente Zeitreihe der Rohwerte pro Zähler (memory-mapped, nur anhängend).
+
+Jeder Zähler bekommt unter .storage/emlog/ eine Datei pro Auflösungsstufe
+(raw, 1min, 15min, 1h). Ein Datensatz hat feste Breite: fünf Doubles
+(Zeitstempel, Stand180, Leistung170, Stand280, Leistung270). In den
+verdichteten Stufen ist der Zeitstempel der Bucket-Beginn, die Stände sind
+der letzte Wert im Bucket und die Leistungen der Mittelwert.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_TIMESERIES, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+TIMESERIES_DIRECTORY = os.path.join(".storage", DOMAIN)
+
+# Header: Magic, Format-Version, Anzahl Datensätze
+HEADER = struct.Struct("<4sIQ")
+HEADER_MAGIC = b"EMTS"
+HEADER_VERSION = 1
+RECORD = struct.Struct("<5d")
+RECORD_DOUBLES = 5
+GROW_RECORDS = 4096  # Datei wächst in Schritten von 4096 Datensätzen (160 KiB)
+
+# Auflösungsstufe -> Bucket-Länge in Sekunden (0 = jeder Poll)
+TIERS = {
+    "raw": 0,
+    "1min": 60,
+    "15min": 900,
+    "1h": 3600,
+}
+
+SERVICE_READ_TIMESERIES = "read_timeseries"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_TIER = "tier"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_LIMIT = "limit"
+
+
+class EmlogTimeSeriesFile:
+    """Eine memory-mapped Datei mit Datensätzen fester Breite (nur anhängend).
+
+    Alle Methoden blockieren (Datei-I/O) und laufen im Executor.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._mmap: mmap.mmap | None = None
+        self.count = 0
+        self._capacity = 0
+
+    def open(self) -> None:
+        """Öffne bzw. lege die Datei an und mappe sie in den Speicher."""
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) >= HEADER.size
+        self._file = open(self.path, "r+b" if exists else "w+b")  # noqa: SIM115 - bleibt bis close() offen
+        if not exists:
+            self._file.truncate(HEADER.size + GROW_RECORDS * RECORD.size)
+        self._map()
+
+        magic, version, count = HEADER.unpack_from(self._mmap, 0)
+        if not exists or magic != HEADER_MAGIC or version != HEADER_VERSION:
+            if exists:
+                _LOGGER.warning(f"Zeitreihe {self.path} hat ein unbekanntes Format und wird neu angelegt")
+            count = 0
+            HEADER.pack_into(self._mmap, 0, HEADER_MAGIC, HEADER_VERSION, 0)
+        self.count = min(count, self._capacity)
+
+    def _map(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        self._capacity = (size - HEADER.size) // RECORD.size
+
+    def append(self, record: tuple[float, ...]) -> None:
+        """Hänge einen Datensatz an und vergrößere die Datei bei Bedarf."""
+        if self.count >= self._capacity:
+            self._file.truncate(HEADER.size + (self._capacity + GROW_RECORDS) * RECORD.size)
+            self._map()
+        RECORD.pack_into(self._mmap, HEADER.size + self.count * RECORD.size, *record)
+        self.count += 1
+        HEADER.pack_into(self._mmap, 0, HEADER_MAGIC, HEADER_VERSION, self.count)
+
+    def last(self) -> tuple[float, ...] | None:
+        """Letzter Datensatz (z.B. um nach einem Neustart anzuknüpfen)."""
+        if not self.count:
+            return None
+        return RECORD.unpack_from(self._mmap, HEADER.size + (self.count - 1) * RECORD.size)
+
+    def _timestamp(self, index: int) -> float:
+        return struct.unpack_from("<d", self._mmap, HEADER.size + index * RECORD.size)[0]
+
+    def _bisect(self, timestamp: float) -> int:
+        """Erster Index mit Zeitstempel >= timestamp."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamp(middle) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def view(self, start: float, end: float) -> memoryview:
+        """Datensätze mit start <= Zeitstempel < end als Double-View auf das Mapping.
+
+        Es wird nichts kopiert; die View ist nur bis zum nächsten Wachsen
+        der Datei bzw. bis close() gültig und wird deshalb unter dem Lock
+        des Stores ausgewertet.
+        """
+        first = self._bisect(start)
+        last = self._bisect(end)
+        offset = HEADER.size + first * RECORD.size
+        return memoryview(self._mmap)[offset : HEADER.size + last * RECORD.size].cast("d")
+
+    def flush(self) -> None:
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+@dataclass(slots=True)
+class _Bucket:
+    """Laufender Bucket einer verdichteten Stufe."""
+
+    start: float = 0.0
+    count: int = 0
+    stand180: float = 0.0
+    power170_sum: float = 0.0
+    stand280: float = 0.0
+    power270_sum: float = 0.0
+
+    def record(self) -> tuple[float, ...]:
+        count = self.count
+        return (self.start, self.stand180, self.power170_sum / count, self.stand280, self.power270_sum / count)
+
+
+@dataclass
+class EmlogTimeSeriesStore:
+    """Alle Stufen eines Zählers; Schreiben und Lesen laufen im Executor.
+
+    Polls landen in einer Queue, die ein einzelner Writer-Task in Poll-
+    Reihenfolge abarbeitet (was sich während eines Executor-Jobs angesammelt
+    hat, geht als ein Batch in den nächsten). Parallele Executor-Jobs pro
+    Poll würden in beliebiger Reihenfolge laufen und Datensätze als "vor dem
+    letzten Zeitstempel" verwerfen.
+    """
+
+    hass: HomeAssistant
+    name: str  # Dateiname-Präfix, z.B. "192_168_1_10_1"
+    files: dict[str, EmlogTimeSeriesFile] = field(default_factory=dict)
+    _buckets: dict[str, _Bucket] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _queue: asyncio.Queue[tuple[float, ...] | None] = field(default_factory=asyncio.Queue)
+    _writer: asyncio.Task[None] | None = None
+
+    @classmethod
+    def for_meter(cls, hass: HomeAssistant, host: str, meter_index: int) -> EmlogTimeSeriesStore:
+        """Store für einen Zähler (Host wird für den Dateinamen bereinigt)."""
+        return cls(hass, f"{re.sub(r'[^A-Za-z0-9]+', '_', host)}_{meter_index}")
+
+    async def async_open(self) -> None:
+        await self.hass.async_add_executor_job(self._open)
+        self._writer = self.hass.async_create_background_task(
+            self._async_write_queue(), f"emlog timeseries writer {self.name}"
+        )
+
+    def path(self, tier: str) -> str:
+        """Datei einer Stufe, z.B. .storage/emlog/192_168_1_10_1.1min.bin."""
+        return self.hass.config.path(TIMESERIES_DIRECTORY, f"{self.name}.{tier}.bin")
+
+    def _open(self) -> None:
+        os.makedirs(self.hass.config.path(TIMESERIES_DIRECTORY), exist_ok=True)
+        with self._lock:
+            for tier in TIERS:
+                ts_file = EmlogTimeSeriesFile(self.path(tier))
+                ts_file.open()
+                self.files[tier] = ts_file
+
+    @callback
+    def async_append(
+        self, timestamp: float, stand180: float, leistung170: float, stand280: float, leistung270: float
+    ) -> None:
+        """Übernimm einen Poll (der Writer-Task schreibt im Executor, blockiert den Event Loop nicht)."""
+        self._queue.put_nowait((timestamp, stand180, leistung170, stand280, leistung270))
+
+    async def _async_write_queue(self) -> None:
+        """Einziger Schreiber: Queue in Reihenfolge abarbeiten, bis async_close() None einreiht."""
+        while True:
+            records = [await self._queue.get()]
+            while not self._queue.empty():
+                records.append(self._queue.get_nowait())
+            stop = records[-1] is None
+            if records := [record for record in records if record is not None]:
+                try:
+                    await self.hass.async_add_executor_job(self._append_batch, records)
+                except OSError as err:
+                    _LOGGER.warning(f"Zeitreihe {self.name}: {len(records)} Datensätze nicht geschrieben: {err}")
+            if stop:
+                return
+
+    def _append_batch(self, records: list[tuple[float, ...]]) -> None:
+        with self._lock:
+            for record in records:
+                self._append(record)
+
+    def _append(self, record: tuple[float, ...]) -> None:
+        if not self.files:
+            return
+        raw = self.files["raw"]
+        if raw.count and record[0] < raw.last()[0]:
+            # Uhr zurückgestellt: Bereichsabfragen setzen monotone Zeitstempel voraus
+            _LOGGER.debug(f"Zeitreihe {self.name}: Datensatz vor dem letzten Zeitstempel verworfen")
+            return
+        raw.append(record)
+
+        timestamp, stand180, leistung170, stand280, leistung270 = record
+        for tier, seconds in TIERS.items():
+            if not seconds:
+                continue
+            start = timestamp - timestamp % seconds
+            bucket = self._buckets.get(tier)
+            if bucket is not None and bucket.start != start and bucket.count:
+                # Bucket abgeschlossen -> als verdichteten Datensatz schreiben
+                self.files[tier].append(bucket.record())
+                bucket = None
+            if bucket is None:
+                bucket = self._buckets[tier] = _Bucket(start=start)
+            bucket.count += 1
+            bucket.stand180 = stand180
+            bucket.power170_sum += leistung170
+            bucket.stand280 = stand280
+            bucket.power270_sum += leistung270
+
+    async def async_read(self, tier: str, start: float, end: float, limit: int) -> list[list[float]]:
+        """Datensätze einer Stufe im Zeitraum (höchstens limit, die neuesten)."""
+        return await self.hass.async_add_executor_job(self._read, tier, start, end, limit)
+
+    def _read(self, tier: str, start: float, end: float, limit: int) -> list[list[float]]:
+        with self._lock:
+            if tier not in self.files:
+                return []
+            view = self.files[tier].view(start, end)
+            try:
+                records = len(view) // RECORD_DOUBLES
+                first = max(records - limit, 0) * RECORD_DOUBLES
+                # Erst hier wird kopiert - für die JSON-Antwort des Services
+                return [view[i : i + RECORD_DOUBLES].tolist() for i in range(first, len(view), RECORD_DOUBLES)]
+            finally:
+                view.release()
+
+    async def async_close(self) -> None:
+        """Noch eingereihte Polls und angebrochene Buckets schreiben, dann die Dateien schließen.
+
+        Ein angebrochener Bucket landet als eigener Datensatz in seiner Stufe;
+        nach dem nächsten Öffnen beginnt für denselben Zeitraum ein neuer.
+        """
+        if self._writer is not None and not self._writer.done():
+            self._queue.put_nowait(None)
+            await self._writer
+            self._writer = None
+        await self.hass.async_add_executor_job(self._close)
+
+    def _close(self) -> None:
+        with self._lock:
+            for tier, bucket in self._buckets.items():
+                if bucket.count and tier in self.files:
+                    self.files[tier].append(bucket.record())
+            self._buckets.clear()
+            for ts_file in self.files.values():
+                ts_file.close()
+            self.files.clear()
+
+
+async def async_open_timeseries_store(
+    hass: HomeAssistant, entry: ConfigEntry, host: str, meter_index: int
+) -> EmlogTimeSeriesStore:
+    """Öffne den Zeitreihen-Speicher eines Entries und registriere ihn für den Service."""
+    store = EmlogTimeSeriesStore.for_meter(hass, host, meter_index)
+    await store.async_open()
+
+    stores: dict[str, EmlogTimeSeriesStore] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_TIMESERIES, {})
+    stores[entry.entry_id] = store
+    # Service erst registrieren, wenn ein Zähler den Speicher nutzt (hält das Modul aus dem Config-Flow-Pfad)
+    async_setup_services(hass)
+
+    async def _async_handle_final_write(_event: Event) -> None:
+        # Beim Beenden von Home Assistant werden Entries nicht entladen
+        nonlocal unsub_final_write
+        unsub_final_write = None
+        await store.async_close()
+
+    unsub_final_write: CALLBACK_TYPE | None = hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_FINAL_WRITE, _async_handle_final_write
+    )
+
+    @callback
+    def _async_close_store() -> None:
+        if unsub_final_write is not None:
+            unsub_final_write()
+        # Nur falls async_unload_entry ihn nicht schon geschlossen hat (z.B. fehlgeschlagenes Setup)
+        if stores.get(entry.entry_id) is store:
+            hass.async_create_task(async_close_timeseries_store(hass, entry))
+
+    entry.async_on_unload(_async_close_store)
+    return store
+
+
+async def async_close_timeseries_store(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Schließe den Zeitreihen-Speicher eines Entries.
+
+    Wird vor dem erneuten Setup abgewartet: Ein neuer Store würde dieselben
+    Dateien mappen, während der alte Writer noch schreibt.
+    """
+    stores: dict[str, EmlogTimeSeriesStore] = hass.data.get(DOMAIN, {}).get(DATA_TIMESERIES, {})
+    if (store := stores.pop(entry.entry_id, None)) is None:
+        return
+    if not stores:
+        async_unload_services(hass)
+    await store.async_close()
+
+
+READ_TIMESERIES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_TIER, default="raw"): vol.In(list(TIERS)),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_LIMIT, default=10000): vol.All(vol.Coerce(int), vol.Range(min=1, max=100000)),
+    }
+)
+
+
+def _to_timestamp(value: datetime | None, default: float) -> float:
+    if value is None:
+        return default
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return value.timestamp()
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Registriere den Service zum Auslesen der Zeitreihe (einmalig)."""
+    if hass.services.has_service(DOMAIN, SERVICE_READ_TIMESERIES):
+        return
+
+    async def _async_read_timeseries(call: ServiceCall) -> ServiceResponse:
+        stores: dict[str, EmlogTimeSeriesStore] = hass.data.get(DOMAIN, {}).get(DATA_TIMESERIES, {})
+        store = stores.get(call.data[ATTR_CONFIG_ENTRY_ID])
+        if store is None:
+            raise HomeAssistantError("Für diesen Zähler ist der Zeitreihen-Speicher nicht aktiviert")
+
+        records = await store.async_read(
+            call.data[ATTR_TIER],
+            _to_timestamp(call.data.get(ATTR_START), 0.0),
+            _to_timestamp(call.data.get(ATTR_END), float("inf")),
+            call.data[ATTR_LIMIT],
+        )
+        return {
+            "fields": ["timestamp", "stand180", "leistung170", "stand280", "leistung270"],
+            "records": records,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_READ_TIMESERIES,
+        _async_read_timeseries,
+        schema=READ_TIMESERIES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Entferne den Service, wenn kein Zähler mehr einen Zeitreihen-Speicher hat."""
+    hass.services.async_remove(DOMAIN, SERVICE_READ_TIMESERIES)
@@ -0,0 +1,138 @@
+"""Mitschnitt der rohen Export-Antworten eines Zählers (gzip-komprimiertes JSONL).
+
+Jede Zeile ist ein Abruf:
+    {"ts": 1760000000.123, "host": "192.168.1.10", "meter_index": 1, "body": "{...}", "error": null}
+
+Nicht als UTF-8 lesbare Antworten landen base64-kodiert in "body_b64".
+Die Dateien liegen unter .storage/emlog/traces/ und lassen sich mit
+tests/mock/replay_server.py wieder abspielen.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import logging
+import os
+import re
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACES_DIRECTORY = os.path.join(".storage", DOMAIN, "traces")
+TRACE_FLUSH_RECORDS = 100  # Spätestens nach so vielen Abrufen schreiben ...
+TRACE_FLUSH_DELAY = 60  # ... bzw. nach so vielen Sekunden
+
+
+def trace_path(hass: HomeAssistant, host: str, meter_index: int) -> str:
+    """Pfad des Mitschnitts eines Zählers (Host wird für den Dateinamen bereinigt)."""
+    return hass.config.path(TRACES_DIRECTORY, f"{re.sub(r'[^A-Za-z0-9]+', '_', host)}_{meter_index}.jsonl.gz")
+
+
+def trace_record(host: str, meter_index: int, payload: bytes | None, error: str | None) -> dict[str, Any]:
+    """Ein Abruf als JSON-fähiges Dict."""
+    record: dict[str, Any] = {"ts": time.time(), "host": host, "meter_index": meter_index, "error": error}
+    if payload is not None:
+        try:
+            record["body"] = payload.decode()
+        except UnicodeDecodeError:
+            record["body_b64"] = base64.b64encode(payload).decode()
+    return record
+
+
+def trace_body(record: dict[str, Any]) -> bytes | None:
+    """Roher Body eines Mitschnitt-Datensatzes (None bei Fehlern ohne Antwort)."""
+    if (body := record.get("body")) is not None:
+        return body.encode()
+    if (body_b64 := record.get("body_b64")) is not None:
+        return base64.b64decode(body_b64)
+    return None
+
+
+class EmlogTraceRecorder:
+    """Puffert Abrufe im Speicher und hängt sie gebündelt im Executor an die Datei an.
+
+    Jeder Flush schreibt ein eigenes gzip-Member; gzip.open liest die Datei
+    trotzdem als einen Strom.
+    """
+
+    def __init__(self, hass: HomeAssistant, host: str, meter_index: int):
+        self.hass = hass
+        self.host = host
+        self.meter_index = meter_index
+        self.path = trace_path(hass, host, meter_index)
+        self._buffer: list[str] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_record(self, payload: bytes | None, error: str | None) -> None:
+        """Übernimm einen Abruf (roh, vor dem Parsen)."""
+        self._buffer.append(json.dumps(trace_record(self.host, self.meter_index, payload, error)))
+        if len(self._buffer) >= TRACE_FLUSH_RECORDS:
+            self._async_flush()
+        elif self._unsub_flush is None:
+            self._unsub_flush = async_call_later(self.hass, TRACE_FLUSH_DELAY, self._async_flush)
+
+    @callback
+    def _async_flush(self, *_: Any) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        self.hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as err:
+            _LOGGER.warning(f"Mitschnitt {self.path} konnte nicht geschrieben werden: {err}")
+
+    async def async_close(self) -> None:
+        """Restlichen Puffer schreiben."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if self._buffer:
+            lines, self._buffer = self._buffer, []
+            await self.hass.async_add_executor_job(self._write, lines)
+
+
+@callback
+def async_start_trace_recorder(
+    hass: HomeAssistant, entry: ConfigEntry, host: str, meter_index: int
+) -> EmlogTraceRecorder:
+    """Mitschnitt für einen Zähler starten; der Puffer wird beim Entladen bzw. Beenden geschrieben."""
+    recorder = EmlogTraceRecorder(hass, host, meter_index)
+    _LOGGER.info(f"Mitschnitt der Emlog-Antworten von {host} (Index {meter_index}) nach {recorder.path}")
+
+    async def _async_handle_final_write(_event: Event) -> None:
+        # Beim Beenden von Home Assistant werden Entries nicht entladen
+        nonlocal unsub_final_write
+        unsub_final_write = None
+        await recorder.async_close()
+
+    unsub_final_write: CALLBACK_TYPE | None = hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_FINAL_WRITE, _async_handle_final_write
+    )
+
+    @callback
+    def _async_close_recorder() -> None:
+        if unsub_final_write is not None:
+            unsub_final_write()
+        hass.async_create_task(recorder.async_close())
+
+    entry.async_on_unload(_async_close_recorder)
+    return recorder
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import TYPE_CHECKING
 
 from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 
 if TYPE_CHECKING:
@@ -14,7 +15,9 @@ if TYPE_CHECKING:
 
 from .const import (
     CONF_HOST,
+    CONF_METER_INDEX,
     CONF_METER_TYPE,
+    DOMAIN,
     METER_TYPE_STROM,
 )
 
@@ -36,30 +39,16 @@ async def async_setup_utility_meters(hass: HomeAssistant, entry: ConfigEntry) ->
     - monthly (Monat)
     - yearly (Jahr)
     """
-    from .const import CONF_METER_INDEX
-
     host = entry.data[CONF_HOST]
     meter_type = entry.data[CONF_METER_TYPE]
     meter_index = entry.data[CONF_METER_INDEX]
     meter_type_name = "Strom" if meter_type == METER_TYPE_STROM else "Gas"
 
-    # Finde die Zählerstands-Entity für diesen Meter
+    # Zählerstands-Entity direkt über den Registry-Index (Plattform + unique_id) auflösen,
+    # unique_id wie in EmlogSensorEntity: emlog_{host}_{meter_type}_{meter_index}_zaehlerstand_kwh
     registry = er.async_get(hass)
-    source_entity_id = None
-
-    # Suche nach der Zählerstands-Entity (z.B. sensor.emlog_strom_1_zaehlerstand_kwh)
-    # Entity-ID Muster: sensor.emlog_{meter_type}_{meter_index}_zaehlerstand_kwh
-    meter_type_short = "strom" if meter_type == METER_TYPE_STROM else "gas"
-    expected_pattern = f"emlog_{meter_type_short}_{meter_index}_zaehlerstand_kwh"
-
-    for entity in registry.entities.values():
-        if (
-            entity.platform == "emlog"
-            and entity.config_entry_id == entry.entry_id
-            and expected_pattern in entity.entity_id
-        ):
-            source_entity_id = entity.entity_id
-            break
+    source_unique_id = f"emlog_{host}_{meter_type}_{meter_index}_zaehlerstand_kwh".replace(".", "_")
+    source_entity_id = registry.async_get_entity_id("sensor", DOMAIN, source_unique_id)
 
     if not source_entity_id:
         _LOGGER.warning(
@@ -70,16 +59,34 @@ async def async_setup_utility_meters(hass: HomeAssistant, entry: ConfigEntry) ->
 
     _LOGGER.info(f"Erstelle Utility Meter für {meter_type_name} Zähler {meter_index} Zählerstand: {source_entity_id}")
 
-    # Erstelle für jeden Zyklus einen Utility Meter
-    for cycle, cycle_name in UTILITY_METER_CYCLES.items():
-        await _async_create_utility_meter(
-            hass, entry, source_entity_id, cycle, cycle_name, meter_type_name, meter_index
+    # Vorhandene Utility Meter einmal einlesen, dann alle Zyklen parallel anlegen
+    existing = _async_utility_meter_entries(hass, entry.unique_id)
+    await asyncio.gather(
+        *(
+            _async_create_utility_meter(
+                hass, entry, existing, source_entity_id, cycle, cycle_name, meter_type_name, meter_index
+            )
+            for cycle, cycle_name in UTILITY_METER_CYCLES.items()
         )
+    )
+
+
+@callback
+def _async_utility_meter_entries(hass: HomeAssistant, unique_id_prefix: str | None) -> dict[str, ConfigEntry]:
+    """unique_id -> Config Entry aller Utility Meter, die zu einem Emlog Entry gehören."""
+    if not unique_id_prefix:
+        return {}
+    return {
+        um_entry.unique_id: um_entry
+        for um_entry in hass.config_entries.async_entries("utility_meter")
+        if um_entry.unique_id and um_entry.unique_id.startswith(unique_id_prefix)
+    }
 
 
 async def _async_create_utility_meter(
     hass: HomeAssistant,
     parent_entry: ConfigEntry,
+    existing: dict[str, ConfigEntry],
     source_entity_id: str,
     cycle: str,
     cycle_name: str,
@@ -93,11 +100,7 @@ async def _async_create_utility_meter(
     name = f"Emlog {meter_type_name} {meter_index} Verbrauch {cycle_name}"
 
     # Prüfe ob dieser Utility Meter bereits existiert
-    existing_entries = [
-        entry for entry in hass.config_entries.async_entries("utility_meter") if entry.unique_id == unique_id
-    ]
-
-    if existing_entries:
+    if unique_id in existing:
         _LOGGER.debug(f"Utility Meter {name} existiert bereits")
         return
 
@@ -137,14 +140,10 @@ async def async_remove_utility_meters(hass: HomeAssistant, entry: ConfigEntry) -
     """Entferne alle Utility Meter die zu diesem Emlog Entry gehören."""
 
     # Finde alle Utility Meter mit unserem unique_id Präfix
-    unique_id_prefix = entry.unique_id
-
-    utility_meters_to_remove = [
-        um_entry
-        for um_entry in hass.config_entries.async_entries("utility_meter")
-        if um_entry.unique_id and um_entry.unique_id.startswith(unique_id_prefix)
-    ]
+    utility_meters_to_remove = _async_utility_meter_entries(hass, entry.unique_id)
 
-    for um_entry in utility_meters_to_remove:
+    for um_entry in utility_meters_to_remove.values():
         _LOGGER.info(f"Entferne Utility Meter: {um_entry.title}")
-        await hass.config_entries.async_remove(um_entry.entry_id)
+    await asyncio.gather(
+        *(hass.config_entries.async_remove(um_entry.entry_id) for um_entry in utility_meters_to_remove.values())
+    )
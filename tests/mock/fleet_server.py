@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Asynchroner Mock für eine ganze Flotte von Emlog-Geräten (Lasttests)
+
+Jedes simulierte Gerät lauscht auf einem eigenen Port (127.0.0.1:<port>)
+und hat 1-4 Zähler-Indizes. Die Antworten werden pro Takt einmal für alle
+Zähler vorberechnet; ein Request liefert nur noch die fertigen Bytes aus.
+Latenz, HTTP-Fehler, Timeouts und ungültige Antworten sind konfigurierbar.
+
+Beispiele:
+    python fleet_server.py --hosts 200 --latency lognormal:-3,0.5 --error-rate 0.01
+    python fleet_server.py --hosts 50 --meters 4 --timeout-rate 0.002 --hosts-file hosts.txt
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+MOCK_DATA_DIR = os.environ.get("MOCK_DATA_DIR", os.path.join(os.path.dirname(__file__), "mock_data"))
+EXPORT_PATH = "/pages/getinformation.php"
+
+
+def parse_latency(spec: str):
+    """Latenzverteilung aus der Kommandozeile -> Funktion, die Sekunden liefert.
+
+    fixed:S | uniform:MIN,MAX | exponential:MEAN | lognormal:MU,SIGMA (ln Sekunden)
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",")] if params else []
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "exponential" and len(values) == 1:
+        return lambda: random.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    if kind == "lognormal" and len(values) == 2:
+        return lambda: random.lognormvariate(values[0], values[1])
+    raise argparse.ArgumentTypeError(f"Ungültige Latenzverteilung: {spec}")
+
+
+@dataclass
+class MeterState:
+    """Simulierter Zähler eines Geräts."""
+
+    template: dict
+    stand180: float
+    daily_kwh: float
+    body: bytes = b""
+
+
+@dataclass
+class FleetStats:
+    """Zähler für die Ausgabe und den /stats Endpunkt."""
+
+    started: float = field(default_factory=time.monotonic)
+    outcomes: Counter = field(default_factory=Counter)
+
+    def snapshot(self) -> dict:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        total = sum(self.outcomes.values())
+        return {"uptime_s": round(elapsed, 1), "requests": total, "rps": round(total / elapsed, 1), **self.outcomes}
+
+
+class EmlogFleet:
+    """Hosts, Zähler und Fehlerinjektion der simulierten Flotte."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.latency = parse_latency(args.latency)
+        self.stats = FleetStats()
+        self.meters: dict[int, dict[str, MeterState]] = {}  # Port -> Index -> Zähler
+
+        templates = {}
+        for meter_index in (1, 2):
+            with open(os.path.join(MOCK_DATA_DIR, f"meter_{meter_index}.json")) as f:
+                templates[meter_index] = json.load(f)
+
+        rng = random.Random(args.seed)
+        for number in range(args.hosts):
+            port = args.base_port + number
+            count = args.meters or rng.randint(1, 4)
+            self.meters[port] = {
+                str(index): MeterState(
+                    template=templates[1 if index % 2 else 2],
+                    stand180=rng.uniform(1000, 50000),
+                    daily_kwh=rng.uniform(5, 80),
+                )
+                for index in range(1, count + 1)
+            }
+        self.render()
+
+    def render(self) -> None:
+        """Berechne alle Antworten für den aktuellen Takt vor."""
+        hour = time.time() % 86400 / 3600
+        daily_factor = 0.75 + 0.25 * math.sin((hour - 6) * math.pi / 12)
+        for meters in self.meters.values():
+            for meter in meters.values():
+                increment = meter.daily_kwh * self.args.tick / 86400
+                meter.stand180 += increment
+                data = dict(meter.template)
+                data["Zaehlerstand_Bezug"] = {
+                    **meter.template["Zaehlerstand_Bezug"],
+                    "Stand180": round(meter.stand180, 4),
+                }
+                data["Wirkleistung_Bezug"] = {
+                    **meter.template["Wirkleistung_Bezug"],
+                    "Leistung170": round(meter.daily_kwh / 24 * 1000 * daily_factor * random.uniform(0.9, 1.1), 1),
+                }
+                meter.body = json.dumps(data).encode()
+
+    async def tick_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.args.tick)
+            self.render()
+
+    async def stats_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.args.stats_interval)
+            print(json.dumps(self.stats.snapshot()), flush=True)
+
+    async def handle_export(self, request: web.Request) -> web.StreamResponse:
+        port = request.transport.get_extra_info("sockname")[1]
+        meter = self.meters.get(port, {}).get(request.query.get("meterindex", "1"))
+        if meter is None or "export" not in request.query:
+            self.stats.outcomes["not_found"] += 1
+            return web.json_response({"error": "Unknown meterindex"}, status=400)
+
+        roll = random.random()
+        if roll < self.args.timeout_rate:
+            # Antwortet erst nach dem Client-Timeout (oder gar nicht, wenn der Client abbricht)
+            self.stats.outcomes["timeout"] += 1
+            await asyncio.sleep(self.args.timeout_delay)
+            return web.Response(body=meter.body, content_type="application/json")
+        roll -= self.args.timeout_rate
+
+        delay = self.latency()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if roll < self.args.error_rate:
+            self.stats.outcomes["http_error"] += 1
+            return web.Response(status=500, text="Internal Server Error")
+        roll -= self.args.error_rate
+
+        if roll < self.args.invalid_rate:
+            self.stats.outcomes["invalid"] += 1
+            return web.Response(body=meter.body[: len(meter.body) // 2], content_type="application/json")
+
+        self.stats.outcomes["ok"] += 1
+        return web.Response(body=meter.body, content_type="application/json")
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats.snapshot())
+
+
+async def run(args: argparse.Namespace) -> None:
+    fleet = EmlogFleet(args)
+
+    app = web.Application()
+    app.router.add_get(EXPORT_PATH, fleet.handle_export)
+    app.router.add_get("/stats", fleet.handle_stats)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    for port in fleet.meters:
+        await web.TCPSite(runner, args.bind, port, backlog=1024).start()
+
+    if args.hosts_file:
+        with open(args.hosts_file, "w") as f:
+            for port, meters in fleet.meters.items():
+                f.write(f"{args.bind}:{port} {','.join(meters)}\n")
+
+    meter_count = sum(len(meters) for meters in fleet.meters.values())
+    print(f"Emlog Fleet: {args.hosts} Hosts auf {args.bind}:{args.base_port}-{args.base_port + args.hosts - 1}")
+    print(f"Zähler: {meter_count}, Takt: {args.tick}s, Latenz: {args.latency}")
+    print(f"Fehler: {args.error_rate:.2%} HTTP 500, {args.timeout_rate:.2%} Timeout, {args.invalid_rate:.2%} ungültig")
+
+    try:
+        await asyncio.gather(fleet.tick_loop(), fleet.stats_loop())
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asynchroner Mock für viele Emlog-Geräte")
+    parser.add_argument("--hosts", type=int, default=100, help="Anzahl simulierter Geräte (ein Port pro Gerät)")
+    parser.add_argument("--base-port", type=int, default=18000, help="Port des ersten Geräts")
+    parser.add_argument("--bind", default="127.0.0.1", help="Adresse, auf der alle Geräte lauschen")
+    parser.add_argument("--meters", type=int, choices=[1, 2, 3, 4], help="Zähler pro Gerät (Default: zufällig 1-4)")
+    parser.add_argument(
+        "--latency", default="fixed:0", help="fixed:S | uniform:MIN,MAX | exponential:MEAN | lognormal:MU,SIGMA"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil HTTP-500-Antworten")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Anteil Requests ohne rechtzeitige Antwort")
+    parser.add_argument("--timeout-delay", type=float, default=30.0, help="Verzögerung der Timeouts in Sekunden")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="Anteil abgeschnittener JSON-Antworten")
+    parser.add_argument("--tick", type=float, default=10.0, help="Sekunden zwischen zwei Wertänderungen")
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="Sekunden zwischen zwei Statistik-Zeilen")
+    parser.add_argument("--seed", type=int, default=1, help="Seed für die Flotte (Zähler pro Gerät, Startwerte)")
+    parser.add_argument("--hosts-file", help="Schreibe 'host:port indizes' pro Gerät in diese Datei")
+    args = parser.parse_args()
+    parse_latency(args.latency)
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -51,13 +51,17 @@ def load_initial_data(meter_index):
 
 
 def save_state():
-    """Persistiert den Zustand auf Disk, damit ein Restart überlebt wird."""
+    """Persistiert den Zustand auf Disk, damit ein Restart überlebt wird.
+
+    Nur das Serialisieren läuft unter dem Lock, geschrieben wird danach.
+    """
     with STATE_LOCK:
-        try:
-            with open(STATE_FILE, "w") as f:
-                json.dump(STATE, f)
-        except Exception as e:
-            print(f"Failed to save state: {e}")
+        serialized = json.dumps(STATE)
+    try:
+        with open(STATE_FILE, "w") as f:
+            f.write(serialized)
+    except Exception as e:
+        print(f"Failed to save state: {e}")
 
 
 def load_state():
@@ -146,6 +150,7 @@ def get_information():
         return jsonify({"error": "Invalid meterindex"}), 400
 
     if "export" in request.args:
+        created = False
         with STATE_LOCK:
             data = STATE.get(meter_index)
             # Sicherstellen, dass wir immer ein Dict liefern
@@ -153,14 +158,17 @@ def get_information():
                 try:
                     data = load_initial_data(int(meter_index))
                     STATE[meter_index] = data
-                    save_state()
+                    created = True
                 except Exception as e:
                     print(f"Error loading data for meter {meter_index}: {e}")
                     return jsonify({"error": "Failed to load meter data"}), 500
-            # Erstelle eine Kopie, um Lock-Probleme zu vermeiden
-            import copy
+            # Unter dem Lock serialisieren statt deepcopy - update_loop ändert die Dicts in-place
+            body = json.dumps(data)
 
-            return jsonify(copy.deepcopy(data))
+        # Außerhalb des Locks speichern (save_state nimmt den Lock selbst, er ist nicht reentrant)
+        if created:
+            save_state()
+        return app.response_class(body, mimetype="application/json")
 
     return jsonify({"error": "Export parameter required"}), 400
 
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Spielt mitgeschnittene Emlog-Antworten wieder ab (Option "record_traces")
+
+Liest eine oder mehrere .jsonl.gz Dateien aus .storage/emlog/traces/ und
+startet pro aufgezeichnetem Host einen Port (127.0.0.1:<port>). Ein Request
+bekommt die Antwort, die zum entsprechenden Zeitpunkt der Aufzeichnung
+zuletzt gesehen wurde - in Echtzeit oder mit --speed zeitgerafft.
+Aufgezeichnete Fehler werden als HTTP 500 ausgeliefert.
+
+Beispiele:
+    python replay_server.py traces/192_168_1_10_1.jsonl.gz
+    python replay_server.py traces/*.jsonl.gz --speed 60 --loop --hosts-file hosts.txt
+"""
+
+import argparse
+import asyncio
+import base64
+import bisect
+import gzip
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+EXPORT_PATH = "/pages/getinformation.php"
+
+
+@dataclass
+class MeterTrace:
+    """Aufgezeichnete Antworten eines Zählers, nach Zeitstempel sortiert."""
+
+    timestamps: list[float] = field(default_factory=list)
+    bodies: list[bytes | None] = field(default_factory=list)
+    errors: list[str | None] = field(default_factory=list)
+
+    def at(self, ts: float) -> int:
+        """Index des letzten Datensatzes mit Zeitstempel <= ts (mindestens 0)."""
+        return max(bisect.bisect_right(self.timestamps, ts) - 1, 0)
+
+
+def load_traces(paths: list[str]) -> dict[str, dict[str, MeterTrace]]:
+    """Host -> Index -> MeterTrace aus den Mitschnitt-Dateien."""
+    records = []
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    records.append(json.loads(line))
+    records.sort(key=lambda record: record["ts"])
+
+    traces: dict[str, dict[str, MeterTrace]] = {}
+    for record in records:
+        trace = traces.setdefault(record["host"], {}).setdefault(str(record["meter_index"]), MeterTrace())
+        if "body" in record:
+            body = record["body"].encode()
+        elif "body_b64" in record:
+            body = base64.b64decode(record["body_b64"])
+        else:
+            body = None
+        trace.timestamps.append(record["ts"])
+        trace.bodies.append(body)
+        trace.errors.append(record.get("error"))
+    return traces
+
+
+class EmlogReplay:
+    """Ordnet Requests über die verstrichene (ggf. geraffte) Zeit einem Datensatz zu."""
+
+    def __init__(self, traces: dict[str, dict[str, MeterTrace]], args: argparse.Namespace):
+        self.args = args
+        self.ports = {args.base_port + number: host for number, host in enumerate(sorted(traces))}
+        self.traces = traces
+        all_traces = [trace for meters in traces.values() for trace in meters.values()]
+        self.first_ts = min(trace.timestamps[0] for trace in all_traces)
+        self.last_ts = max(trace.timestamps[-1] for trace in all_traces)
+        # Eine Schleife dauert einen mittleren Poll-Abstand länger, damit auch der letzte Datensatz drankommt
+        longest = max(all_traces, key=lambda trace: len(trace.timestamps))
+        gap = (longest.timestamps[-1] - longest.timestamps[0]) / max(len(longest.timestamps) - 1, 1)
+        self.loop_duration = self.last_ts - self.first_ts + gap
+        self.started = time.monotonic()
+        self.outcomes: Counter = Counter()
+
+    def trace_time(self) -> float:
+        """Aktueller Zeitpunkt in der Aufzeichnung."""
+        elapsed = (time.monotonic() - self.started) * self.args.speed
+        if self.args.loop and self.loop_duration > 0:
+            elapsed %= self.loop_duration
+        return self.first_ts + elapsed
+
+    async def handle_export(self, request: web.Request) -> web.Response:
+        port = request.transport.get_extra_info("sockname")[1]
+        trace = self.traces.get(self.ports.get(port, ""), {}).get(request.query.get("meterindex", "1"))
+        if trace is None or "export" not in request.query:
+            self.outcomes["not_found"] += 1
+            return web.json_response({"error": "Unknown meterindex"}, status=400)
+
+        index = trace.at(self.trace_time())
+        body = trace.bodies[index]
+        if body is None:
+            self.outcomes["error"] += 1
+            return web.Response(status=500, text=trace.errors[index] or "Internal Server Error")
+        self.outcomes["ok"] += 1
+        return web.Response(body=body, content_type="application/json")
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "trace_time": self.trace_time(),
+                "progress": round((self.trace_time() - self.first_ts) / max(self.last_ts - self.first_ts, 1e-9), 4),
+                **self.outcomes,
+            }
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    traces = load_traces(args.traces)
+    if not traces:
+        raise SystemExit("Keine Datensätze in den Mitschnitten gefunden")
+    replay = EmlogReplay(traces, args)
+
+    app = web.Application()
+    app.router.add_get(EXPORT_PATH, replay.handle_export)
+    app.router.add_get("/stats", replay.handle_stats)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    for port in replay.ports:
+        await web.TCPSite(runner, args.bind, port).start()
+
+    if args.hosts_file:
+        with open(args.hosts_file, "w") as f:
+            for port, host in replay.ports.items():
+                f.write(f"{args.bind}:{port} {','.join(traces[host])}\n")
+
+    duration = replay.last_ts - replay.first_ts
+    print(f"Emlog Replay: {sum(len(meters) for meters in traces.values())} Zähler, {duration:.0f}s Aufzeichnung")
+    for port, host in replay.ports.items():
+        print(f"  {args.bind}:{port} <- {host} (Index {', '.join(traces[host])})")
+    print(f"Geschwindigkeit: {args.speed}x, Schleife: {'ja' if args.loop else 'nein'}")
+
+    try:
+        while args.loop or replay.trace_time() < replay.last_ts:
+            await asyncio.sleep(1)
+        print("Ende der Aufzeichnung erreicht, letzte Antworten werden weiter ausgeliefert")
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spielt mitgeschnittene Emlog-Antworten wieder ab")
+    parser.add_argument("traces", nargs="+", help="Mitschnitt-Dateien (.jsonl.gz)")
+    parser.add_argument("--base-port", type=int, default=18000, help="Port des ersten aufgezeichneten Hosts")
+    parser.add_argument("--bind", default="127.0.0.1", help="Adresse, auf der alle Hosts lauschen")
+    parser.add_argument("--speed", type=float, default=1.0, help="Zeitraffer-Faktor (60 = eine Stunde pro Minute)")
+    parser.add_argument("--loop", action="store_true", help="Nach dem Ende von vorn beginnen")
+    parser.add_argument("--hosts-file", help="Schreibe 'host:port indizes' pro Host in diese Datei")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed muss größer als 0 sein")
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Benchmarks für den Hot Path der Emlog-Integration (Code pro Poll)
+
+Deckt den Code ab, der bei jedem Poll läuft - zehntausende Male pro Tag
+und Zähler:
+  - EmlogCoordinator._async_update_data komplett (HTTP gegen einen lokalen
+    Ersatz-Server, geänderte und unveränderte Payload)
+  - EmlogSensorEntity.native_value und suggested_display_precision für jeden
+    Sensor-Schlüssel (Strom inkl. Einspeisung, Gas)
+  - die Gas-Umrechnung m³ -> kWh mit warmem und kaltem Settings-Cache
+  - EmlogCostSensor.native_value und die Neuberechnung der Kosten-Engine
+
+Jeder Benchmark meldet die mediane Zeit pro Aufruf und den Spitzenspeicher,
+den ein einzelner Aufruf belegt (tracemalloc). Allokationen sind
+deterministisch genug für einen engen Vergleich in CI, die Laufzeit nur mit
+großzügigem Faktor.
+
+Beispiele:
+    python3 tools/scripts/benchmark_hot_path.py
+    python3 tools/scripts/benchmark_hot_path.py --filter gas --repeat 9
+    python3 tools/scripts/benchmark_hot_path.py --save-baseline tools/scripts/benchmark_hot_path_baseline.json
+    python3 tools/scripts/benchmark_hot_path.py --compare tools/scripts/benchmark_hot_path_baseline.json
+
+Benötigt eine Python-Umgebung mit installiertem homeassistant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from benchmark_startup import MOCK_DATA, REPO_ROOT, make_hass
+
+GAS_MOCK_DATA = REPO_ROOT / "tests" / "mock" / "mock_data" / "meter_2.json"
+DEFAULT_BASELINE = Path(__file__).with_name("benchmark_hot_path_baseline.json")
+# Allokations-Unterschiede unter so vielen Bytes gelten nie als Regression
+ALLOC_SLACK_BYTES = 256
+# Zeiten unter einer Mikrosekunde schwanken stärker als der Faktor; so viel wird immer toleriert
+TIME_SLACK_US = 1.0
+
+
+class BenchmarkSuite:
+    """Sammelt Benchmarks und ihre Ergebnisse."""
+
+    def __init__(self, number: int, repeat: int, name_filter: str | None):
+        self.number = number
+        self.repeat = repeat
+        self.name_filter = name_filter
+        self.results: dict[str, dict] = {}
+
+    def _selected(self, name: str) -> bool:
+        return not self.name_filter or self.name_filter in name
+
+    def run(self, name: str, func: Callable[[], object], number: int | None = None) -> None:
+        """Benchmark einer synchronen Funktion."""
+        if not self._selected(name):
+            return
+        number = number or self.number
+        func()  # Caches aufwärmen (Settings, verzögert aufgelöste Attribute)
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter() - started) / number)
+
+        tracemalloc.start()
+        func()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self._record(name, timings, peak - before)
+
+    async def run_async(self, name: str, func: Callable[[], Awaitable[object]], number: int) -> None:
+        """Benchmark einer Coroutine-Funktion (nacheinander awaited)."""
+        if not self._selected(name):
+            return
+        await func()
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                await func()
+            timings.append((time.perf_counter() - started) / number)
+
+        tracemalloc.start()
+        await func()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self._record(name, timings, peak - before)
+
+    def _record(self, name: str, timings: list[float], alloc_bytes: int) -> None:
+        result = {"us": round(statistics.median(timings) * 1e6, 3), "alloc_bytes": max(alloc_bytes, 0)}
+        self.results[name] = result
+        print(f"   {name:<70} {result['us']:>10.3f} {result['alloc_bytes']:>9}", flush=True)
+
+
+async def _start_stand_in_server(bodies: list[bytes]):
+    """Lokaler Emlog-Ersatz, antwortet reihum mit den übergebenen Bodies. Liefert (runner, host)."""
+    from aiohttp import web
+
+    counter = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal counter
+        counter += 1
+        return web.Response(body=bodies[counter % len(bodies)], content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/pages/getinformation.php", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+def _varied_body(body: bytes) -> bytes:
+    """Gleicher Export mit leicht anderem Stand180/Leistung170 (umgeht die Abkürzung für unveränderte Payloads)."""
+    data = json.loads(body)
+    data["Zaehlerstand_Bezug"]["Stand180"] += 0.001
+    data["Wirkleistung_Bezug"]["Leistung170"] += 1
+    return json.dumps(data).encode()
+
+
+def _make_entry(meter_type: str, meter_index: int, host: str, options: dict | None = None):
+    from homeassistant.config_entries import ConfigEntry
+
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain="emlog",
+        title=f"Emlog {meter_type} {meter_index}",
+        unique_id=f"emlog_{host}_{meter_type}_{meter_index}",
+        data={"host": host, "meter_type": meter_type, "meter_index": meter_index, "price_kwh": 0.3},
+        source="user",
+        options=options or {},
+    )
+
+
+async def run_benchmarks(suite: BenchmarkSuite, update_number: int) -> None:
+    from custom_components.emlog.coordinator import EmlogCoordinator
+    from custom_components.emlog.sensor import (
+        COMMON_SENSORS,
+        GAS_SENSORS,
+        STROM_FEED_IN_SENSORS,
+        STROM_SENSORS,
+        EmlogSensorEntity,
+    )
+    from custom_components.emlog.settings import EmlogEntrySettings
+    from custom_components.emlog.template import EmlogCostEngine, EmlogCostSensor
+
+    strom_body = MOCK_DATA.read_bytes()
+    gas_body = GAS_MOCK_DATA.read_bytes()
+
+    with tempfile.TemporaryDirectory(prefix="emlog-bench-") as config_dir:
+        os.makedirs(os.path.join(config_dir, "custom_components"))
+        hass = await make_hass(config_dir)
+        changed_runner, changed_host = await _start_stand_in_server([strom_body, _varied_body(strom_body)])
+        unchanged_runner, unchanged_host = await _start_stand_in_server([strom_body])
+        try:
+            # 1. Coordinator komplett: HTTP-Abruf, Fingerprint, Parsen, EmlogData
+            for label, host in (("changed", changed_host), ("unchanged", unchanged_host)):
+                coordinator = EmlogCoordinator(hass, host, "strom", 1, 30, _make_entry("strom", 1, host))
+                detach = coordinator.async_attach()
+
+                async def update(coordinator=coordinator):
+                    coordinator.data = await coordinator._async_update_data()
+
+                await suite.run_async(f"coordinator._async_update_data[{label}]", update, update_number)
+                detach()
+
+            # 2. Sensor-Properties für jeden Schlüssel
+            hass.states.async_set("input_number.emlog_brennwert", "11.2")
+            meters = (
+                ("strom", STROM_SENSORS + STROM_FEED_IN_SENSORS, strom_body, {}),
+                ("gas", GAS_SENSORS, gas_body, {"gas_brennwert_helper": "input_number.emlog_brennwert"}),
+            )
+            for meter_type, definitions, body, options in meters:
+                host = f"bench-{meter_type}.local"
+                entry = _make_entry(meter_type, 1, host, options)
+                settings = EmlogEntrySettings(hass, entry)
+                coordinator = EmlogCoordinator(hass, host, meter_type, 1, 30, entry)
+                coordinator.data = coordinator.async_process_export(body, None)
+                for definition in COMMON_SENSORS + definitions:
+                    entity = EmlogSensorEntity(coordinator, host, meter_type, 1, meter_type, definition, settings)
+                    suite.run(f"sensor[{meter_type}.{definition.key}].native_value", lambda e=entity: e.native_value)
+                    suite.run(
+                        f"sensor[{meter_type}.{definition.key}].suggested_display_precision",
+                        lambda e=entity: e.suggested_display_precision,
+                    )
+
+                if meter_type == "gas":
+                    # 3. m³ -> kWh: mit warmem Cache und mit Helper-State + Options-Auflösung bei jedem Aufruf
+                    gas_kwh = next(definition for definition in definitions if definition.key == "zaehlerstand_kwh")
+                    entity = EmlogSensorEntity(coordinator, host, meter_type, 1, meter_type, gas_kwh, settings)
+                    suite.run("gas.kwh_conversion[warm]", lambda e=entity: e.native_value)
+
+                    def cold(e=entity, s=settings):
+                        s._cache.clear()
+                        return e.native_value
+
+                    suite.run("gas.kwh_conversion[cold]", cold)
+
+            # 4. Kostensensor und Neuberechnung der Engine
+            for period, value in (("tag", "12.345"), ("monat", "234.5"), ("jahr", "2890.1")):
+                hass.states.async_set(f"sensor.emlog_strom_1_verbrauch_{period}", value)
+            entry = _make_entry("strom", 1, "bench-cost.local", {"base_price_strom": 12.0})
+            engine = EmlogCostEngine(hass, "strom", 1, EmlogEntrySettings(hass, entry))
+            engine.async_start()
+            sensor = EmlogCostSensor(engine, "bench-cost.local", "strom", 1, "jahr")
+            suite.run("cost[jahr].native_value", lambda: sensor.native_value)
+            suite.run("cost_engine.async_recalculate", engine.async_recalculate)
+            engine.async_stop()
+        finally:
+            await changed_runner.cleanup()
+            await unchanged_runner.cleanup()
+            await hass.async_stop(force=True)
+
+
+def compare(results: dict, baseline: dict, max_slowdown: float, max_alloc_growth: float) -> list[str]:
+    """Regressionen der Ergebnisse gegenüber der Baseline."""
+    regressions = []
+    print(
+        f"\n📏 Gegen Baseline (max. Verlangsamung x{max_slowdown} + {TIME_SLACK_US} µs, "
+        f"max. Allokations-Zuwachs {max_alloc_growth:.0%} + {ALLOC_SLACK_BYTES} B)"
+    )
+    for name, result in results.items():
+        if (base := baseline.get(name)) is None:
+            print(f"   {name:<70} neu")
+            continue
+        ratio = result["us"] / base["us"] if base["us"] else 1.0
+        alloc_limit = base["alloc_bytes"] * (1 + max_alloc_growth) + ALLOC_SLACK_BYTES
+        problems = []
+        if result["us"] > base["us"] * max_slowdown + TIME_SLACK_US:
+            problems.append(f"Zeit x{ratio:.2f}")
+        if result["alloc_bytes"] > alloc_limit:
+            problems.append(f"alloc {base['alloc_bytes']} -> {result['alloc_bytes']} B")
+        print(f"   {name:<70} x{ratio:>5.2f} {'❌ ' + ', '.join(problems) if problems else '✓'}")
+        if problems:
+            regressions.append(f"{name}: {', '.join(problems)}")
+    for name in baseline.keys() - results.keys():
+        print(f"   {name:<70} fehlt")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot Path der Emlog-Integration (Code pro Poll) messen")
+    parser.add_argument("--number", type=int, default=5000, help="Aufrufe pro Wiederholung (synchrone Benchmarks)")
+    parser.add_argument("--update-number", type=int, default=200, help="Aufrufe pro Wiederholung (Coordinator-Updates)")
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen; gemeldet wird der Median")
+    parser.add_argument("--filter", help="Nur Benchmarks, deren Name diesen Text enthält")
+    parser.add_argument("--json", type=Path, help="Ergebnisse in diese Datei schreiben")
+    parser.add_argument("--save-baseline", type=Path, help="Ergebnisse als neue Baseline schreiben")
+    parser.add_argument("--compare", type=Path, nargs="?", const=DEFAULT_BASELINE, help="Mit Baseline vergleichen")
+    parser.add_argument("--max-slowdown", type=float, default=2.0, help="Erlaubte Zeit pro Aufruf relativ zur Baseline")
+    parser.add_argument(
+        "--max-alloc-growth", type=float, default=0.25, help="Erlaubter Allokations-Zuwachs (0.25 = +25 %%)"
+    )
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    import logging
+
+    from homeassistant.const import __version__ as ha_version
+
+    logging.basicConfig(level=logging.ERROR)
+
+    suite = BenchmarkSuite(args.number, args.repeat, args.filter)
+    print(f"🔥 Hot Path (Median aus {args.repeat} Wiederholungen)")
+    print(f"   {'Benchmark':<70} {'µs/Aufruf':>10} {'Alloc B':>9}")
+    asyncio.run(run_benchmarks(suite, args.update_number))
+
+    report = {
+        "python": platform.python_version(),
+        "homeassistant": ha_version,
+        "results": suite.results,
+    }
+    for path in (args.json, args.save_baseline):
+        if path:
+            path.write_text(json.dumps(report, indent=2) + "\n")
+            print(f"\n✓ Ergebnisse geschrieben nach {path}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("homeassistant") != ha_version or baseline.get("python") != report["python"]:
+            print(
+                f"\n⚠️  Baseline wurde mit Python {baseline.get('python')} / Home Assistant "
+                f"{baseline.get('homeassistant')} aufgenommen, dieser Lauf nutzt {report['python']} / {ha_version}"
+            )
+        expected = {name: result for name, result in baseline["results"].items() if suite._selected(name)}
+        regressions = compare(suite.results, expected, args.max_slowdown, args.max_alloc_growth)
+        if regressions:
+            print(f"\n❌ {len(regressions)} Regression(en) gegenüber {args.compare}")
+            sys.exit(1)
+        print(f"\n✓ Keine Regressionen gegenüber {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
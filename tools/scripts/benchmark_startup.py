@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Startzeit-Messung der Emlog-Integration
+
+Misst
+  1. die Import-Zeit jedes Integrations-Moduls (frischer Interpreter pro
+     Modul, Home Assistant Core bereits importiert - das zahlt HA zusätzlich)
+  2. die Laufzeit von async_setup_entry für 1, 10 und 100 simulierte Config
+     Entries gegen lokale Mock-Emlog-Server (4 Zähler pro Mock-Host)
+
+Beispiele:
+    python3 tools/scripts/benchmark_startup.py
+    python3 tools/scripts/benchmark_startup.py --entries 1 10 --fast-start --json startup.json
+
+Benötigt eine Python-Umgebung mit installiertem homeassistant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+MOCK_DATA = REPO_ROOT / "tests" / "mock" / "mock_data" / "meter_1.json"
+
+IMPORT_MODULES = ["sensor", "config_flow", "coordinator", "template", "utility_meter"]
+METERS_PER_HOST = 4
+
+# Wird im messenden Interpreter vor dem Timer importiert (lädt HA ohnehin immer)
+IMPORT_PRELUDE = "import homeassistant.core, homeassistant.helpers.entity, homeassistant.config_entries"
+
+
+def measure_import(module: str, repeat: int) -> dict:
+    """Import-Zeit von custom_components.emlog.<module> in ms (Median über frische Interpreter).
+
+    "self" ist das Modul selbst, "total" enthält alles, was es zusätzlich
+    nachlädt und Home Assistant Core noch nicht geladen hatte (aus -X importtime).
+    """
+    name = f"custom_components.emlog.{module}"
+    totals, selfs = [], []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"{IMPORT_PRELUDE}\nimport {name}"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            # Zeilenformat von -X importtime: "import time:       self [us] |  cumulative | imported package"
+            parts = [part.strip() for part in line.removeprefix("import time:").split("|")]
+            if len(parts) == 3 and parts[2] == name:
+                selfs.append(int(parts[0]) / 1000)
+                totals.append(int(parts[1]) / 1000)
+    return {
+        "module": module,
+        "self_ms": round(statistics.median(selfs), 2),
+        "total_ms": round(statistics.median(totals), 2),
+    }
+
+
+async def _start_mock_servers(count: int) -> tuple[list, list[str]]:
+    """Starte count Mock-Emlog-Hosts auf freien Ports; liefert (runners, hosts)."""
+    from aiohttp import web
+
+    body = MOCK_DATA.read_bytes()
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=body, content_type="application/json")
+
+    runners, hosts = [], []
+    for _ in range(count):
+        app = web.Application()
+        app.router.add_get("/pages/getinformation.php", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        runners.append(runner)
+        hosts.append(f"127.0.0.1:{port}")
+    return runners, hosts
+
+
+async def make_hass(config_dir: str):
+    """Minimale Home-Assistant-Instanz mit geladenen Config Entries und Registries."""
+    from homeassistant import config_entries, loader
+    from homeassistant.core import CoreState, HomeAssistant
+    from homeassistant.helpers import (
+        area_registry,
+        device_registry,
+        entity,
+        entity_registry,
+        restore_state,
+        translation,
+    )
+    from homeassistant.setup import async_setup_component
+
+    hass = HomeAssistant(config_dir)
+    hass.config.set_time_zone("Europe/Berlin")
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    if hasattr(translation, "async_setup"):
+        # Ab 2024.3 legt der HA-Start den Übersetzungs-Cache vor dem ersten Setup an
+        translation.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await area_registry.async_load(hass)
+    await device_registry.async_load(hass)
+    await entity_registry.async_load(hass)
+    await restore_state.async_load(hass)
+    entity.async_setup(hass)
+    hass.state = CoreState.running
+    await async_setup_component(hass, "homeassistant", {})
+    return hass
+
+
+async def measure_setup(entries: int, options: dict) -> dict:
+    """Laufzeit von async_setup_entry für entries Config Entries (ms)."""
+    from homeassistant.config_entries import ConfigEntry
+
+    with tempfile.TemporaryDirectory(prefix="emlog-bench-") as config_dir:
+        os.makedirs(os.path.join(config_dir, "custom_components"))
+        os.symlink(REPO_ROOT / "custom_components" / "emlog", os.path.join(config_dir, "custom_components", "emlog"))
+
+        runners, hosts = await _start_mock_servers((entries + METERS_PER_HOST - 1) // METERS_PER_HOST)
+        hass = await make_hass(config_dir)
+        durations = []
+        try:
+            started = time.perf_counter()
+            for number in range(entries):
+                host = hosts[number // METERS_PER_HOST]
+                meter_index = number % METERS_PER_HOST + 1
+                entry = ConfigEntry(
+                    version=1,
+                    minor_version=1,
+                    domain="emlog",
+                    title=f"Emlog {number}",
+                    unique_id=f"emlog_{host}_strom_{meter_index}",
+                    data={"host": host, "meter_type": "strom", "meter_index": meter_index, "price_kwh": 0.3},
+                    source="user",
+                    options=dict(options),
+                )
+                entry_started = time.perf_counter()
+                await hass.config_entries.async_add(entry)
+                durations.append((time.perf_counter() - entry_started) * 1000)
+            total = (time.perf_counter() - started) * 1000
+            await hass.async_block_till_done()
+        finally:
+            await hass.async_stop(force=True)
+            for runner in runners:
+                await runner.cleanup()
+
+    durations.sort()
+    return {
+        "entries": entries,
+        "total_ms": round(total, 1),
+        "mean_ms": round(statistics.fmean(durations), 2),
+        "p95_ms": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 2),
+        "max_ms": round(durations[-1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import- und Setup-Zeit der Emlog-Integration messen")
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 10, 100], help="Anzahl einzurichtender Entries")
+    parser.add_argument("--repeat", type=int, default=5, help="Frische Interpreter pro Modul-Import")
+    parser.add_argument("--fast-start", action="store_true", help="Option fast_start aktivieren")
+    parser.add_argument(
+        "--consumption-source",
+        choices=["utility_meter", "native"],
+        default="native",
+        help="utility_meter legt pro Entry zusätzlich 3 utility_meter Entries an (benötigt croniter)",
+    )
+    parser.add_argument("--skip-imports", action="store_true", help="Nur die Setup-Zeit messen")
+    parser.add_argument("--json", type=Path, help="Ergebnisse in diese Datei schreiben")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    results: dict = {"imports": [], "setup": []}
+
+    if not args.skip_imports:
+        print("📦 Import-Zeit (ms, Median)")
+        print(f"   {'Modul':<15} {'self':>8} {'total':>8}")
+        for module in IMPORT_MODULES:
+            result = measure_import(module, args.repeat)
+            results["imports"].append(result)
+            print(f"   {module:<15} {result['self_ms']:>8.2f} {result['total_ms']:>8.2f}")
+
+    options = {"fast_start": args.fast_start, "consumption_source": args.consumption_source}
+    print(f"\n⏱️  Laufzeit von async_setup_entry (ms) {options}")
+    print(f"   {'Entries':>7} {'gesamt':>9} {'Mittel':>8} {'p95':>8} {'max':>8}")
+    for entries in args.entries:
+        result = asyncio.run(measure_setup(entries, options))
+        results["setup"].append(result)
+        print(
+            f"   {result['entries']:>7} {result['total_ms']:>9.1f} {result['mean_ms']:>8.2f}"
+            f" {result['p95_ms']:>8.2f} {result['max_ms']:>8.2f}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\n✓ Ergebnisse geschrieben nach {args.json}")
+
+
+if __name__ == "__main__":
+    main()
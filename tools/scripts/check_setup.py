@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Setup-Prüfung der Emlog-Integration.
+
+Richtet zwei Config Entries gegen einen lokalen Mock-Server ein (echtes
+async_setup_entry über die Config-Entry-Verwaltung von Home Assistant) und
+prüft, dass alle erwarteten Entities in der Entity-Registry stehen und
+einen State haben - auch die, die nicht direkt aus Gerätewerten entstehen
+(Kosten, Abschlag, dynamische Kosten aus einer Preis-CSV).
+
+Aufruf:
+    python3 tools/scripts/check_setup.py
+
+Beendet sich mit Exit-Code 1, wenn eine Entity fehlt.
+Benötigt eine Python-Umgebung mit installiertem homeassistant.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+
+from benchmark_startup import REPO_ROOT, _start_mock_servers, make_hass
+
+METER_TYPE = "strom"
+PRICE_CSV = "emlog_preise.csv"
+
+# Erwartete Entities: Schlüssel der Unique ID nach "emlog_<host>_<typ>_<index>_"
+EXPECTED_KEYS = [
+    "zaehlerstand_kwh",
+    "verbrauch_tag",
+    "verbrauch_monat",
+    "verbrauch_jahr",
+    "kosten_tag",
+    "kosten_monat",
+    "kosten_jahr",
+    "advance_total",
+    "advance_difference",
+]
+DYNAMIC_KEYS = ["kosten_dynamisch_tag", "kosten_dynamisch_monat", "kosten_dynamisch_jahr"]
+
+# Zähler 1 ohne, Zähler 2 mit dynamischem Preis: (Optionen, erwartete Schlüssel)
+METERS = {
+    1: ({"consumption_source": "native"}, EXPECTED_KEYS),
+    2: (
+        {"consumption_source": "native", "dynamic_price_source": "csv", "dynamic_price_csv": PRICE_CSV},
+        EXPECTED_KEYS + DYNAMIC_KEYS,
+    ),
+}
+
+
+async def check_setup() -> list[str]:
+    """Richte den Entry ein und liefere die fehlenden Entities (leer, wenn alles da ist)."""
+    from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+    from homeassistant.helpers import entity_registry as er
+
+    with tempfile.TemporaryDirectory(prefix="emlog-check-") as config_dir:
+        os.makedirs(os.path.join(config_dir, "custom_components"))
+        os.symlink(REPO_ROOT / "custom_components" / "emlog", os.path.join(config_dir, "custom_components", "emlog"))
+        with open(os.path.join(config_dir, PRICE_CSV), "w", encoding="utf-8") as csv_file:
+            csv_file.write("Zeitpunkt;Preis\n2020-01-01T00:00:00+01:00;0,28\n")
+
+        runners, hosts = await _start_mock_servers(1)
+        hass = await make_hass(config_dir)
+        try:
+            host = hosts[0]
+            registry = er.async_get(hass)
+            missing = []
+            for meter_index, (options, keys) in METERS.items():
+                entry = ConfigEntry(
+                    version=1,
+                    minor_version=1,
+                    domain="emlog",
+                    title=f"Emlog Setup-Prüfung {meter_index}",
+                    unique_id=f"emlog_{host}_{METER_TYPE}_{meter_index}",
+                    data={"host": host, "meter_type": METER_TYPE, "meter_index": meter_index, "price_kwh": 0.3},
+                    source="user",
+                    options=options,
+                )
+                await hass.config_entries.async_add(entry)
+                await hass.async_block_till_done()
+
+                if entry.state is not ConfigEntryState.LOADED:
+                    missing.append(f"Zähler {meter_index}: Config Entry nicht geladen ({entry.state})")
+                    continue
+
+                prefix = f"emlog_{host}_{METER_TYPE}_{meter_index}_".replace(".", "_")
+                for key in keys:
+                    entity_id = registry.async_get_entity_id("sensor", "emlog", prefix + key)
+                    if entity_id is None:
+                        missing.append(f"Zähler {meter_index}: {key} (nicht in der Entity-Registry)")
+                    elif hass.states.get(entity_id) is None:
+                        missing.append(f"Zähler {meter_index}: {key} ({entity_id} ohne State)")
+            return missing
+        finally:
+            await hass.async_stop(force=True)
+            for runner in runners:
+                await runner.cleanup()
+
+
+def main():
+    """Main entry point."""
+    sys.path.insert(0, str(REPO_ROOT))
+    missing = asyncio.run(check_setup())
+    if missing:
+        print("✗ Fehlende Entities nach dem Setup:")
+        for item in missing:
+            print(f"   {item}")
+        sys.exit(1)
+    print(f"✓ Alle {sum(len(keys) for _, keys in METERS.values())} erwarteten Entities nach dem Setup vorhanden")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Zeitgeraffte Simulation der Emlog-Integration mit simulierter Uhr
+
+Richtet echte Config Entries ein (Coordinator, Sensor-Plattform mit
+Kosten-Engine, integrierter Verbrauch oder Utility Meter) und lässt sie
+gegen simulierte Emlog-Geräte im selben Prozess laufen. Sobald die Event
+Loop nichts mehr zu tun hat, springt die Uhr zum nächsten Timer. Ein Jahr
+mit 30-s-Polls dauert so nur Minuten und durchläuft dabei die nächtlichen
+Rücksetzungen von Kwh180, Tarifwechsel, Verbrauchs-Resets und Kostensummen.
+
+Ausgabe
+  - Durchsatz (Polls/s), Event-Loop-Zeit pro Poll und pro Host-Zyklus (p50, p99)
+  - beobachtete Resets von Kwh180 / Verbrauch im Vergleich zu den simulierten Mitternächten
+  - Endstände aller Zähler-, Verbrauchs- und Kostensensoren neben der Energie,
+    die die simulierten Geräte tatsächlich gezählt haben
+
+Beispiele:
+    python3 tools/scripts/simulate_year.py
+    python3 tools/scripts/simulate_year.py --days 31 --meters 4 --error-rate 0.01 --json sim.json
+    python3 tools/scripts/simulate_year.py --consumption-source utility_meter   # benötigt croniter
+
+Benötigt eine Python-Umgebung mit installiertem homeassistant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import types
+from array import array
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from benchmark_startup import REPO_ROOT, make_hass
+
+MOCK_DATA_DIR = REPO_ROOT / "tests" / "mock" / "mock_data"
+TIME_ZONE = "Europe/Berlin"
+HOST = "emlog-sim.local"
+MONOTONIC_BASE = 1_000_000.0
+
+
+class SimulatedClock:
+    """Wand- und Monotonic-Uhr, die nur weiterlaufen, wenn die Simulation sie vorstellt."""
+
+    def __init__(self, start: datetime):
+        self._start_ts = start.timestamp()
+        self.elapsed = 0.0
+
+    def time(self) -> float:
+        return self._start_ts + self.elapsed
+
+    def monotonic(self) -> float:
+        return MONOTONIC_BASE + self.elapsed
+
+    def utcnow(self) -> datetime:
+        return datetime.fromtimestamp(self.time(), timezone.utc)
+
+    def now(self, time_zone=None) -> datetime:
+        from homeassistant.util import dt as dt_util
+
+        return datetime.fromtimestamp(self.time(), time_zone or dt_util.DEFAULT_TIME_ZONE)
+
+    def advance_to(self, monotonic: float) -> None:
+        self.elapsed = max(self.elapsed, monotonic - MONOTONIC_BASE)
+
+
+class ClockedTimeModule(types.ModuleType):
+    """Ersatz für das time-Modul in gepatchten Modulen (time/monotonic sind simuliert)."""
+
+    def __init__(self, clock: SimulatedClock):
+        super().__init__("time")
+        self.time = clock.time
+        self.monotonic = clock.monotonic
+
+    def __getattr__(self, name: str):
+        return getattr(time, name)
+
+
+class SimulatedEventLoop(asyncio.SelectorEventLoop):
+    """Event Loop, deren Timer auf der simulierten Uhr laufen."""
+
+    def __init__(self, clock: SimulatedClock):
+        super().__init__()
+        self.clock = clock
+
+    def time(self) -> float:
+        return self.clock.monotonic()
+
+    def next_timer(self) -> float | None:
+        """Fälligkeit des frühesten noch ausstehenden Timers."""
+        scheduled = self._scheduled
+        if scheduled and not scheduled[0].cancelled():
+            return scheduled[0].when()
+        return min((handle.when() for handle in scheduled if not handle.cancelled()), default=None)
+
+
+class SimulatedDevice:
+    """Ein Zähler-Index eines simulierten Emlog-Geräts.
+
+    Integriert zwischen zwei Requests ein Tageslastprofil in Stand180 und
+    setzt Kwh180/Betrag180 um Mitternacht (Ortszeit) zurück wie das echte Gerät.
+    """
+
+    def __init__(self, clock: SimulatedClock, template: dict, daily_kwh: float, price: float, seed: int):
+        self.clock = clock
+        self.template = template
+        self.price = price
+        self.rng = random.Random(seed)
+        self.mean_w = daily_kwh * 1000 / 24
+        self.stand = float(template["Zaehlerstand_Bezug"]["Stand180"])
+        self.start_stand = self.stand
+        self.day_start_stand = self.stand
+        self.power = self.mean_w
+        self.last_ts = clock.time()
+        self.day: date | None = None  # Beim ersten Request gesetzt (dann ist die HA-Zeitzone konfiguriert)
+        self.midnights = 0
+
+    @staticmethod
+    def _local(ts: float) -> datetime:
+        from homeassistant.util import dt as dt_util
+
+        return datetime.fromtimestamp(ts, dt_util.DEFAULT_TIME_ZONE)
+
+    def render(self) -> bytes:
+        now = self.clock.time()
+        local = self._local(now)
+        # Energie seit dem letzten Request mit der seitdem bezogenen Leistung (W·s -> kWh)
+        self.stand += self.power * (now - self.last_ts) / 3_600_000
+        self.last_ts = now
+        if self.day is None:
+            self.day = local.date()
+        elif local.date() != self.day:
+            self.midnights += (local.date() - self.day).days
+            self.day = local.date()
+            self.day_start_stand = self.stand
+
+        hour = local.hour + local.minute / 60
+        profile = 0.5 + 1.0 * max(0.0, math.sin((hour - 6) * math.pi / 16))
+        self.power = self.mean_w * profile * self.rng.uniform(0.9, 1.1)
+
+        kwh = self.stand - self.day_start_stand
+        template = self.template
+        data = {
+            **template,
+            "Zaehlerstand_Bezug": {**template["Zaehlerstand_Bezug"], "Stand180": round(self.stand, 4)},
+            "Wirkleistung_Bezug": {**template["Wirkleistung_Bezug"], "Leistung170": round(self.power, 1)},
+            "Kwh_Bezug": {**template["Kwh_Bezug"], "Kwh180": round(kwh, 3)},
+            "Betrag_Bezug": {**template["Betrag_Bezug"], "Betrag180": round(kwh * self.price, 2)},
+        }
+        return json.dumps(data).encode()
+
+
+class SimulatedFleet:
+    """Simulierte Geräte und der EmlogApiClient-Ersatz, der aus ihnen antwortet."""
+
+    def __init__(self, clock: SimulatedClock, args: argparse.Namespace):
+        template_file = "meter_1.json" if args.meter_type == "strom" else "meter_2.json"
+        template = json.loads((MOCK_DATA_DIR / template_file).read_text())
+        self.devices = {
+            meter_index: SimulatedDevice(clock, template, args.daily_kwh, args.price, args.seed + meter_index)
+            for meter_index in range(1, args.meters + 1)
+        }
+        self.error_rate = args.error_rate
+        self.rng = random.Random(args.seed)
+        self.requests = 0
+        self.errors = 0
+
+    def client_factory(self, hass, host: str, connect_timeout: float = 0.0, read_timeout: float = 0.0):
+        """Ersatz für custom_components.emlog.coordinator.EmlogApiClient."""
+        from custom_components.emlog.api import EmlogClientStats, EmlogHttpError
+
+        fleet = self
+
+        class SimulatedEmlogClient:
+            def __init__(self):
+                self.host = host
+                self.stats = EmlogClientStats()
+
+            def set_timeouts(self, connect_timeout: float, read_timeout: float) -> None:
+                pass
+
+            def set_keepalive_timeout(self, keepalive_timeout: float) -> None:
+                pass
+
+            async def async_get_export_raw(self, meter_index: int) -> bytes:
+                fleet.requests += 1
+                self.stats.requests += 1
+                if fleet.error_rate and fleet.rng.random() < fleet.error_rate:
+                    fleet.errors += 1
+                    raise EmlogHttpError(500)
+                return fleet.devices[meter_index].render()
+
+            async def async_close(self) -> None:
+                pass
+
+        return SimulatedEmlogClient()
+
+
+def clock_patches(clock: SimulatedClock, fleet: SimulatedFleet) -> list:
+    """Alles, was die aktuelle Zeit liest, dazu der HTTP-Client des Host-Coordinators."""
+    clocked_time = ClockedTimeModule(clock)
+    return [
+        patch("homeassistant.util.dt.utcnow", clock.utcnow),
+        patch("homeassistant.util.dt.now", clock.now),
+        patch("homeassistant.helpers.event.time_tracker_utcnow", clock.utcnow),
+        patch("homeassistant.helpers.event.time_tracker_timestamp", clock.time),
+        patch("homeassistant.helpers.event.time", clocked_time),
+        patch("homeassistant.helpers.update_coordinator.utcnow", clock.utcnow),
+        patch("homeassistant.core.time", clocked_time),
+        patch("custom_components.emlog.coordinator.time", clocked_time),
+        patch("custom_components.emlog.coordinator.EmlogApiClient", fleet.client_factory),
+    ]
+
+
+class ResetCounter:
+    """Zählt Rücksprünge eines Sensor-States (Tageswerte, die auf ~0 zurückgehen)."""
+
+    def __init__(self):
+        self.resets = 0
+        self._last: float | None = None
+
+    def listener(self):
+        """Callback für State-Änderungen (läuft in der Event Loop, nicht im Executor)."""
+        from homeassistant.core import callback
+
+        @callback
+        def _async_state_changed(event) -> None:
+            state = event.data.get("new_state")
+            try:
+                value = float(state.state)
+            except (AttributeError, TypeError, ValueError):
+                return
+            if self._last is not None and value < self._last:
+                self.resets += 1
+            self._last = value
+
+        return _async_state_changed
+
+
+async def simulate(args: argparse.Namespace, clock: SimulatedClock, fleet: SimulatedFleet) -> dict:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.helpers.event import async_track_state_change_event
+
+    from custom_components.emlog.template import COST_PERIODS
+
+    loop: SimulatedEventLoop = asyncio.get_running_loop()
+    mid = args.start + timedelta(days=max(1, args.days // 2))
+    options = {
+        "consumption_source": args.consumption_source,
+        f"base_price_{args.meter_type}": 12.0,
+        f"monthly_advance_{args.meter_type}": round(args.daily_kwh * 30.5 * args.price + 12.0),
+        f"price_change_date_{args.meter_type}": mid.isoformat(),
+        f"price_kwh_new_{args.meter_type}": round(args.price * 1.2, 4),
+        f"base_price_{args.meter_type}_new": 14.0,
+    }
+
+    with tempfile.TemporaryDirectory(prefix="emlog-sim-") as config_dir:
+        os.makedirs(os.path.join(config_dir, "custom_components"))
+        os.symlink(REPO_ROOT / "custom_components" / "emlog", os.path.join(config_dir, "custom_components", "emlog"))
+        hass = await make_hass(config_dir)
+        hass.config.set_time_zone(TIME_ZONE)
+
+        prefix = f"sensor.emlog_{args.meter_type}_1_"
+        counters = {key: ResetCounter() for key in ("verbrauch_tag_kwh", "verbrauch_tag")}
+        for key, counter in counters.items():
+            async_track_state_change_event(hass, [prefix + key], counter.listener())
+
+        entries = []
+        for meter_index in fleet.devices:
+            entry = ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain="emlog",
+                title=f"Emlog {meter_index}",
+                unique_id=f"emlog_{HOST}_{args.meter_type}_{meter_index}",
+                data={
+                    "host": HOST,
+                    "meter_type": args.meter_type,
+                    "meter_index": meter_index,
+                    "price_kwh": args.price,
+                    "scan_interval": args.interval,
+                },
+                source="user",
+                options=dict(options),
+            )
+            entries.append(entry)
+            await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+
+        cost_entity_ids = [f"{prefix}kosten_{period}" for period in COST_PERIODS] + [
+            f"{prefix}abschlag_jahresgesamt",
+            f"{prefix}abschlag_differenz",
+        ]
+        tariff_start = hass.states.get(cost_entity_ids[0])
+
+        # Kurz vor der letzten Mitternacht anhalten: Endstände sind die Summen des letzten Tags/Monats/Jahres
+        end = clock.monotonic() + args.days * 86400 - 1
+        setup_requests = fleet.requests
+        poll_times = array("d")
+        progress_every = max(1, args.days // 12) * 86400
+        next_progress = clock.monotonic() + progress_every
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+
+        while True:
+            await asyncio.sleep(0)
+            if loop._ready:
+                continue
+            step_started = time.perf_counter()
+            requests_before = fleet.requests
+            if (next_when := loop.next_timer()) is None or next_when > end:
+                break
+            clock.advance_to(next_when)
+            # Alles Fällige laufen lassen, bis die Loop wieder leer ist
+            await asyncio.sleep(0)
+            while loop._ready:
+                await asyncio.sleep(0)
+            if fleet.requests != requests_before:
+                poll_times.append(time.perf_counter() - step_started)
+            if clock.monotonic() >= next_progress:
+                next_progress += progress_every
+                print(f"   {clock.now().date()}  {fleet.requests - setup_requests:>9} Polls", flush=True)
+
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+        await hass.async_block_till_done()
+
+        states = {
+            state.entity_id.removeprefix("sensor."): state.state
+            for state in hass.states.async_all("sensor")
+            if state.entity_id.startswith(prefix)
+            and any(word in state.entity_id for word in ("zaehlerstand", "verbrauch", "kosten", "abschlag"))
+        }
+        device = fleet.devices[1]
+        cost_entities_missing = [entity_id for entity_id in cost_entity_ids if hass.states.get(entity_id) is None]
+        tariff_end = hass.states.get(cost_entity_ids[0])
+        await hass.async_stop(force=True)
+
+    polls = fleet.requests - setup_requests
+    cycles = sorted(poll_times)
+    return {
+        "simulated_days": args.days,
+        "meters": args.meters,
+        "polls": polls,
+        "failed_polls": fleet.errors,
+        "wall_s": round(wall, 2),
+        "cpu_s": round(cpu, 2),
+        "polls_per_s": round(polls / wall, 1) if wall else None,
+        "loop_us_per_poll": round(sum(poll_times) / polls * 1e6, 1) if polls else None,
+        "cycle_us_p50": round(statistics.median(cycles) * 1e6, 1) if cycles else None,
+        "cycle_us_p99": round(cycles[int(len(cycles) * 0.99)] * 1e6, 1) if cycles else None,
+        "midnights": device.midnights,
+        "resets": {key: counter.resets for key, counter in counters.items()},
+        "device_kwh": round(device.stand - device.start_stand, 3),
+        "device_today_kwh": round(device.stand - device.day_start_stand, 3),
+        "states": dict(sorted(states.items())),
+        "tariff_price_kwh": [
+            state.attributes.get("price_kwh") if state is not None else None for state in (tariff_start, tariff_end)
+        ],
+        "cost_entities_missing": cost_entities_missing,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monate an Emlog-Polls mit simulierter Uhr durchspielen")
+    parser.add_argument("--days", type=int, default=365, help="Simulierte Tage")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 1, 1), help="Erster simulierter Tag")
+    parser.add_argument("--interval", type=int, default=30, help="Poll-Intervall in Sekunden")
+    parser.add_argument("--meters", type=int, choices=[1, 2, 3, 4], default=1, help="Zähler-Indizes am Gerät")
+    parser.add_argument("--meter-type", choices=["strom", "gas"], default="strom")
+    parser.add_argument("--daily-kwh", type=float, default=10.0, help="Mittlerer Verbrauch pro Zähler und Tag")
+    parser.add_argument("--price", type=float, default=0.30, help="Preis pro kWh (+20 %% ab Mitte der Simulation)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil der Polls mit HTTP 500")
+    parser.add_argument(
+        "--consumption-source",
+        choices=["utility_meter", "native"],
+        default="native",
+        help="utility_meter legt echte utility_meter Entries an (benötigt croniter)",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Seed für Lastprofil und Fehlerinjektion")
+    parser.add_argument("--json", type=Path, help="Ergebnisse in diese Datei schreiben")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    import logging
+
+    logging.basicConfig(level=logging.ERROR)
+
+    start = datetime.combine(args.start, datetime.min.time(), ZoneInfo(TIME_ZONE))
+    clock = SimulatedClock(start)
+    fleet = SimulatedFleet(clock, args)
+
+    print(f"🕰️  Simuliere {args.days} Tage mit {args.interval}-s-Polls, {args.meters} Zähler, ab {args.start}")
+    with ExitStack() as stack, asyncio.Runner(loop_factory=lambda: SimulatedEventLoop(clock)) as runner:
+        for clock_patch in clock_patches(clock, fleet):
+            stack.enter_context(clock_patch)
+        result = runner.run(simulate(args, clock, fleet))
+
+    print(f"\n⏱️  {result['polls']} Polls ({result['failed_polls']} fehlgeschlagen) in {result['wall_s']} s")
+    print(f"   {result['polls_per_s']} Polls/s, {result['cpu_s']} s CPU")
+    print(
+        f"   Loop-Zeit pro Poll: {result['loop_us_per_poll']} µs, "
+        f"pro Host-Zyklus: p50 {result['cycle_us_p50']} µs, p99 {result['cycle_us_p99']} µs"
+    )
+    print(f"\n🌙 Mitternächte (Ortszeit): {result['midnights']}, beobachtete Resets: {result['resets']}")
+    print(f"⚡ Gerät hat {result['device_kwh']} kWh gezählt (heute {result['device_today_kwh']} kWh)")
+    print("\n📊 Endstände (Zähler 1)")
+    for entity_id, state in result["states"].items():
+        print(f"   {entity_id:<45} {state}")
+    print(f"\n💶 Tarif {result['tariff_price_kwh'][0]} -> {result['tariff_price_kwh'][1]} pro kWh")
+    if result["cost_entities_missing"]:
+        print(f"   ⚠️  Kostensensoren nicht angelegt: {', '.join(result['cost_entities_missing'])}")
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"\n✓ Ergebnisse geschrieben nach {args.json}")
+
+
+if __name__ == "__main__":
+    main()